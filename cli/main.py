@@ -743,6 +743,8 @@ def run_analysis():
     config["deep_think_llm"] = selections["deep_thinker"]
     config["backend_url"] = selections["backend_url"]
     config["llm_provider"] = selections["llm_provider"].lower()
+    # An interrupted interactive run can be resumed from its last completed step
+    config["checkpoint_enabled"] = True
 
     # Initialize the graph
     graph = TradingAgentsGraph(
@@ -839,7 +841,10 @@ def run_analysis():
         init_agent_state = graph.propagator.create_initial_state(
             selections["ticker"], selections["analysis_date"]
         )
-        args = graph.propagator.get_graph_args()
+        thread_id = graph.thread_id(
+            selections["ticker"], selections["analysis_date"], graph.new_run_id()
+        )
+        args = graph.propagator.get_graph_args(thread_id)
 
         # Stream the analysis
         trace = []
@@ -1077,6 +1082,12 @@ def run_analysis():
         final_state = trace[-1]
         decision = graph.process_signal(final_state["final_trade_decision"])
 
+        # A completed run has nothing left to resume
+        if graph.checkpointer is not None and not graph.config.get(
+            "checkpoint_keep_completed", False
+        ):
+            graph.checkpointer.delete_thread(thread_id)
+
         # Update all agent statuses to completed
         for agent in message_buffer.agent_status:
             message_buffer.update_agent_status(agent, "completed")
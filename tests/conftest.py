@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+from fakes import AsyncFakeEmbeddings, FakeChatModel, FakeEmbeddings, FakeMemory
+
+
+@pytest.fixture
+def fake_llm():
+    return FakeChatModel()
+
+
+@pytest.fixture
+def make_graph(tmp_path, monkeypatch, fake_llm):
+    """Build TradingAgentsGraphs backed by fake_llm and writing under tmp_path."""
+    import tradingagents.graph.trading_graph as trading_graph
+    from tradingagents.default_config import DEFAULT_CONFIG
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(trading_graph, "ChatOpenAI", lambda **kwargs: fake_llm)
+    monkeypatch.setattr(trading_graph, "FinancialSituationMemory", FakeMemory)
+
+    def make(selected_analysts=None, **overrides):
+        config = DEFAULT_CONFIG.copy()
+        config.update(
+            project_dir=str(tmp_path / "project"),
+            results_dir=str(tmp_path / "results"),
+            data_cache_dir=str(tmp_path / "cache"),
+            state_log_dir=str(tmp_path / "eval_results"),
+            online_tools=False,
+        )
+        config.update(overrides)
+        if selected_analysts is None:
+            return trading_graph.TradingAgentsGraph(config=config)
+        return trading_graph.TradingAgentsGraph(selected_analysts, config=config)
+
+    return make
+
+
+@pytest.fixture
+def make_memory(tmp_path, monkeypatch):
+    """Build FinancialSituationMemories backed by fake embedding clients."""
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+    from tradingagents.default_config import DEFAULT_CONFIG
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    def make(**overrides):
+        config = dict(DEFAULT_CONFIG, memory_backend="numpy", backend_url="http://test")
+        config.update(embedding_cache_path=str(tmp_path / "embeddings.sqlite"))
+        config.update(overrides)
+        memory = FinancialSituationMemory("memory", config)
+        memory.client = SimpleNamespace(embeddings=FakeEmbeddings())
+        memory.async_client = SimpleNamespace(embeddings=AsyncFakeEmbeddings())
+        return memory
+
+    return make
@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import time
+from types import SimpleNamespace
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers every prompt with a BUY proposal.
+
+    With tool_first it calls the first bound tool once before answering.
+    Prompts containing fail_on raise until fail_count runs out.
+    """
+
+    delay: float = 0.0
+    calls: int = 0
+    tool_first: bool = False
+    fail_on: str = ""
+    fail_count: int = 0
+
+    @property
+    def _llm_type(self):
+        return "fake"
+
+    def _reply(self, messages, **kwargs):
+        if self.fail_count and any(self.fail_on in str(m.content) for m in messages):
+            self.fail_count -= 1
+            raise RuntimeError("provider down")
+        self.calls += 1
+        has_tool_result = any(m.type == "tool" for m in messages)
+        if self.tool_first and kwargs.get("tools") and not has_tool_result:
+            name = kwargs["tools"][0]["function"]["name"]
+            message = AIMessage(
+                content="",
+                tool_calls=[{"name": name, "args": {}, "id": f"call{self.calls}"}],
+            )
+        else:
+            message = AIMessage(
+                content=f"report {self.calls} FINAL TRANSACTION PROPOSAL: **BUY**",
+                usage_metadata={
+                    "input_tokens": 10,
+                    "output_tokens": 5,
+                    "total_tokens": 15,
+                },
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.delay)
+        return self._reply(messages, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self._reply(messages, **kwargs)
+
+    def bind_tools(self, tools, **kwargs):
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+
+class FakeMemory:
+    """Memory that remembers nothing and records what it is given."""
+
+    def __init__(self, name="memory", config=None):
+        self.name = name
+        self.added = []
+
+    def get_memories(self, situation, n_matches=1):
+        return []
+
+    async def aget_memories(self, situation, n_matches=1):
+        return []
+
+    def get_embeddings(self, texts):
+        return [[0.0] for _ in texts]
+
+    async def aget_embeddings(self, texts):
+        return self.get_embeddings(texts)
+
+    def add_situations(self, situations_and_advice):
+        self.added.extend(situations_and_advice)
+
+    def add_embedded_situations(self, situations_and_advice, embeddings):
+        self.added.extend(situations_and_advice)
+
+
+def vector(text, dim=8):
+    return [b / 255 for b in hashlib.sha256(text.encode()).digest()[:dim]]
+
+
+class FakeEmbeddings:
+    """Stands in for client.embeddings, answering out of order like the API may."""
+
+    def __init__(self):
+        self.inputs = []
+
+    def create(self, model, input):
+        self.inputs.append(list(input))
+        data = [SimpleNamespace(index=i, embedding=vector(t)) for i, t in enumerate(input)]
+        return SimpleNamespace(data=data[::-1])
+
+
+class AsyncFakeEmbeddings(FakeEmbeddings):
+    async def create(self, model, input):
+        return FakeEmbeddings.create(self, model, input)
@@ -0,0 +1,167 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from tradingagents.backtest import Backtester, SimulatedBroker
+
+
+def test_slippage_moves_fills_against_the_trader():
+    broker = SimulatedBroker(slippage_bps=5)
+    assert broker.fill_price(100.0, 10) == pytest.approx(100.05)
+    assert broker.fill_price(100.0, -10) == pytest.approx(99.95)
+
+
+def test_commission_has_a_minimum():
+    broker = SimulatedBroker(commission_rate=0.0005, min_commission=1.0)
+    assert broker.commission(100.0, 10) == 1.0
+    assert broker.commission(100.0, -1000) == pytest.approx(50.0)
+    assert broker.commission(100.0, 0) == 0.0
+
+
+def test_buys_are_capped_by_cash_after_costs():
+    broker = SimulatedBroker(
+        initial_cash=1000.0, slippage_bps=0, commission_rate=0.01, min_commission=1.0
+    )
+    fill = broker.order_target("AAA", 50, 100.0)
+    # (1000 - 1) / (100 * 1.01) covers 9 shares
+    assert fill == {"shares": 9, "price": 100.0, "commission": pytest.approx(9.0)}
+    assert broker.cash == pytest.approx(91.0)
+    assert broker.positions == {"AAA": 9}
+    assert broker.equity({"AAA": 110.0}) == pytest.approx(1081.0)
+
+    assert broker.order_target("AAA", 9, 100.0) is None
+
+    fill = broker.order_target("AAA", 0, 110.0)
+    assert fill["shares"] == -9
+    assert broker.cash == pytest.approx(91.0 + 990.0 - 9.9)
+    assert broker.positions == {}
+    assert broker.total_commission == pytest.approx(18.9)
+
+
+def test_short_sales_receive_slipped_price():
+    broker = SimulatedBroker(
+        initial_cash=1000.0, slippage_bps=10, commission_rate=0.0, min_commission=0.0
+    )
+    fill = broker.order_target("AAA", -5, 100.0)
+    assert fill["price"] == pytest.approx(99.9)
+    assert broker.cash == pytest.approx(1000.0 + 5 * 99.9)
+    assert broker.equity({"AAA": 100.0}) == pytest.approx(1000.0 - 0.5)
+
+
+class FakeGraph:
+    """Decides BUY on everything, failing on the (ticker, date) pairs in fail."""
+
+    def __init__(self, config, fail=()):
+        self.config = config
+        self.fail = set(fail)
+        self.jobs = []
+        self.reflections = []
+
+    def propagate_batch(self, jobs):
+        self.jobs.append(jobs)
+        results = []
+        for ticker, trade_date in jobs:
+            failed = (ticker, trade_date) in self.fail
+            results.append(
+                {
+                    "ticker": ticker,
+                    "trade_date": trade_date,
+                    "decision": None if failed else "**BUY**",
+                    "final_state": None if failed else {"ticker": ticker},
+                    "error": RuntimeError("provider down") if failed else None,
+                }
+            )
+        return results
+
+    def reflect_and_remember_batch(self, states_and_returns):
+        self.reflections.extend(states_and_returns)
+
+
+def prices(values):
+    index = pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"])
+    return pd.DataFrame(values, index=index)
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {
+        "results_dir": str(tmp_path),
+        "backtest_initial_cash": 10_000.0,
+        "backtest_position_size": 0.5,
+        "backtest_slippage_bps": 0.0,
+        "backtest_commission_rate": 0.0,
+        "backtest_min_commission": 0.0,
+    }
+
+
+def test_backtest_ledger_statuses(config):
+    graph = FakeGraph(config, fail=[("AAA", "2024-01-03")])
+    backtester = Backtester(graph, ["AAA", "BBB"], "2024-01-02", "2024-01-05")
+    opens = prices(
+        {"AAA": [100.0, 100.0, 110.0, 120.0], "BBB": [50.0, None, None, None]}
+    )
+    closes = prices({"AAA": [100.0, 105.0, 115.0, 125.0], "BBB": [50.0] * 4})
+    backtester.load_prices = lambda: (opens, closes)
+
+    result = backtester.run()
+    ledger = result["ledger"].set_index(["ticker", "trade_date"])
+
+    # Decisions are made after every close but the last
+    assert [len(jobs) for jobs in graph.jobs] == [2, 2, 2]
+    assert ledger.loc[("AAA", "2024-01-02"), "status"] == "filled"
+    assert ledger.loc[("AAA", "2024-01-02"), "shares_traded"] == 50
+    assert ledger.loc[("AAA", "2024-01-03"), "status"] == "failed"
+    assert ledger.loc[("AAA", "2024-01-04"), "status"] == "filled"
+    # The position bought on the first fill is kept on the repeated BUY
+    assert ledger.loc[("AAA", "2024-01-04"), "shares_traded"] == 0
+    # BBB never has an open to fill at again: replaced twice, then left over
+    assert (ledger.xs("BBB")["status"] == "unfilled").all()
+    assert ledger.xs("BBB")["fill_date"].isna().all()
+
+    summary = result["summary"]
+    assert summary["decisions"] == 2
+    assert summary["unfilled_decisions"] == 3
+    assert summary["failed_decisions"] == 1
+    assert summary["trades"] == 1
+    assert summary["final_equity"] == pytest.approx(10_000 + 50 * 25)
+
+    # Only filled decisions are reflected on, with their realized return
+    assert [r for _, r in graph.reflections] == [
+        pytest.approx(0.05),
+        pytest.approx(125 / 120 - 1),
+    ]
+
+    with open(os.path.join(backtester.results_dir, "summary.json")) as f:
+        assert json.load(f)["unfilled_decisions"] == 3
+    assert "final_state" not in pd.read_csv(
+        os.path.join(backtester.results_dir, "ledger.csv")
+    ).columns
+
+
+@pytest.mark.parametrize("key", ["enable_real_trading", "online_tools"])
+def test_live_graph_is_refused(config, key):
+    graph = FakeGraph(dict(config, **{key: True}))
+    with pytest.raises(ValueError, match=key):
+        Backtester(graph, ["AAA"], "2024-01-02", "2024-01-05")
+    assert graph.jobs == []
+
+
+def test_sell_closes_long_without_shorting(config):
+    class Flip(FakeGraph):
+        def propagate_batch(self, jobs):
+            results = super().propagate_batch(jobs)
+            if len(self.jobs) == 2:
+                results[0]["decision"] = "SELL"
+            return results
+
+    graph = Flip(config)
+    backtester = Backtester(graph, ["AAA"], "2024-01-02", "2024-01-05")
+    series = prices({"AAA": [100.0, 100.0, 120.0, 120.0]})
+    backtester.load_prices = lambda: (series, series)
+
+    ledger = backtester.run()["ledger"]
+    assert ledger["decision"].tolist() == ["BUY", "SELL", "BUY"]
+    assert ledger["position"].tolist() == [50, 0, 45]
+    assert ledger["return"].tolist()[1] == 0.0
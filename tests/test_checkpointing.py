@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from tradingagents.graph.checkpointing import create_checkpointer
+from tradingagents.graph.propagation import Propagator
+
+
+def test_graph_args_always_carry_a_thread_id():
+    propagator = Propagator()
+    first = propagator.get_graph_args()["config"]["configurable"]["thread_id"]
+    second = propagator.get_graph_args()["config"]["configurable"]["thread_id"]
+    assert first and first != second
+    assert (
+        propagator.get_graph_args("AAA:2024-01-05:run")["config"]["configurable"][
+            "thread_id"
+        ]
+        == "AAA:2024-01-05:run"
+    )
+
+
+def test_checkpointing_is_opt_in(make_graph):
+    assert make_graph().checkpointer is None
+
+
+def test_checkpointed_graph_streams_with_default_graph_args(make_graph):
+    graph = make_graph(checkpoint_enabled=True)
+    state = graph.propagator.create_initial_state("AAA", "2024-01-05")
+    chunks = list(graph.graph.stream(state, **graph.propagator.get_graph_args()))
+    assert chunks[-1]["final_trade_decision"]
+
+
+def test_resume_skips_completed_nodes(make_graph, fake_llm):
+    graph = make_graph(checkpoint_enabled=True)
+    fake_llm.fail_on, fake_llm.fail_count = "Risk Management Judge", 1
+    with pytest.raises(RuntimeError):
+        graph.propagate("AAA", "2024-01-05")
+    calls_before_failure = fake_llm.calls
+    run_id = graph.run_id
+
+    fake_llm.calls = 0
+    final_state, decision = graph.resume("AAA", "2024-01-05", run_id)
+
+    assert fake_llm.calls < calls_before_failure
+    assert final_state["market_report"]
+    assert final_state["final_trade_decision"]
+    assert decision == "BUY"
+    # A completed run drops its checkpoint and cannot be resumed again
+    with pytest.raises(ValueError):
+        graph.resume("AAA", "2024-01-05", run_id)
+
+
+def test_async_resume(make_graph, fake_llm):
+    graph = make_graph(checkpoint_enabled=True, parallel_analysts=True)
+    run_id = graph.new_run_id()
+    fake_llm.fail_on, fake_llm.fail_count = "Risk Management Judge", 1
+    with pytest.raises(RuntimeError):
+        asyncio.run(graph.apropagate("BBB", "2024-01-05", run_id))
+
+    fake_llm.calls = 0
+    final_state, decision = asyncio.run(graph.aresume("BBB", "2024-01-05", run_id))
+    assert fake_llm.calls == 1
+    assert decision == "BUY"
+
+
+def test_keep_completed_checkpoints(make_graph):
+    graph = make_graph(checkpoint_enabled=True, checkpoint_keep_completed=True)
+    graph.propagate("AAA", "2024-01-05")
+    thread_id = graph.thread_id("AAA", "2024-01-05", graph.run_id)
+    thread = {"configurable": {"thread_id": thread_id}}
+    assert graph.checkpointer.get_tuple(thread) is not None
+
+
+def test_resume_requires_checkpointing(make_graph):
+    graph = make_graph()
+    with pytest.raises(ValueError):
+        graph.resume("AAA", "2024-01-05", "missing")
+
+
+def test_create_checkpointer_default_path(tmp_path):
+    saver = create_checkpointer(
+        {"checkpoint_enabled": True, "data_cache_dir": str(tmp_path / "cache")}
+    )
+    assert (tmp_path / "cache" / "checkpoints.sqlite").exists()
+    thread = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+    assert asyncio.run(saver.aget_tuple(thread)) is None
+    assert create_checkpointer({"data_cache_dir": str(tmp_path)}) is None
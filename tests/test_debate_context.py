@@ -0,0 +1,95 @@
+import asyncio
+
+from tradingagents.agents.utils.debate_context import DebateContext, carry_context
+
+from fakes import FakeChatModel
+
+
+def test_disabled_context_passes_full_history():
+    context = DebateContext()
+    state = {"history": "everything said so far", "summary": ""}
+
+    assert not context.enabled
+    assert context.render(state) == "everything said so far"
+    assert context.record(state, "new argument") == {"summary": "", "recent_turns": []}
+
+
+def test_turns_within_budget_stay_verbatim():
+    llm = FakeChatModel()
+    context = DebateContext(llm, max_tokens=1000, recent_turns=1)
+    state = {}
+    for argument in ["Bull: up", "Bear: down", "Bull: up again"]:
+        state.update(context.record(state, argument))
+
+    assert state == {
+        "summary": "",
+        "recent_turns": ["Bull: up", "Bear: down", "Bull: up again"],
+    }
+    assert context.render(state) == "Bull: up\nBear: down\nBull: up again"
+    assert llm.calls == 0
+
+
+def test_older_turns_are_folded_into_the_summary():
+    llm = FakeChatModel()
+    context = DebateContext(llm, max_tokens=20, recent_turns=2)
+    state = {}
+    turns = [f"Analyst {i}: " + "x" * 20 for i in range(4)]
+    for argument in turns:
+        state.update(context.record(state, argument))
+
+    assert state["recent_turns"] == turns[-2:]
+    assert state["summary"].startswith("report")
+    # One summary call per turn at most, only once the budget was exceeded
+    assert llm.calls == 2
+
+    rendered = context.render(state)
+    assert rendered.startswith("Summary of the earlier arguments:\n" + state["summary"])
+    assert rendered.endswith("Most recent arguments:\n" + "\n".join(turns[-2:]))
+    assert turns[0] not in rendered
+
+
+def test_summary_prompt_merges_previous_summary():
+    context = DebateContext(FakeChatModel(), max_tokens=400)
+    system, human = context._summary_messages("earlier points", ["Bear: down"])
+
+    assert "at most 150 words" in system[1]
+    assert human[1] == "Existing summary:\nearlier points\n\nNew arguments:\nBear: down"
+
+
+def test_arecord_matches_record():
+    turns = [f"Analyst {i}: " + "x" * 20 for i in range(4)]
+
+    def replay(record):
+        state = {}
+        for argument in turns:
+            state.update(record(state, argument))
+        return state
+
+    sync_state = replay(DebateContext(FakeChatModel(), 20).record)
+    async_context = DebateContext(FakeChatModel(), 20)
+    async_state = replay(lambda s, a: asyncio.run(async_context.arecord(s, a)))
+
+    assert async_state == sync_state
+
+
+def test_carry_context():
+    state = {"summary": "s", "recent_turns": ["a"], "history": "h"}
+    assert carry_context(state) == {"summary": "s", "recent_turns": ["a"]}
+    assert carry_context({}) == {"summary": "", "recent_turns": []}
+
+
+def test_graph_compacts_long_debates(make_graph, fake_llm):
+    graph = make_graph(
+        ["market"],
+        debate_context_compaction=True,
+        debate_context_max_tokens=10,
+        debate_context_recent_turns=1,
+    )
+    final_state, _ = graph.propagate("AAA", "2024-01-05")
+
+    debate = final_state["investment_debate_state"]
+    assert debate["summary"]
+    assert len(debate["recent_turns"]) == 1
+    assert debate["history"].count("Analyst: report") == 2
+    risk = final_state["risk_debate_state"]
+    assert risk["summary"] and len(risk["recent_turns"]) == 1
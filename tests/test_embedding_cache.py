@@ -0,0 +1,96 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from tradingagents.agents.utils import embedding_cache
+from tradingagents.agents.utils.embedding_cache import EmbeddingCache
+
+from fakes import vector
+
+
+def test_get_many_and_put_many():
+    cache = EmbeddingCache(max_entries=10)
+    assert cache.get_many("m", ["a", "b"]) == [None, None]
+    cache.put_many("m", ["a"], [[0.5, 0.25]])
+
+    a, b = cache.get_many("m", ["a", "b"])
+    assert b is None
+    assert a.dtype == np.float32 and a.tolist() == [0.5, 0.25]
+    with pytest.raises(ValueError):
+        a[0] = 1.0
+    assert cache.get_many("other-model", ["a"]) == [None]
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_lru_eviction():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+    cache.get_many("m", ["a"])
+    cache.put_many("m", ["c"], [[3.0]])
+    assert [e is None for e in cache.get_many("m", ["a", "b", "c"])] == [
+        False,
+        True,
+        False,
+    ]
+
+
+def test_sqlite_persistence(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    cache = EmbeddingCache(max_entries=2, path=path)
+    cache.put_many("m", ["a", "b"], [[0.5, 1.5], [2.5, 3.5]])
+
+    reopened = EmbeddingCache(path=path)
+    a, b = reopened.get_many("m", ["a", "b"])
+    assert a.dtype == np.float32 and a.tolist() == [0.5, 1.5]
+    assert b.tolist() == [2.5, 3.5]
+
+    reopened.clear()
+    assert EmbeddingCache(path=path).get_many("m", ["a"]) == [None]
+
+
+def test_sqlite_file_is_bounded_by_max_entries(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: now[0])
+    path = str(tmp_path / "embeddings.sqlite")
+    cache = EmbeddingCache(max_entries=2, path=path)
+    for text in ("a", "b"):
+        now[0] += 1
+        cache.put_many("m", [text], [[1.0]])
+
+    # "a" is served from memory, which still counts as a use on disk
+    now[0] += 1
+    cache.get_many("m", ["a"])
+    now[0] += 1
+    cache.put_many("m", ["c"], [[3.0]])
+
+    rows = cache._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    assert rows == 2
+    reopened = EmbeddingCache(path=path)
+    assert [e is None for e in reopened.get_many("m", ["a", "b", "c"])] == [
+        False,
+        True,
+        False,
+    ]
+
+
+def test_memory_embeds_each_text_once(make_memory):
+    memory = make_memory(embedding_batch_max_inputs=2)
+    embeddings = memory.get_embeddings(["a", "b", "a", "c"])
+    assert memory.client.embeddings.inputs == [["a", "b"], ["c"]]
+    assert [e.tolist() for e in embeddings] == [
+        pytest.approx(vector(t)) for t in ["a", "b", "a", "c"]
+    ]
+    assert all(e.dtype == np.float32 for e in embeddings)
+
+    again = asyncio.run(memory.aget_embeddings(["c", "d"]))
+    assert memory.async_client.embeddings.inputs == [["d"]]
+    assert again[0].tolist() == embeddings[3].tolist()
+
+
+def test_memory_without_cache_returns_arrays(make_memory):
+    memory = make_memory(embedding_cache_enabled=False)
+    memory.add_situations([("rates up", "sell banks"), ("rates down", "buy growth")])
+    matches = memory.get_memories("rates up", n_matches=1)
+    assert matches[0]["recommendation"] == "sell banks"
+    assert memory.client.embeddings.inputs == [["rates up", "rates down"], ["rates up"]]
@@ -0,0 +1,89 @@
+import json
+import os
+
+import pytest
+
+from tradingagents.dataflows.finnhub_utils import get_data_in_range, load_finnhub_data
+
+
+def write_finnhub(data_dir, data_type, ticker, data):
+    directory = os.path.join(data_dir, "finnhub_data", data_type)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{ticker}_data_formatted.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
+
+@pytest.fixture
+def news_dir(tmp_path):
+    write_finnhub(
+        str(tmp_path),
+        "news_data",
+        "AAA",
+        {
+            "2024-01-05": [{"headline": "e"}],
+            "2024-01-02": [{"headline": "b"}],
+            "2024-01-01": [{"headline": "a"}],
+            "2024-01-03": [],
+            "2024-01-04": [{"headline": "d"}],
+        },
+    )
+    return str(tmp_path)
+
+
+def test_range_is_inclusive_sorted_and_skips_empty_days(news_dir):
+    data = get_data_in_range("AAA", "2024-01-02", "2024-01-04", "news_data", news_dir)
+    assert list(data) == ["2024-01-02", "2024-01-04"]
+    assert data["2024-01-04"] == [{"headline": "d"}]
+    assert get_data_in_range("AAA", "2024-02-01", "2024-02-05", "news_data", news_dir) == (
+        {}
+    )
+
+
+def test_parsed_files_are_cached_until_changed(news_dir):
+    path = os.path.join(
+        news_dir, "finnhub_data", "news_data", "AAA_data_formatted.json"
+    )
+    keys, data = load_finnhub_data(path)
+    assert keys == sorted(data)
+    assert load_finnhub_data(path)[1] is data
+
+    write_finnhub(news_dir, "news_data", "AAA", {"2024-01-06": [{"headline": "f"}]})
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_finnhub_data(path)[0] == ["2024-01-06"]
+
+
+def test_insider_transactions_are_deduplicated(tmp_path, monkeypatch):
+    from tradingagents.dataflows import interface
+
+    filing = {
+        "filingDate": "2024-01-02",
+        "name": "Jane Doe",
+        "change": -100,
+        "share": 900,
+        "transactionPrice": 10.5,
+        "transactionCode": "S",
+    }
+    write_finnhub(
+        str(tmp_path),
+        "insider_trans",
+        "AAA",
+        {
+            "2024-01-02": [filing, dict(filing)],
+            # Key order does not make a filing distinct
+            "2024-01-03": [dict(reversed(filing.items())), {**filing, "change": 5}],
+        },
+    )
+    monkeypatch.setattr(interface, "DATA_DIR", str(tmp_path))
+
+    records = interface.get_finnhub_company_insider_transactions_records(
+        "AAA", "2024-01-05", 7
+    )
+    assert [r["change"] for r in records] == [-100, 5]
+    report = interface.get_finnhub_company_insider_transactions("AAA", "2024-01-05", 7)
+    assert report.count("### Filing Date") == 2
+
+    write_finnhub(str(tmp_path), "insider_trans", "BBB", {"2024-01-02": []})
+    assert interface.get_finnhub_company_insider_transactions("BBB", "2024-01-05", 7) == ""
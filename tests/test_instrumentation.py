@@ -0,0 +1,131 @@
+import json
+
+import pytest
+
+from tradingagents.graph.instrumentation import MetricsExporter, RunMetrics
+
+from fakes import FakeChatModel
+
+
+class PricedChatModel(FakeChatModel):
+    model_name: str = "gpt-4o-mini-2024-07-18"
+
+    @property
+    def _identifying_params(self):
+        return {"model": self.model_name}
+
+
+def test_llm_calls_tokens_and_cost_per_node():
+    metrics = RunMetrics(labels={"ticker": "AAA"})
+    llm = PricedChatModel()
+    llm.invoke("hi", {"callbacks": [metrics], "run_name": "Signal Processing"})
+    llm.invoke("hi", {"callbacks": [metrics], "run_name": "Signal Processing"})
+    metrics.finish()
+
+    summary = metrics.summary()
+    assert summary["ticker"] == "AAA"
+    assert summary["error"] is None
+    stats = summary["nodes"]["Signal Processing"]
+    assert stats["llm_calls"] == 2
+    assert (stats["input_tokens"], stats["output_tokens"]) == (20, 10)
+    # Dated snapshots fall back to the base model's price
+    assert stats["cost"] == pytest.approx((20 * 0.15 + 10 * 0.60) / 1e6)
+    assert summary["cost"] == stats["cost"]
+
+
+def test_custom_prices_and_unknown_models():
+    metrics = RunMetrics(prices={"my-model": (1.0, 2.0)})
+    llm = PricedChatModel(model_name="my-model")
+    llm.invoke("hi", {"callbacks": [metrics], "run_name": "A"})
+    unpriced = PricedChatModel(model_name="mystery")
+    unpriced.invoke("hi", {"callbacks": [metrics], "run_name": "B"})
+    nodes = metrics.summary()["nodes"]
+    assert nodes["A"]["cost"] == pytest.approx((10 * 1.0 + 5 * 2.0) / 1e6)
+    assert nodes["B"]["cost"] == 0.0 and nodes["B"]["input_tokens"] == 10
+
+
+def test_errors_and_measured_steps():
+    metrics = RunMetrics()
+    llm = FakeChatModel(fail_on="boom", fail_count=1)
+    with pytest.raises(RuntimeError):
+        llm.invoke("boom", {"callbacks": [metrics], "run_name": "A"})
+    with pytest.raises(ValueError):
+        with metrics.measure("Step"):
+            raise ValueError("bad")
+    metrics.finish(RuntimeError("run failed"))
+
+    summary = metrics.summary()
+    assert summary["nodes"]["A"]["llm_errors"] == 1
+    assert summary["nodes"]["Step"]["errors"] == 1
+    assert "run failed" in summary["error"]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_graph_runs_record_every_llm_call_once(make_graph, fake_llm, parallel):
+    fake_llm.tool_first = True
+    graph = make_graph(parallel_analysts=parallel)
+    graph.propagate("AAA", "2024-01-05")
+
+    summary = graph.run_metrics
+    assert summary["ticker"] == "AAA"
+    assert summary["llm_calls"] == fake_llm.calls
+    # The fake reports usage on its answers but not on its four tool calls
+    assert summary["input_tokens"] == 10 * (fake_llm.calls - 4)
+    assert summary["nodes"]["Market Analyst"]["llm_calls"] == 2
+    assert summary["nodes"]["Market Analyst"]["runs"] == 2
+    assert summary["nodes"]["Risk Judge"]["runs"] == 1
+    assert sum(stats["calls"] for stats in summary["tools"].values()) == 4
+
+
+def test_batch_results_carry_metrics(make_graph):
+    graph = make_graph()
+    results = graph.propagate_batch([("AAA", "2024-01-05"), ("BBB", "2024-01-05")])
+    assert [r["metrics"]["ticker"] for r in results] == ["AAA", "BBB"]
+    assert all(r["metrics"]["llm_calls"] > 0 for r in results)
+
+
+def test_instrumentation_can_be_disabled(make_graph):
+    graph = make_graph(instrumentation_enabled=False)
+    graph.propagate("AAA", "2024-01-05")
+    assert graph.run_metrics is None
+
+
+def summary_of_one_run():
+    metrics = RunMetrics(labels={"ticker": "AAA", "trade_date": "2024-01-05"})
+    FakeChatModel().invoke("hi", {"callbacks": [metrics], "run_name": "Trader"})
+    metrics.finish()
+    return metrics.summary()
+
+
+def test_prometheus_export_accumulates(tmp_path):
+    exporter = MetricsExporter(str(tmp_path), "prometheus")
+    exporter.export(summary_of_one_run())
+    exporter.export(summary_of_one_run())
+
+    text = open(exporter.path).read()
+    assert "tradingagents_runs_total 2" in text
+    assert 'tradingagents_llm_calls_total{node="Trader"} 2' in text
+    assert 'tradingagents_llm_tokens_total{node="Trader",direction="input"} 20' in text
+    # Provider retries are invisible to callbacks, so no retry counter is exported
+    assert "retries" not in text
+
+
+def test_otel_export_appends_one_request_per_run(tmp_path):
+    exporter = MetricsExporter(str(tmp_path), "otel")
+    exporter.export(summary_of_one_run())
+    exporter.export(summary_of_one_run())
+
+    with open(exporter.path) as f:
+        requests = [json.loads(line) for line in f]
+    assert len(requests) == 2
+    metrics = requests[0]["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]
+    assert "tradingagents.llm.retries" not in {m["name"] for m in metrics}
+    calls = next(m for m in metrics if m["name"] == "tradingagents.llm.calls")
+    point = calls["sum"]["dataPoints"][0]
+    assert point["asInt"] == "1"
+    assert {"key": "ticker", "value": {"stringValue": "AAA"}} in point["attributes"]
+
+
+def test_unknown_export_format(tmp_path):
+    with pytest.raises(ValueError):
+        MetricsExporter(str(tmp_path), "statsd")
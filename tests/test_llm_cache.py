@@ -0,0 +1,103 @@
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+from tradingagents.graph import llm_cache
+from tradingagents.graph.llm_cache import SQLiteLLMCache, create_llm_cache
+
+
+def _reply(text):
+    return [ChatGeneration(message=AIMessage(content=text), generation_info={"n": 1})]
+
+
+def test_miss_then_hit_round_trips_messages(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "cache.sqlite"))
+
+    assert cache.lookup("prompt", "llm") is None
+    cache.update("prompt", "llm", _reply("hello"))
+    cached = cache.lookup("prompt", "llm")
+
+    assert isinstance(cached[0], ChatGeneration)
+    assert cached[0].message.content == "hello"
+    assert cached[0].generation_info == {"n": 1}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_plain_generations_round_trip(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "cache.sqlite"))
+    cache.update("prompt", "llm", [Generation(text="plain")])
+
+    cached = cache.lookup("prompt", "llm")
+
+    assert type(cached[0]) is Generation
+    assert cached[0].text == "plain"
+
+
+def test_key_covers_llm_string(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "cache.sqlite"))
+    cache.update("prompt", "model-a", _reply("a"))
+
+    assert cache.lookup("prompt", "model-b") is None
+    assert cache.lookup("other", "model-a") is None
+
+
+def test_ttl_expires_entries(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = SQLiteLLMCache(str(tmp_path / "cache.sqlite"), ttl=60)
+    cache.update("old", "llm", _reply("old"))
+    now[0] += 30
+    cache.update("new", "llm", _reply("new"))
+
+    now[0] += 45
+    assert cache.expire() == 1
+    assert cache.lookup("new", "llm") is not None
+
+    now[0] += 60
+    assert cache.lookup("new", "llm") is None
+
+
+def test_max_entries_evicts_least_recently_used(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = SQLiteLLMCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    for prompt in ("a", "b"):
+        now[0] += 1
+        cache.update(prompt, "llm", _reply(prompt))
+
+    now[0] += 1
+    cache.lookup("a", "llm")
+    now[0] += 1
+    cache.update("c", "llm", _reply("c"))
+
+    assert cache.lookup("a", "llm") is not None
+    assert cache.lookup("b", "llm") is None
+    assert cache.lookup("c", "llm") is not None
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "nested" / "cache.sqlite")
+    first = SQLiteLLMCache(path)
+    first.update("prompt", "llm", _reply("kept"))
+    first.close()
+
+    second = SQLiteLLMCache(path)
+    assert second.lookup("prompt", "llm")[0].message.content == "kept"
+
+    second.clear()
+    assert second.lookup("prompt", "llm") is None
+
+
+def test_create_llm_cache_from_config(tmp_path):
+    assert create_llm_cache({"data_cache_dir": str(tmp_path)}) is None
+
+    cache = create_llm_cache(
+        {
+            "llm_cache_enabled": True,
+            "data_cache_dir": str(tmp_path),
+            "llm_cache_ttl": 10,
+            "llm_cache_max_entries": 5,
+        }
+    )
+
+    assert cache.path == str(tmp_path / "llm_cache.sqlite")
+    assert (cache.ttl, cache.max_entries) == (10, 5)
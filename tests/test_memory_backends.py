@@ -0,0 +1,96 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from tradingagents.agents.utils.memory_backends import (
+    MemoryBackend,
+    NumpyMemoryBackend,
+    collection_name,
+    create_memory_backend,
+)
+
+ADVICE = [("rates up", "sell banks"), ("rates down", "buy growth"), ("flat", "hold")]
+EMBEDDINGS = [[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 3.0]]
+
+
+def test_memory_backend_is_abstract():
+    with pytest.raises(TypeError):
+        MemoryBackend()
+
+    class Partial(MemoryBackend):
+        def count(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_collection_name():
+    assert collection_name("bull_memory", "text-embedding-3-small", 2) == (
+        "bull_memory_text-embedding-3-small_v2"
+    )
+    assert collection_name("bull", "nomic/embed:v1", 1) == "bull_nomic-embed-v1_v1"
+
+
+def test_numpy_query_ranks_by_cosine_similarity():
+    backend = NumpyMemoryBackend("memory")
+    assert backend.query([[1.0, 0.0, 0.0]], 2) == [[]]
+    backend.add(ADVICE, EMBEDDINGS)
+
+    matches = backend.query([[0.0, 1.0, 0.1], [5.0, 0.0, 0.0]], 2)
+    assert [m["recommendation"] for m in matches[0]] == ["buy growth", "hold"]
+    assert matches[1][0]["matched_situation"] == "rates up"
+    assert matches[1][0]["similarity_score"] == pytest.approx(1.0)
+    assert len(backend.query([[1.0, 1.0, 1.0]], 10)[0]) == 3
+    assert backend.count() == 3
+
+
+def test_numpy_rejects_other_dimension():
+    backend = NumpyMemoryBackend("memory")
+    backend.add(ADVICE[:1], EMBEDDINGS[:1])
+    with pytest.raises(ValueError):
+        backend.add(ADVICE[1:2], [[1.0, 0.0]])
+
+
+def test_numpy_persists_and_warm_starts(tmp_path):
+    backend = NumpyMemoryBackend("memory", persist_dir=str(tmp_path))
+    backend.add(ADVICE[:2], EMBEDDINGS[:2])
+    backend.add(ADVICE[2:], EMBEDDINGS[2:])
+
+    reopened = NumpyMemoryBackend("memory", persist_dir=str(tmp_path))
+    assert reopened.count() == 3
+    assert reopened.query([[0.0, 0.0, 1.0]], 1)[0][0]["recommendation"] == "hold"
+
+    cold = NumpyMemoryBackend("memory", persist_dir=str(tmp_path), warm_start=False)
+    assert cold.count() == 0
+
+
+def test_numpy_drops_uncommitted_add(tmp_path):
+    backend = NumpyMemoryBackend("memory", persist_dir=str(tmp_path))
+    backend.add(ADVICE[:1], EMBEDDINGS[:1])
+    # A crash after the rows were written but before the header was
+    with open(tmp_path / "memory.f32", "ab") as f:
+        f.write(np.ones(3, dtype=np.float32).tobytes())
+    with open(tmp_path / "memory.jsonl", "a") as f:
+        f.write(json.dumps({"situation": "lost", "recommendation": "lost"}) + "\n")
+
+    reopened = NumpyMemoryBackend("memory", persist_dir=str(tmp_path))
+    assert reopened.count() == 1
+    reopened.add(ADVICE[1:2], EMBEDDINGS[1:2])
+    assert os.path.getsize(tmp_path / "memory.f32") == 2 * 3 * 4
+
+    again = NumpyMemoryBackend("memory", persist_dir=str(tmp_path))
+    assert [m["matched_situation"] for m in again.query([[0, 1, 0]], 2)[0]] == [
+        "rates down",
+        "rates up",
+    ]
+
+
+def test_create_memory_backend(tmp_path):
+    config = {"memory_backend": "numpy", "memory_dir": str(tmp_path)}
+    backend = create_memory_backend("bull_memory", "text-embedding-3-small", config)
+    assert isinstance(backend, NumpyMemoryBackend)
+    with pytest.raises(ValueError):
+        create_memory_backend("bull_memory", "m", {"memory_backend": "faiss"})
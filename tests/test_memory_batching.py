@@ -0,0 +1,63 @@
+import asyncio
+
+from tradingagents.agents.utils.memory import _batch_by_token_budget, estimate_tokens
+
+
+def test_batches_respect_token_budget_and_input_count():
+    texts = ["x" * 30, "y" * 30, "z" * 30, "w"]
+    assert estimate_tokens("x" * 30) == 11
+
+    assert _batch_by_token_budget(texts, max_tokens=25, max_inputs=10) == [
+        texts[:2],
+        texts[2:],
+    ]
+    assert _batch_by_token_budget(texts, max_tokens=1000, max_inputs=3) == [
+        texts[:3],
+        texts[3:],
+    ]
+    assert _batch_by_token_budget([], max_tokens=10, max_inputs=10) == []
+
+
+def test_oversized_text_gets_its_own_batch():
+    texts = ["a", "b" * 300, "c"]
+    assert _batch_by_token_budget(texts, max_tokens=50, max_inputs=10) == [
+        ["a"],
+        ["b" * 300],
+        ["c"],
+    ]
+
+
+def test_add_situations_embeds_in_one_request(make_memory):
+    memory = make_memory(embedding_cache_enabled=False)
+    situations = [(f"situation {i}", f"advice {i}") for i in range(5)]
+
+    memory.add_situations(situations)
+    memory.add_situations([])
+
+    assert memory.client.embeddings.inputs == [[s for s, _ in situations]]
+    assert memory.backend.count() == 5
+
+
+def test_get_memories_accepts_a_list_of_situations(make_memory):
+    memory = make_memory(embedding_cache_enabled=False)
+    memory.add_situations([("rates up", "sell banks"), ("rates down", "buy growth")])
+
+    matches = memory.get_memories(["rates down", "rates up"], n_matches=1)
+
+    assert [m[0]["recommendation"] for m in matches] == ["buy growth", "sell banks"]
+    assert memory.client.embeddings.inputs[-1] == ["rates down", "rates up"]
+    assert memory.get_memories([]) == []
+
+
+def test_async_add_and_query(make_memory):
+    memory = make_memory(embedding_cache_enabled=False)
+
+    async def run():
+        await memory.aadd_situations([("oil spikes", "buy energy")])
+        return await memory.aget_memories(["oil spikes"], n_matches=1)
+
+    matches = asyncio.run(run())
+
+    assert matches[0][0]["recommendation"] == "buy energy"
+    assert memory.async_client.embeddings.inputs == [["oil spikes"], ["oil spikes"]]
+    assert memory.client.embeddings.inputs == []
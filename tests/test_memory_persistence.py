@@ -0,0 +1,61 @@
+import pytest
+
+from tradingagents.agents.utils.memory_backends import (
+    ChromaMemoryBackend,
+    collection_name,
+)
+
+pytest.importorskip("chromadb")
+
+ADVICE = [("rates up", "sell banks"), ("rates down", "buy growth")]
+EMBEDDINGS = [[1.0, 0.0], [0.0, 1.0]]
+
+
+def test_chroma_persists_and_warm_starts(tmp_path):
+    name = collection_name("bull_memory", "text-embedding-3-small", 1)
+    backend = ChromaMemoryBackend(name, persist_dir=str(tmp_path))
+    backend.add(ADVICE, EMBEDDINGS)
+
+    reopened = ChromaMemoryBackend(name, persist_dir=str(tmp_path))
+    assert reopened.count() == 2
+    reopened.add(ADVICE[:1], EMBEDDINGS[:1])
+    assert reopened.count() == 3
+    matches = reopened.query([[0.0, 1.0]], 1)
+    assert matches[0][0]["recommendation"] == "buy growth"
+
+    cold = ChromaMemoryBackend(name, persist_dir=str(tmp_path), warm_start=False)
+    assert cold.count() == 0
+
+
+def test_versions_and_models_get_separate_collections(tmp_path):
+    v1 = ChromaMemoryBackend(
+        collection_name("bull_memory", "text-embedding-3-small", 1),
+        persist_dir=str(tmp_path),
+    )
+    v1.add(ADVICE, EMBEDDINGS)
+
+    v2 = ChromaMemoryBackend(
+        collection_name("bull_memory", "text-embedding-3-small", 2),
+        persist_dir=str(tmp_path),
+    )
+    other_model = ChromaMemoryBackend(
+        collection_name("bull_memory", "nomic-embed-text", 1),
+        persist_dir=str(tmp_path),
+    )
+    assert v2.count() == 0
+    assert other_model.count() == 0
+    assert v1.count() == 2
+
+
+def test_memory_reopens_lessons_from_memory_dir(make_memory, tmp_path):
+    memory_dir = str(tmp_path / "memories")
+    memory = make_memory(memory_backend="chromadb", memory_dir=memory_dir)
+    memory.add_situations(ADVICE)
+
+    reopened = make_memory(memory_backend="chromadb", memory_dir=memory_dir)
+    assert reopened.get_memories("rates down")[0]["recommendation"] == "buy growth"
+
+    bumped = make_memory(
+        memory_backend="chromadb", memory_dir=memory_dir, memory_version=2
+    )
+    assert bumped.get_memories("rates down") == []
@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.parquet_utils import (
+    PARQUET_AVAILABLE,
+    convert_price_data,
+    get_parquet_path,
+    has_parquet,
+    read_price_range,
+)
+
+pytestmark = pytest.mark.skipif(not PARQUET_AVAILABLE, reason="needs pyarrow")
+
+CSV_NAME = "AAA-YFin-data-2015-01-01-2025-03-25.csv"
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    price_dir = tmp_path / "market_data" / "price_data"
+    price_dir.mkdir(parents=True)
+    dates = pd.bdate_range("2023-12-01", "2024-02-29")
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": range(len(dates)),
+            "Close": [float(i) + 0.5 for i in range(len(dates))],
+        }
+    ).iloc[::-1].to_csv(price_dir / CSV_NAME, index=False)
+    return tmp_path
+
+
+def test_convert_and_read_range(data_dir):
+    csv_path = str(data_dir / "market_data" / "price_data" / CSV_NAME)
+    assert not has_parquet(csv_path)
+    assert convert_price_data(str(data_dir)) == [get_parquet_path(csv_path)]
+    assert has_parquet(csv_path)
+
+    data = read_price_range(get_parquet_path(csv_path), "2024-01-02", "2024-01-05")
+    assert list(data.index) == list(pd.bdate_range("2024-01-02", "2024-01-05"))
+    assert data.index.name is None
+    assert data["Close"].is_monotonic_increasing
+
+
+def test_stale_parquet_is_ignored(data_dir):
+    csv_path = str(data_dir / "market_data" / "price_data" / CSV_NAME)
+    convert_price_data(str(data_dir))
+    later = os.path.getmtime(get_parquet_path(csv_path)) + 10
+    os.utime(csv_path, (later, later))
+    assert not has_parquet(csv_path)
+
+
+def test_range_reads_match_csv(data_dir, monkeypatch):
+    monkeypatch.setattr(interface, "DATA_DIR", str(data_dir))
+    from_csv = interface._load_YFin_data_range("AAA", "2024-01-10", "2024-02-02")
+    convert_price_data(str(data_dir))
+    from_parquet = interface._load_YFin_data_range("AAA", "2024-01-10", "2024-02-02")
+    pd.testing.assert_frame_equal(from_parquet, from_csv, check_freq=False)
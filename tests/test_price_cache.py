@@ -0,0 +1,65 @@
+import os
+
+import pandas as pd
+
+from tradingagents.dataflows.price_cache import PriceDataCache, read_price_csv
+
+CSV = """Date,Open,High,Low,Close,Adj Close,Volume
+2024-01-03,101.0,102.0,100.0,101.5,101.5,1100
+2024-01-02 00:00:00-05:00,100.0,101.0,99.0,100.5,100.5,1000
+2024-01-04,102.0,103.0,101.0,102.5,102.5,1200
+"""
+
+
+def write_csv(path, text=CSV):
+    path.write_text(text)
+    return str(path)
+
+
+def test_read_price_csv_indexes_by_sorted_date(tmp_path):
+    data = read_price_csv(write_csv(tmp_path / "AAA.csv"))
+    assert list(data.index) == list(
+        pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04"])
+    )
+    assert data.index.tz is None
+    assert data.loc["2024-01-03":"2024-01-04", "Close"].tolist() == [101.5, 102.5]
+    # The raw Date column survives for callers that print it
+    assert data["Date"].iloc[0] == "2024-01-02 00:00:00-05:00"
+
+
+def test_cache_returns_shared_frame_until_file_changes(tmp_path):
+    path = write_csv(tmp_path / "AAA.csv")
+    cache = PriceDataCache(max_bytes=10**9)
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert len(cache) == 1 and cache.total_bytes > 0
+
+    write_csv(tmp_path / "AAA.csv", CSV + "2024-01-05,103,104,102,103.5,103.5,1300\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = cache.get(path)
+    assert second is not first
+    assert len(second) == 4
+    assert len(cache) == 1
+
+
+def test_cache_is_bounded_by_bytes(tmp_path):
+    paths = [write_csv(tmp_path / f"T{i}.csv") for i in range(3)]
+    one_frame = PriceDataCache(max_bytes=10**9)
+    one_frame.get(paths[0])
+    budget = one_frame.total_bytes * 2
+
+    cache = PriceDataCache(max_bytes=budget)
+    frames = [cache.get(path) for path in paths]
+    assert len(cache) == 2
+    assert cache.total_bytes <= budget
+    # The least recently used file was evicted and is read again
+    assert cache.get(paths[0]) is not frames[0]
+    assert cache.get(paths[2]) is frames[2]
+
+
+def test_frames_over_budget_are_not_cached(tmp_path):
+    path = write_csv(tmp_path / "AAA.csv")
+    cache = PriceDataCache(max_bytes=1)
+    assert len(cache.get(path)) == 3
+    assert len(cache) == 0 and cache.total_bytes == 0
@@ -0,0 +1,159 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from tradingagents.dataflows.reddit_utils import (
+    TickerMatcher,
+    build_reddit_index,
+    fetch_top_company_posts_range,
+    fetch_top_from_category,
+    fetch_top_from_category_range,
+    get_reddit_index_path,
+    get_ticker_matcher,
+)
+
+
+def post(day, title, ups, text=""):
+    created = datetime(2024, 1, day, 12, tzinfo=timezone.utc).timestamp()
+    return {
+        "created_utc": created,
+        "title": title,
+        "selftext": text,
+        "url": f"https://reddit.com/{title.replace(' ', '_')}",
+        "ups": ups,
+    }
+
+
+def write_subreddit(path, posts):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        for p in posts:
+            f.write(json.dumps(p) + "\n")
+        f.write("\n")
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    write_subreddit(
+        tmp_path / "global_news" / "worldnews.jsonl",
+        [post(2, "rates", 5), post(2, "oil", 9), post(3, "jobs", 1), post(5, "late", 4)],
+    )
+    write_subreddit(
+        tmp_path / "company_news" / "stocks.jsonl",
+        [
+            post(2, "Apple beats estimates", 10),
+            post(2, "Microsoft cloud", 20, "and AAPL too"),
+            post(3, "Square and Squarespace", 3),
+            post(3, "Nothing here", 50),
+            post(4, "Facebook rebrand", 7),
+        ],
+    )
+    write_subreddit(
+        tmp_path / "company_news" / "investing.jsonl",
+        [post(2, "apple dividend", 1), post(3, "MSFT buyback", 2)],
+    )
+    return str(tmp_path)
+
+
+def titles(posts):
+    return [p["title"] for p in posts]
+
+
+def fetch_all(data_path):
+    return {
+        "global": fetch_top_from_category_range(
+            "global_news", "2024-01-02", "2024-01-04", 2, data_path=data_path
+        ),
+        "apple": fetch_top_from_category_range(
+            "company_news", "2024-01-01", "2024-01-05", 4, "AAPL", data_path=data_path
+        ),
+        "batch": fetch_top_company_posts_range(
+            ["AAPL", "MSFT", "SQ", "SQSP", "META"],
+            "2024-01-01",
+            "2024-01-05",
+            4,
+            data_path=data_path,
+        ),
+    }
+
+
+def test_range_fetch_keeps_top_posts_per_day(data_path):
+    posts = fetch_top_from_category_range(
+        "global_news", "2024-01-02", "2024-01-04", 2, data_path=data_path
+    )
+    # One subreddit, so up to two posts a day by upvotes; day 5 is outside the range
+    assert titles(posts) == ["oil", "rates", "jobs"]
+    assert posts[0]["posted_date"] == "2024-01-02"
+
+    single_day = fetch_top_from_category(
+        "global_news", "2024-01-02", 1, data_path=data_path
+    )
+    assert titles(single_day) == ["oil"]
+
+
+def test_company_posts_match_names_and_symbols(data_path):
+    results = fetch_all(data_path)
+    assert set(titles(results["apple"])) == {
+        "Apple beats estimates",
+        "Microsoft cloud",
+        "apple dividend",
+    }
+    batch = results["batch"]
+    assert batch["AAPL"] == results["apple"]
+    assert titles(batch["MSFT"]) == ["Microsoft cloud", "MSFT buyback"]
+    assert titles(batch["SQ"]) == ["Square and Squarespace"]
+    assert titles(batch["SQSP"]) == ["Square and Squarespace"]
+    assert titles(batch["META"]) == ["Facebook rebrand"]
+
+
+def test_index_gives_the_same_results_as_scanning(data_path):
+    scanned = fetch_all(data_path)
+    assert build_reddit_index(data_path) == get_reddit_index_path(data_path)
+    assert fetch_all(data_path) == scanned
+
+
+def test_stale_index_falls_back_to_the_files(data_path):
+    build_reddit_index(data_path)
+    path = os.path.join(data_path, "global_news", "worldnews.jsonl")
+    write_subreddit(path, [post(2, "fresh", 100)])
+    later = os.path.getmtime(get_reddit_index_path(data_path)) + 10
+    os.utime(path, (later, later))
+
+    posts = fetch_top_from_category_range(
+        "global_news", "2024-01-02", "2024-01-02", 2, data_path=data_path
+    )
+    assert titles(posts) == ["fresh"]
+
+
+def test_max_limit_below_file_count(data_path):
+    with pytest.raises(ValueError):
+        fetch_top_from_category_range(
+            "company_news", "2024-01-02", "2024-01-02", 1, data_path=data_path
+        )
+
+
+def test_ticker_matcher_is_case_insensitive():
+    matcher = TickerMatcher(["AAPL", "JPM"])
+    assert matcher.matches("new APPLE watch")
+    assert matcher.matches("no match", "jp morgan raises rates")
+    assert not matcher.matches("Microsoft", "")
+    assert matcher.match("aapl and JPMorgan Chase") == {"AAPL", "JPM"}
+
+
+def test_ticker_matcher_reports_overlapping_terms():
+    matcher = TickerMatcher(["SQ", "SQSP", "META"])
+    # "Squarespace" also mentions "Square", the name of SQ
+    assert matcher.match("Squarespace earnings") == {"SQ", "SQSP"}
+    assert matcher.match("Square only") == {"SQ"}
+    assert matcher.match("Facebook", "Meta") == {"META"}
+    assert matcher.match("nothing") == set()
+
+
+def test_unknown_tickers_match_their_symbol():
+    assert TickerMatcher(["ZZZ"]).match("zzz rallies") == {"ZZZ"}
+
+
+def test_ticker_matchers_are_shared():
+    assert get_ticker_matcher(("AAPL", "MSFT")) is get_ticker_matcher(("AAPL", "MSFT"))
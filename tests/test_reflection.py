@@ -0,0 +1,63 @@
+import asyncio
+import logging
+
+import pytest
+
+from tradingagents.graph.reflection import REFLECTION_COMPONENTS, Reflector
+
+from fakes import FakeChatModel, FakeMemory
+
+
+def final_state(ticker):
+    return {
+        "market_report": f"{ticker} market",
+        "sentiment_report": f"{ticker} sentiment",
+        "news_report": f"{ticker} news",
+        "fundamentals_report": f"{ticker} fundamentals",
+        "trader_investment_plan": "buy",
+        "investment_debate_state": {
+            "bull_history": "bull case",
+            "bear_history": "bear case",
+            "judge_decision": "buy",
+        },
+        "risk_debate_state": {"judge_decision": f"{ticker} RISK VERDICT"},
+    }
+
+
+@pytest.fixture
+def memories():
+    return {key: FakeMemory(key) for key, _, _ in REFLECTION_COMPONENTS}
+
+
+def test_reflect_batch_fills_every_memory(memories):
+    reflector = Reflector(FakeChatModel())
+    states = [(final_state("AAA"), 0.02), (final_state("BBB"), -0.01)]
+    reflector.reflect_batch(states, memories)
+    for memory in memories.values():
+        assert len(memory.added) == 2
+        assert "AAA market" in memory.added[0][0]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_failed_reflections_are_skipped(memories, caplog, use_async):
+    llm = FakeChatModel(fail_on="AAA RISK VERDICT", fail_count=1)
+    reflector = Reflector(llm)
+    states = [(final_state("AAA"), 0.02), (final_state("BBB"), -0.01)]
+
+    with caplog.at_level(logging.WARNING):
+        if use_async:
+            asyncio.run(reflector.areflect_batch(states, memories))
+        else:
+            reflector.reflect_batch(states, memories)
+
+    assert len(memories["risk_manager"].added) == 1
+    assert "BBB market" in memories["risk_manager"].added[0][0]
+    assert all(len(memories[key].added) == 2 for key in ("bull", "bear", "trader"))
+    assert "risk_manager memory failed" in caplog.text
+
+
+def test_only_given_memories_are_updated(memories):
+    reflector = Reflector(FakeChatModel())
+    reflector.reflect_batch([(final_state("AAA"), 0.02)], {"bull": memories["bull"]})
+    assert len(memories["bull"].added) == 1
+    assert memories["bear"].added == []
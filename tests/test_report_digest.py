@@ -0,0 +1,72 @@
+import asyncio
+
+from tradingagents.agents.utils.report_digest import create_report_digest, render_reports
+
+from fakes import FakeChatModel
+
+LABELS = ("Market", "Sentiment", "News", "Fundamentals")
+STATE = {
+    "company_of_interest": "AAA",
+    "trade_date": "2024-01-05",
+    "market_report": "RSI 71",
+    "sentiment_report": "upbeat",
+    "news_report": "",
+    "fundamentals_report": "P/E 18",
+}
+
+
+class RecordingChatModel(FakeChatModel):
+    """FakeChatModel that keeps the text of every prompt it receives."""
+
+    prompts: list = []
+
+    def _reply(self, messages, **kwargs):
+        self.prompts.append("\n".join(str(m.content) for m in messages))
+        return super()._reply(messages, **kwargs)
+
+
+def test_render_reports_without_digest_lists_every_report():
+    assert render_reports(STATE, LABELS) == (
+        "Market: RSI 71\nSentiment: upbeat\nNews: \nFundamentals: P/E 18"
+    )
+
+
+def test_render_reports_prefers_digest():
+    state = dict(STATE, report_digest="- RSI 71, overbought")
+    assert render_reports(state, LABELS) == (
+        "Digest of the analyst team's reports: - RSI 71, overbought"
+    )
+
+
+def test_digest_node_condenses_non_empty_reports():
+    llm = RecordingChatModel(prompts=[])
+    node = create_report_digest(llm, max_words=120)
+
+    assert node.invoke(STATE) == {
+        "report_digest": "report 1 FINAL TRANSACTION PROPOSAL: **BUY**"
+    }
+    prompt = llm.prompts[0]
+    assert "AAA as of 2024-01-05" in prompt and "under 120 words" in prompt
+    assert "### Market Report\nRSI 71" in prompt
+    assert "### Fundamentals Report\nP/E 18" in prompt
+    assert "News Report" not in prompt
+
+    assert asyncio.run(node.ainvoke(STATE))["report_digest"].startswith("report 2")
+
+
+def test_graph_runs_digest_once_for_downstream_agents(make_graph, monkeypatch):
+    import tradingagents.graph.trading_graph as trading_graph
+
+    llm = RecordingChatModel(prompts=[])
+    monkeypatch.setattr(trading_graph, "ChatOpenAI", lambda **kwargs: llm)
+    graph = make_graph(["market"], report_digest=True)
+
+    final_state, _ = graph.propagate("AAA", "2024-01-05")
+
+    digest_prompts = [p for p in llm.prompts if "compact digest" in p]
+    assert len(digest_prompts) == 1
+    assert final_state["report_digest"] == "report 2 FINAL TRANSACTION PROPOSAL: **BUY**"
+    downstream = llm.prompts[2:]
+    assert downstream and all(
+        "Digest of the analyst team's reports" in p for p in downstream[:2]
+    )
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from tradingagents.graph.signal_processing import SignalProcessor
+
+from fakes import FakeChatModel
+
+
+@pytest.fixture
+def processor():
+    return SignalProcessor(FakeChatModel(), confidence_threshold=0.8)
+
+
+@pytest.mark.parametrize(
+    "signal, decision, confidence",
+    [
+        ("Long report...\nFINAL TRANSACTION PROPOSAL: **SELL**", "SELL", 1.0),
+        ("final transaction proposal: hold", "HOLD", 1.0),
+        ("Weighing it all up.\n\nRecommendation: **Buy**", "BUY", 0.9),
+        ("Final Decision - HOLD until earnings", "HOLD", 0.9),
+        ("Given the drawdown I recommend that we sell now.", "SELL", 0.8),
+        ("The bull argued **BUY**.", "BUY", 0.6),
+        ("No clear view either way.", None, 0.0),
+    ],
+)
+def test_parse_signal(processor, signal, decision, confidence):
+    assert processor.parse_signal(signal) == (decision, pytest.approx(confidence))
+
+
+@pytest.mark.parametrize(
+    "signal",
+    [
+        "Recommendation: Hold off on new purchases until guidance improves; "
+        "our final call is to SELL the position.",
+        "We should hold off buying ahead of earnings. I recommend selling.",
+        "End with FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL** to confirm.",
+        "Recommendation: buy-side sentiment is weak.",
+        "We should holding steady for now.",
+    ],
+)
+def test_phrasal_and_template_words_are_not_decisions(processor, signal):
+    assert processor.parse_signal(signal) == (None, 0.0)
+
+
+def test_template_echo_does_not_hide_the_proposal(processor):
+    signal = (
+        "Always conclude with FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**.\n"
+        "Given the guidance cut, FINAL TRANSACTION PROPOSAL: **SELL**"
+    )
+    assert processor.parse_signal(signal) == ("SELL", pytest.approx(1.0))
+
+
+def test_negated_decisions_are_ignored(processor):
+    assert processor.parse_signal("We should not sell. We should hold.") == (
+        "HOLD",
+        pytest.approx(0.8),
+    )
+
+
+def test_last_conclusion_wins_and_conflicts_lower_confidence(processor):
+    decision, confidence = processor.parse_signal(
+        "Recommendation: BUY at first glance.\n...\nFinal recommendation: SELL"
+    )
+    assert decision == "SELL"
+    assert confidence == pytest.approx(0.45)
+    # A closing proposal outweighs earlier labelled conclusions
+    decision, confidence = processor.parse_signal(
+        "Recommendation: BUY\nFINAL TRANSACTION PROPOSAL: **HOLD**"
+    )
+    assert decision == "HOLD"
+    assert confidence == pytest.approx(1.0 / 1.9)
+
+
+def test_llm_only_when_parser_is_unsure(processor):
+    llm = processor.quick_thinking_llm
+    assert processor.process_signal("FINAL TRANSACTION PROPOSAL: **SELL**") == "SELL"
+    assert llm.calls == 0
+
+    # The fake model answers with a BUY proposal
+    assert "BUY" in processor.process_signal("The bull argued **BUY**.")
+    assert "BUY" in asyncio.run(processor.aprocess_signal("Mixed signals."))
+    assert llm.calls == 2
+
+    stats = processor.get_stats()
+    assert (stats["rule_based"], stats["llm_fallback"]) == (1, 2)
+    assert stats["fallback_rate"] == pytest.approx(2 / 3)
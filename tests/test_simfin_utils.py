@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from tradingagents.dataflows.simfin_utils import (
+    SimFinStatementIndex,
+    get_latest_statement,
+    load_statement_index,
+)
+
+STATEMENTS = """Ticker;Report Date;Publish Date;Revenue
+AAA;2023-09-30;2023-11-02;300
+BBB;2023-12-31;2024-02-01;50
+AAA;2023-12-31;2024-02-01;400
+AAA;2023-06-30;2023-08-03;200
+AAA;2023-12-31;2024-02-01;401
+CCC;2023-12-31;;10
+"""
+
+
+@pytest.fixture
+def statements(tmp_path):
+    path = tmp_path / "income.csv"
+    path.write_text(STATEMENTS)
+    return str(path)
+
+
+def test_latest_statement_published_by_date(statements):
+    index = SimFinStatementIndex(statements)
+    assert index.latest("AAA", "2023-11-01")["Revenue"] == 200
+    assert index.latest("AAA", "2023-11-02")["Revenue"] == 300
+    # Of two statements published the same day, the first in the file wins
+    assert index.latest("AAA", "2024-06-01")["Revenue"] == 400
+    assert index.latest("BBB", "2024-06-01")["Revenue"] == 50
+
+
+def test_missing_statements(statements):
+    index = SimFinStatementIndex(statements)
+    assert index.latest("AAA", "2023-01-01") is None
+    assert index.latest("ZZZ", "2024-06-01") is None
+    # Rows without a publish date are never returned
+    assert index.latest("CCC", "2024-06-01") is None
+
+
+def test_index_is_reparsed_when_the_file_changes(statements):
+    first = load_statement_index(statements)
+    assert load_statement_index(statements) is first
+
+    with open(statements, "a") as f:
+        f.write("AAA;2024-03-31;2024-05-02;500\n")
+    stat = os.stat(statements)
+    os.utime(statements, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert load_statement_index(statements) is not first
+    assert get_latest_statement(statements, "AAA", "2024-06-01")["Revenue"] == 500
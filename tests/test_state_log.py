@@ -0,0 +1,128 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tradingagents.graph.state_log import ZSTD_AVAILABLE, StateLog
+
+COMPRESSIONS = [
+    None,
+    pytest.param(
+        "zstd",
+        marks=pytest.mark.skipif(not ZSTD_AVAILABLE, reason="needs zstandard"),
+    ),
+]
+
+
+def record(trade_date, note=""):
+    return {"trade_date": trade_date, "final_trade_decision": f"BUY {note}"}
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_append_and_read(tmp_path, compression):
+    log = StateLog(str(tmp_path), compression)
+    log.append("AAA", "2024-01-02", record("2024-01-02"))
+    log.append("AAA", "2024-01-03", record("2024-01-03"))
+    log.append("AAA", "2024-01-02", record("2024-01-02", "again"))
+
+    assert log.dates("AAA") == ["2024-01-02", "2024-01-03"]
+    assert log.read("AAA", "2024-01-02")["final_trade_decision"] == "BUY again"
+    assert log.read("AAA", "2024-01-04") is None
+    assert len(list(log.records("AAA"))) == 3
+    assert log.dates("BBB") == []
+    assert not os.path.exists(os.path.dirname(log.log_path("BBB")))
+
+    reopened = StateLog(str(tmp_path), compression)
+    assert [r["trade_date"] for r in reopened.records("AAA")] == [
+        "2024-01-02",
+        "2024-01-03",
+        "2024-01-02",
+    ]
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_torn_record_is_dropped(tmp_path, compression):
+    log = StateLog(str(tmp_path), compression)
+    log.append("AAA", "2024-01-02", record("2024-01-02"))
+    log.append("AAA", "2024-01-03", record("2024-01-03"))
+    size = os.path.getsize(log.log_path("AAA"))
+
+    # A crash mid-append: half a record, no index entry
+    with open(log.log_path("AAA"), "ab") as f:
+        f.write(b'{"trade_date": "2024-01-04", "final_tr')
+
+    reopened = StateLog(str(tmp_path), compression)
+    assert reopened.dates("AAA") == ["2024-01-02", "2024-01-03"]
+    assert os.path.getsize(log.log_path("AAA")) == size
+    reopened.append("AAA", "2024-01-04", record("2024-01-04"))
+    assert reopened.read("AAA", "2024-01-04") == record("2024-01-04")
+
+
+def test_unindexed_records_are_recovered(tmp_path):
+    log = StateLog(str(tmp_path))
+    log.append("AAA", "2024-01-02", record("2024-01-02"))
+    # A crash after the record but before its index entry, plus a torn index line
+    with open(log.log_path("AAA"), "ab") as f:
+        f.write((json.dumps(record("2024-01-03")) + "\n").encode())
+    with open(log.index_path("AAA"), "a") as f:
+        f.write('["2024-01-03", ')
+
+    reopened = StateLog(str(tmp_path))
+    assert reopened.dates("AAA") == ["2024-01-02", "2024-01-03"]
+    with open(log.index_path("AAA")) as f:
+        assert len([json.loads(line) for line in f]) == 2
+
+
+def test_two_instances_share_a_directory(tmp_path):
+    first = StateLog(str(tmp_path))
+    second = StateLog(str(tmp_path))
+    first.append("AAA", "2024-01-02", record("2024-01-02"))
+    second.append("AAA", "2024-01-03", record("2024-01-03"))
+    first.append("AAA", "2024-01-04", record("2024-01-04"))
+
+    for log in (first, second, StateLog(str(tmp_path))):
+        assert log.dates("AAA") == ["2024-01-02", "2024-01-03", "2024-01-04"]
+        assert log.read("AAA", "2024-01-03") == record("2024-01-03")
+
+    with open(first.index_path("AAA")) as f:
+        offsets = [json.loads(line)[1] for line in f]
+    assert len(set(offsets)) == 3
+
+
+def test_concurrent_threads(tmp_path):
+    logs = [StateLog(str(tmp_path)) for _ in range(4)]
+    dates = [f"2024-02-{day:02d}" for day in range(1, 29)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for i, trade_date in enumerate(dates):
+            pool.submit(logs[i % 4].append, "AAA", trade_date, record(trade_date))
+
+    log = StateLog(str(tmp_path))
+    assert sorted(log.dates("AAA")) == dates
+    assert all(log.read("AAA", d) == record(d) for d in dates)
+
+
+def _append_many(directory, worker):
+    log = StateLog(directory)
+    for i in range(20):
+        trade_date = f"{worker}-{i:02d}"
+        log.append("AAA", trade_date, record(trade_date, "x" * 2000))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_concurrent_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_append_many, args=(str(tmp_path), worker))
+        for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    assert all(process.exitcode == 0 for process in workers)
+
+    log = StateLog(str(tmp_path))
+    assert len(log.dates("AAA")) == 80
+    assert len(list(log.records("AAA"))) == 80
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    price_dir = tmp_path / "market_data" / "price_data"
+    price_dir.mkdir(parents=True)
+    dates = pd.bdate_range("2023-10-02", "2024-01-31")
+    close = 100 + np.cumsum(np.sin(np.arange(len(dates))))
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close - 0.5,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": 1000 + np.arange(len(dates)),
+        }
+    ).to_csv(price_dir / "AAA-YFin-data-2015-01-01-2025-03-25.csv", index=False)
+    return tmp_path
+
+
+@pytest.mark.parametrize("indicator", ["close_10_ema", "rsi", "macd", "boll_ub"])
+def test_window_matches_per_day_values(data_dir, indicator):
+    price_dir = str(data_dir / "market_data" / "price_data")
+    window = StockstatsUtils.get_stock_stats_window(
+        "AAA", indicator, "2024-01-01", "2024-01-12", price_dir
+    )
+    assert list(window.index) == list(
+        pd.bdate_range("2024-01-01", "2024-01-12").strftime("%Y-%m-%d")
+    )
+    for date, value in window.items():
+        assert value == pytest.approx(
+            StockstatsUtils.get_stock_stats("AAA", indicator, date, price_dir)
+        )
+
+
+def test_offline_report_lists_trading_days_newest_first(data_dir, monkeypatch):
+    monkeypatch.setattr(interface, "DATA_DIR", str(data_dir))
+    report = interface.get_stock_stats_indicators_window(
+        "AAA", "close_10_ema", "2024-01-08", 7, False
+    )
+    lines = [line for line in report.splitlines() if line.startswith("2024-")]
+    assert [line[:10] for line in lines] == [
+        "2024-01-08",
+        "2024-01-05",
+        "2024-01-04",
+        "2024-01-03",
+        "2024-01-02",
+        "2024-01-01",
+    ]
+    assert report.startswith("## close_10_ema values from 2024-01-01 to 2024-01-08")
+    with pytest.raises(ValueError):
+        interface.get_stock_stats_indicators_window(
+            "AAA", "nope", "2024-01-08", 7, False
+        )
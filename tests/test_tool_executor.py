@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from tradingagents.graph.tool_executor import ToolExecutor, create_tool_node
+
+
+@tool
+def slow(seconds: float) -> str:
+    """Sleep for a while."""
+    time.sleep(seconds)
+    return f"slept {seconds}"
+
+
+@tool
+def broken() -> str:
+    """Always fails."""
+    raise RuntimeError("no data")
+
+
+TOOLS = {"slow": slow, "broken": broken}
+
+
+def call(name, call_id, **args):
+    return {"name": name, "args": args, "id": call_id}
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor(max_workers=4, timeout=5)
+    yield executor
+    executor.shutdown(wait=False)
+
+
+def test_calls_run_concurrently_in_order(executor):
+    calls = [call("slow", f"c{i}", seconds=0.2) for i in range(4)]
+    start = time.monotonic()
+    messages = executor.run(calls, TOOLS)
+    assert time.monotonic() - start < 0.6
+    assert [m.tool_call_id for m in messages] == ["c0", "c1", "c2", "c3"]
+    assert all(m.content == "slept 0.2" for m in messages)
+
+
+def test_errors_become_tool_messages(executor):
+    messages = executor.run([call("broken", "c1"), call("missing", "c2")], TOOLS)
+    assert [m.status for m in messages] == ["error", "error"]
+    assert "no data" in messages[0].content
+    assert "not a valid tool" in messages[1].content
+
+
+def test_per_tool_timeouts():
+    executor = ToolExecutor(max_workers=4, timeout=5, timeouts={"slow": 0.1})
+    assert executor.timeout_for("slow") == 0.1
+    assert executor.timeout_for("broken") == 5
+
+    start = time.monotonic()
+    messages = executor.run(
+        [call("slow", "c1", seconds=1), call("broken", "c2")], TOOLS
+    )
+    assert time.monotonic() - start < 0.5
+    assert messages[0].status == "error"
+    assert "within 0.1 seconds" in messages[0].content
+    assert "no data" in messages[1].content
+    executor.shutdown(wait=False)
+
+
+def test_override_extends_default_timeout():
+    executor = ToolExecutor(max_workers=4, timeout=0.1, timeouts={"slow": 1})
+    messages = executor.run(
+        [call("broken", "c1"), call("slow", "c2", seconds=0.3)], TOOLS
+    )
+    assert "no data" in messages[0].content
+    assert messages[1].content == "slept 0.3"
+    executor.shutdown(wait=False)
+
+
+def test_async_per_tool_timeouts():
+    executor = ToolExecutor(max_workers=4, timeouts={"slow": 0.1})
+    messages = asyncio.run(
+        executor.arun(
+            [call("slow", "c1", seconds=1), call("slow", "c2", seconds=0)], TOOLS
+        )
+    )
+    assert messages[0].status == "error"
+    assert messages[1].content == "slept 0.0"
+    executor.shutdown(wait=False)
+
+
+def test_queued_calls_get_their_full_timeout():
+    # One worker: each call waits for the previous ones, longer than its timeout
+    executor = ToolExecutor(max_workers=1, timeout=0.3)
+    calls = [call("slow", f"c{i}", seconds=0.15) for i in range(4)]
+
+    start = time.monotonic()
+    messages = executor.run(calls, TOOLS)
+    assert time.monotonic() - start >= 0.6
+    assert all(m.content == "slept 0.15" for m in messages)
+
+    messages = asyncio.run(executor.arun(calls, TOOLS))
+    assert all(m.content == "slept 0.15" for m in messages)
+    executor.shutdown(wait=False)
+
+
+def test_timeout_counts_from_start_behind_a_stuck_call():
+    executor = ToolExecutor(max_workers=1, timeouts={"slow": 0.2})
+    messages = executor.run(
+        [call("slow", "c1", seconds=0.5), call("slow", "c2", seconds=0)], TOOLS
+    )
+    assert "within 0.2 seconds" in messages[0].content
+    # The second call only starts once the abandoned one releases the worker
+    assert messages[1].content == "slept 0.0"
+    executor.shutdown(wait=False)
+
+
+def test_tool_node_runs_pending_calls(executor):
+    node = create_tool_node([slow], executor)
+    message = AIMessage(content="", tool_calls=[call("slow", "c1", seconds=0)])
+    state = {"messages": [message]}
+    assert node.invoke(state)["messages"][0].content == "slept 0.0"
+    result = asyncio.run(node.ainvoke(state))
+    assert result["messages"][0].tool_call_id == "c1"
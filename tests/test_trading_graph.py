@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import pytest
+
+REPORTS = ["market_report", "sentiment_report", "news_report", "fundamentals_report"]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_every_analyst_reports(make_graph, fake_llm, parallel):
+    fake_llm.tool_first = True
+    graph = make_graph(parallel_analysts=parallel)
+    final_state, decision = graph.propagate("AAA", "2024-01-05")
+
+    assert decision == "BUY"
+    assert all(final_state[key].startswith("report") for key in REPORTS)
+    assert final_state["final_trade_decision"]
+
+
+def test_parallel_analysts_overlap(make_graph, fake_llm):
+    fake_llm.delay = 0.2
+    sequential = make_graph()
+    start = time.monotonic()
+    sequential.propagate("AAA", "2024-01-05")
+    sequential_time = time.monotonic() - start
+
+    parallel = make_graph(parallel_analysts=True)
+    start = time.monotonic()
+    parallel.propagate("AAA", "2024-01-05")
+    # Four analyst calls of 0.2s overlap instead of adding up
+    assert time.monotonic() - start < sequential_time - 0.4
+
+
+def test_subset_of_analysts_in_parallel(make_graph):
+    graph = make_graph(["market", "news"], parallel_analysts=True)
+    final_state, _ = graph.propagate("AAA", "2024-01-05")
+    assert final_state["market_report"] and final_state["news_report"]
+    assert not final_state["sentiment_report"]
+
+
+def test_propagate_batch_keeps_job_order_and_isolates_failures(
+    make_graph, fake_llm, caplog
+):
+    graph = make_graph()
+    fake_llm.fail_on, fake_llm.fail_count = "BBB", 1
+    results = graph.propagate_batch(
+        [("AAA", "2024-01-05"), ("BBB", "2024-01-05"), ("CCC", "2024-01-08")],
+        max_concurrency=3,
+    )
+
+    assert [(r["ticker"], r["trade_date"]) for r in results] == [
+        ("AAA", "2024-01-05"),
+        ("BBB", "2024-01-05"),
+        ("CCC", "2024-01-08"),
+    ]
+    assert [r["decision"] for r in results] == ["BUY", None, "BUY"]
+    assert isinstance(results[1]["error"], RuntimeError)
+    assert results[0]["error"] is None
+    assert results[2]["final_state"]["company_of_interest"] == "CCC"
+    assert graph.propagate_batch([]) == []
+
+    # The failure is logged with its traceback
+    [record] = [r for r in caplog.records if r.name.endswith("trading_graph")]
+    assert record.getMessage() == "Propagation failed for BBB on 2024-01-05"
+    assert record.exc_info[1] is results[1]["error"]
+
+
+def test_propagate_batch_runs_jobs_concurrently(make_graph, fake_llm):
+    graph = make_graph()
+    jobs = [(ticker, "2024-01-05") for ticker in ("AAA", "BBB", "CCC", "DDD")]
+
+    fake_llm.delay = 0.05
+    start = time.monotonic()
+    graph.propagate_batch(jobs[:1])
+    single = time.monotonic() - start
+
+    start = time.monotonic()
+    graph.propagate_batch(jobs, max_concurrency=4)
+    assert time.monotonic() - start < 2.5 * single
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_apropagate(make_graph, fake_llm, parallel):
+    fake_llm.tool_first = True
+    graph = make_graph(parallel_analysts=parallel)
+    final_state, decision = asyncio.run(graph.apropagate("AAA", "2024-01-05"))
+    assert decision == "BUY"
+    assert all(final_state[key].startswith("report") for key in REPORTS)
+
+
+def test_astream_yields_growing_state(make_graph):
+    graph = make_graph()
+
+    async def collect():
+        return [chunk async for chunk in graph.astream("AAA", "2024-01-05")]
+
+    chunks = asyncio.run(collect())
+    assert len(chunks) > 5
+    assert not chunks[0]["market_report"]
+    assert chunks[-1]["final_trade_decision"]
+
+
+def test_concurrent_apropagate_calls_overlap(make_graph, fake_llm):
+    graph = make_graph()
+    fake_llm.delay = 0.05
+    start = time.monotonic()
+    asyncio.run(graph.apropagate("AAA", "2024-01-05"))
+    single = time.monotonic() - start
+
+    async def both():
+        return await asyncio.gather(
+            graph.apropagate("AAA", "2024-01-05"), graph.apropagate("BBB", "2024-01-05")
+        )
+
+    start = time.monotonic()
+    results = asyncio.run(both())
+    assert time.monotonic() - start < 1.6 * single
+    assert [state["company_of_interest"] for state, _ in results] == ["AAA", "BBB"]
@@ -1,6 +1,7 @@
 from .utils.agent_utils import Toolkit, create_msg_delete
 from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
 from .utils.memory import FinancialSituationMemory
+from .utils.report_digest import create_report_digest
 
 from .analysts.fundamentals_analyst import create_fundamentals_analyst
 from .analysts.market_analyst import create_market_analyst
@@ -24,6 +25,7 @@ __all__ = [
     "Toolkit",
     "AgentState",
     "create_msg_delete",
+    "create_report_digest",
     "InvestDebateState",
     "RiskDebateState",
     "create_bear_researcher",
@@ -1,10 +1,11 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 
 
 def create_news_analyst(llm, toolkit):
-    def news_analyst_node(state):
+    def news_analyst_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
@@ -44,9 +45,9 @@ def create_news_analyst(llm, toolkit):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def news_analyst_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -57,4 +58,12 @@ def create_news_analyst(llm, toolkit):
             "news_report": report,
         }
 
-    return news_analyst_node
+    def news_analyst_node(state):
+        result = news_analyst_chain(state).invoke(state["messages"])
+        return news_analyst_update(result)
+
+    async def anews_analyst_node(state):
+        result = await news_analyst_chain(state).ainvoke(state["messages"])
+        return news_analyst_update(result)
+
+    return RunnableLambda(news_analyst_node, afunc=anews_analyst_node)
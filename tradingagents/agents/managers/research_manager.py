@@ -1,9 +1,12 @@
+from langchain_core.runnables import RunnableLambda
+from tradingagents.agents.utils.debate_context import carry_context
+from tradingagents.agents.utils.memory import format_situation
 import time
 import json
 
 
 def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
+    def research_manager_prompt(state, past_memories) -> str:
         history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
@@ -12,9 +15,6 @@ def create_research_manager(llm, memory):
 
         investment_debate_state = state["investment_debate_state"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
@@ -36,7 +36,11 @@ Here are your past reflections on mistakes:
 Here is the debate:
 Debate History:
 {history}"""
-        response = llm.invoke(prompt)
+
+        return prompt
+
+    def research_manager_update(state, response) -> dict:
+        investment_debate_state = state["investment_debate_state"]
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -45,6 +49,7 @@ Debate History:
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": response.content,
             "count": investment_debate_state["count"],
+            **carry_context(investment_debate_state),
         }
 
         return {
@@ -52,4 +57,14 @@ Debate History:
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    def research_manager_node(state) -> dict:
+        past_memories = memory.get_memories(format_situation(state), n_matches=2)
+        response = llm.invoke(research_manager_prompt(state, past_memories))
+        return research_manager_update(state, response)
+
+    async def aresearch_manager_node(state) -> dict:
+        past_memories = await memory.aget_memories(format_situation(state), n_matches=2)
+        response = await llm.ainvoke(research_manager_prompt(state, past_memories))
+        return research_manager_update(state, response)
+
+    return RunnableLambda(research_manager_node, afunc=aresearch_manager_node)
@@ -1,9 +1,12 @@
+from langchain_core.runnables import RunnableLambda
+from tradingagents.agents.utils.debate_context import carry_context
+from tradingagents.agents.utils.memory import format_situation
 import time
 import json
 
 
 def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
+    def risk_manager_prompt(state, past_memories) -> str:
 
         company_name = state["company_of_interest"]
 
@@ -15,9 +18,6 @@ def create_risk_manager(llm, memory):
         sentiment_report = state["sentiment_report"]
         trader_plan = state["investment_plan"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
@@ -43,7 +43,10 @@ Deliverables:
 
 Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes."""
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def risk_manager_update(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -56,6 +59,7 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
             "current_safe_response": risk_debate_state["current_safe_response"],
             "current_neutral_response": risk_debate_state["current_neutral_response"],
             "count": risk_debate_state["count"],
+            **carry_context(risk_debate_state),
         }
 
         return {
@@ -63,4 +67,14 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    def risk_manager_node(state) -> dict:
+        past_memories = memory.get_memories(format_situation(state), n_matches=2)
+        response = llm.invoke(risk_manager_prompt(state, past_memories))
+        return risk_manager_update(state, response)
+
+    async def arisk_manager_node(state) -> dict:
+        past_memories = await memory.aget_memories(format_situation(state), n_matches=2)
+        response = await llm.ainvoke(risk_manager_prompt(state, past_memories))
+        return risk_manager_update(state, response)
+
+    return RunnableLambda(risk_manager_node, afunc=arisk_manager_node)
@@ -1,22 +1,30 @@
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.report_digest import render_reports
+from tradingagents.agents.utils.memory import format_situation
 import time
 import json
 
 
-def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
+def create_bull_researcher(llm, memory, context=None):
+    context = context or DebateContext()
+
+    def bull_prompt(state, past_memories) -> str:
         investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
+        history = context.render(investment_debate_state)
         bull_history = investment_debate_state.get("bull_history", "")
 
         current_response = investment_debate_state.get("current_response", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
-
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        reports = render_reports(
+            state,
+            (
+                "Market research report",
+                "Social media sentiment report",
+                "Latest world affairs news",
+                "Company fundamentals report",
+            ),
+        )
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -32,19 +40,19 @@ Key points to focus on:
 - Engagement: Present your argument in a conversational style, engaging directly with the bear analyst's points and debating effectively rather than just listing data.
 
 Resources available:
-Market research report: {market_research_report}
-Social media sentiment report: {sentiment_report}
-Latest world affairs news: {news_report}
-Company fundamentals report: {fundamentals_report}
+{reports}
 Conversation history of the debate: {history}
 Last bear argument: {current_response}
 Reflections from similar situations and lessons learned: {past_memory_str}
 Use this information to deliver a compelling bull argument, refute the bear's concerns, and engage in a dynamic debate that demonstrates the strengths of the bull position. You must also address reflections and learn from lessons and mistakes you made in the past.
 """
 
-        response = llm.invoke(prompt)
+        return prompt
 
-        argument = f"Bull Analyst: {response.content}"
+    def bull_update(state, argument, context_fields) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bull_history = investment_debate_state.get("bull_history", "")
 
         new_investment_debate_state = {
             "history": history + "\n" + argument,
@@ -52,8 +60,23 @@ Use this information to deliver a compelling bull argument, refute the bear's co
             "bear_history": investment_debate_state.get("bear_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            **context_fields,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bull_node
+    def bull_node(state) -> dict:
+        past_memories = memory.get_memories(format_situation(state), n_matches=2)
+        response = llm.invoke(bull_prompt(state, past_memories))
+        argument = f"Bull Analyst: {response.content}"
+        context_fields = context.record(state["investment_debate_state"], argument)
+        return bull_update(state, argument, context_fields)
+
+    async def abull_node(state) -> dict:
+        past_memories = await memory.aget_memories(format_situation(state), n_matches=2)
+        response = await llm.ainvoke(bull_prompt(state, past_memories))
+        argument = f"Bull Analyst: {response.content}"
+        context_fields = await context.arecord(state["investment_debate_state"], argument)
+        return bull_update(state, argument, context_fields)
+
+    return RunnableLambda(bull_node, afunc=abull_node)
@@ -1,20 +1,30 @@
+from langchain_core.runnables import RunnableLambda
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.report_digest import render_reports
 import time
 import json
 
 
-def create_risky_debator(llm):
-    def risky_node(state) -> dict:
+def create_risky_debator(llm, context=None):
+    context = context or DebateContext()
+
+    def risky_prompt(state) -> str:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        history = context.render(risk_debate_state)
         risky_history = risk_debate_state.get("risky_history", "")
 
         current_safe_response = risk_debate_state.get("current_safe_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        reports = render_reports(
+            state,
+            (
+                "Market Research Report",
+                "Social Media Sentiment Report",
+                "Latest World Affairs Report",
+                "Company Fundamentals Report",
+            ),
+        )
 
         trader_decision = state["trader_investment_plan"]
 
@@ -24,17 +34,17 @@ def create_risky_debator(llm):
 
 Your task is to create a compelling case for the trader's decision by questioning and critiquing the conservative and neutral stances to demonstrate why your high-reward perspective offers the best path forward. Incorporate insights from the following sources into your arguments:
 
-Market Research Report: {market_research_report}
-Social Media Sentiment Report: {sentiment_report}
-Latest World Affairs Report: {news_report}
-Company Fundamentals Report: {fundamentals_report}
+{reports}
 Here is the current conversation history: {history} Here are the last arguments from the conservative analyst: {current_safe_response} Here are the last arguments from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage actively by addressing any specific concerns raised, refuting the weaknesses in their logic, and asserting the benefits of risk-taking to outpace market norms. Maintain a focus on debating and persuading, not just presenting data. Challenge each counterpoint to underscore why a high-risk approach is optimal. Output conversationally as if you are speaking without any special formatting."""
 
-        response = llm.invoke(prompt)
+        return prompt
 
-        argument = f"Risky Analyst: {response.content}"
+    def risky_update(state, argument, context_fields) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        risky_history = risk_debate_state.get("risky_history", "")
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
@@ -48,8 +58,21 @@ Engage actively by addressing any specific concerns raised, refuting the weaknes
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            **context_fields,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    def risky_node(state) -> dict:
+        response = llm.invoke(risky_prompt(state))
+        argument = f"Risky Analyst: {response.content}"
+        context_fields = context.record(state["risk_debate_state"], argument)
+        return risky_update(state, argument, context_fields)
+
+    async def arisky_node(state) -> dict:
+        response = await llm.ainvoke(risky_prompt(state))
+        argument = f"Risky Analyst: {response.content}"
+        context_fields = await context.arecord(state["risk_debate_state"], argument)
+        return risky_update(state, argument, context_fields)
+
+    return RunnableLambda(risky_node, afunc=arisky_node)
@@ -1,21 +1,31 @@
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.report_digest import render_reports
 import time
 import json
 
 
-def create_safe_debator(llm):
-    def safe_node(state) -> dict:
+def create_safe_debator(llm, context=None):
+    context = context or DebateContext()
+
+    def safe_prompt(state) -> str:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        history = context.render(risk_debate_state)
         safe_history = risk_debate_state.get("safe_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        reports = render_reports(
+            state,
+            (
+                "Market Research Report",
+                "Social Media Sentiment Report",
+                "Latest World Affairs Report",
+                "Company Fundamentals Report",
+            ),
+        )
 
         trader_decision = state["trader_investment_plan"]
 
@@ -25,17 +35,17 @@ def create_safe_debator(llm):
 
 Your task is to actively counter the arguments of the Risky and Neutral Analysts, highlighting where their views may overlook potential threats or fail to prioritize sustainability. Respond directly to their points, drawing from the following data sources to build a convincing case for a low-risk approach adjustment to the trader's decision:
 
-Market Research Report: {market_research_report}
-Social Media Sentiment Report: {sentiment_report}
-Latest World Affairs Report: {news_report}
-Company Fundamentals Report: {fundamentals_report}
+{reports}
 Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage by questioning their optimism and emphasizing the potential downsides they may have overlooked. Address each of their counterpoints to showcase why a conservative stance is ultimately the safest path for the firm's assets. Focus on debating and critiquing their arguments to demonstrate the strength of a low-risk strategy over their approaches. Output conversationally as if you are speaking without any special formatting."""
 
-        response = llm.invoke(prompt)
+        return prompt
 
-        argument = f"Safe Analyst: {response.content}"
+    def safe_update(state, argument, context_fields) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        safe_history = risk_debate_state.get("safe_history", "")
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
@@ -51,8 +61,21 @@ Engage by questioning their optimism and emphasizing the potential downsides the
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            **context_fields,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    def safe_node(state) -> dict:
+        response = llm.invoke(safe_prompt(state))
+        argument = f"Safe Analyst: {response.content}"
+        context_fields = context.record(state["risk_debate_state"], argument)
+        return safe_update(state, argument, context_fields)
+
+    async def asafe_node(state) -> dict:
+        response = await llm.ainvoke(safe_prompt(state))
+        argument = f"Safe Analyst: {response.content}"
+        context_fields = await context.arecord(state["risk_debate_state"], argument)
+        return safe_update(state, argument, context_fields)
+
+    return RunnableLambda(safe_node, afunc=asafe_node)
@@ -1,20 +1,30 @@
+from langchain_core.runnables import RunnableLambda
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.report_digest import render_reports
 import time
 import json
 
 
-def create_neutral_debator(llm):
-    def neutral_node(state) -> dict:
+def create_neutral_debator(llm, context=None):
+    context = context or DebateContext()
+
+    def neutral_prompt(state) -> str:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        history = context.render(risk_debate_state)
         neutral_history = risk_debate_state.get("neutral_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_safe_response = risk_debate_state.get("current_safe_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        reports = render_reports(
+            state,
+            (
+                "Market Research Report",
+                "Social Media Sentiment Report",
+                "Latest World Affairs Report",
+                "Company Fundamentals Report",
+            ),
+        )
 
         trader_decision = state["trader_investment_plan"]
 
@@ -24,17 +34,17 @@ def create_neutral_debator(llm):
 
 Your task is to challenge both the Risky and Safe Analysts, pointing out where each perspective may be overly optimistic or overly cautious. Use insights from the following data sources to support a moderate, sustainable strategy to adjust the trader's decision:
 
-Market Research Report: {market_research_report}
-Social Media Sentiment Report: {sentiment_report}
-Latest World Affairs Report: {news_report}
-Company Fundamentals Report: {fundamentals_report}
+{reports}
 Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the safe analyst: {current_safe_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage actively by analyzing both sides critically, addressing weaknesses in the risky and conservative arguments to advocate for a more balanced approach. Challenge each of their points to illustrate why a moderate risk strategy might offer the best of both worlds, providing growth potential while safeguarding against extreme volatility. Focus on debating rather than simply presenting data, aiming to show that a balanced view can lead to the most reliable outcomes. Output conversationally as if you are speaking without any special formatting."""
 
-        response = llm.invoke(prompt)
+        return prompt
 
-        argument = f"Neutral Analyst: {response.content}"
+    def neutral_update(state, argument, context_fields) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        neutral_history = risk_debate_state.get("neutral_history", "")
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
@@ -48,8 +58,21 @@ Engage actively by analyzing both sides critically, addressing weaknesses in the
             "current_safe_response": risk_debate_state.get("current_safe_response", ""),
             "current_neutral_response": argument,
             "count": risk_debate_state["count"] + 1,
+            **context_fields,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return neutral_node
+    def neutral_node(state) -> dict:
+        response = llm.invoke(neutral_prompt(state))
+        argument = f"Neutral Analyst: {response.content}"
+        context_fields = context.record(state["risk_debate_state"], argument)
+        return neutral_update(state, argument, context_fields)
+
+    async def aneutral_node(state) -> dict:
+        response = await llm.ainvoke(neutral_prompt(state))
+        argument = f"Neutral Analyst: {response.content}"
+        context_fields = await context.arecord(state["risk_debate_state"], argument)
+        return neutral_update(state, argument, context_fields)
+
+    return RunnableLambda(neutral_node, afunc=aneutral_node)
@@ -19,6 +19,8 @@ class InvestDebateState(TypedDict):
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    summary: Annotated[str, "Running summary of the older turns"]
+    recent_turns: Annotated[list, "Latest turns kept verbatim in prompts"]
 
 
 # Risk management team state
@@ -45,6 +47,8 @@ class RiskDebateState(TypedDict):
     ]  # Last response
     judge_decision: Annotated[str, "Judge's decision"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    summary: Annotated[str, "Running summary of the older turns"]
+    recent_turns: Annotated[list, "Latest turns kept verbatim in prompts"]
 
 
 class AgentState(MessagesState):
@@ -60,6 +64,7 @@ class AgentState(MessagesState):
         str, "Report from the News Researcher of current world affairs"
     ]
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
+    report_digest: Annotated[str, "Compact digest of the four analyst reports"]
 
     # researcher team discussion step
     investment_debate_state: Annotated[
@@ -0,0 +1,96 @@
+from .memory import estimate_tokens
+
+
+class DebateContext:
+    """
+    Bounds the debate history sent to researchers and risk debators.
+
+    The most recent turns are kept verbatim in the debate state's "recent_turns";
+    once they exceed the token budget, the older ones are folded into the running
+    "summary" with one LLM call. The summary is updated incrementally, at most
+    once per turn, so the prompt stays roughly constant in size however many
+    rounds are configured. The full "history" is still recorded for the judges
+    and the logs.
+
+    Without an LLM and a budget the context is disabled and prompts receive the
+    full history, as before.
+    """
+
+    def __init__(self, llm=None, max_tokens=None, recent_turns=2):
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self.recent_turns = max(1, recent_turns)
+
+    @property
+    def enabled(self):
+        return self.llm is not None and self.max_tokens is not None
+
+    def render(self, debate_state):
+        """Debate history to put in a prompt"""
+        if not self.enabled:
+            return debate_state.get("history", "")
+
+        recent = "\n".join(debate_state.get("recent_turns", []))
+        summary = debate_state.get("summary", "")
+        if not summary:
+            return recent
+        return (
+            f"Summary of the earlier arguments:\n{summary}\n\n"
+            f"Most recent arguments:\n{recent}"
+        )
+
+    def record(self, debate_state, argument):
+        """Summary fields of the debate state after a new argument"""
+        fields, older = self._add_turn(debate_state, argument)
+        if older:
+            fields["summary"] = self.llm.invoke(
+                self._summary_messages(fields["summary"], older)
+            ).content
+        return fields
+
+    async def arecord(self, debate_state, argument):
+        """Async version of record"""
+        fields, older = self._add_turn(debate_state, argument)
+        if older:
+            fields["summary"] = (
+                await self.llm.ainvoke(self._summary_messages(fields["summary"], older))
+            ).content
+        return fields
+
+    def _add_turn(self, debate_state, argument):
+        """Append a turn and return the new fields and the turns to fold into the summary"""
+        summary = debate_state.get("summary", "")
+        if not self.enabled:
+            return {"summary": summary, "recent_turns": []}, []
+
+        turns = list(debate_state.get("recent_turns", [])) + [argument]
+        tokens = estimate_tokens(summary) + sum(estimate_tokens(t) for t in turns)
+        if tokens <= self.max_tokens or len(turns) <= self.recent_turns:
+            return {"summary": summary, "recent_turns": turns}, []
+
+        older = turns[: -self.recent_turns]
+        return {"summary": summary, "recent_turns": turns[-self.recent_turns :]}, older
+
+    def _summary_messages(self, summary, turns):
+        # Leave half of the budget for the verbatim turns, at roughly 0.75 words per token
+        max_words = int(self.max_tokens * 0.75 / 2)
+        new_turns = "\n".join(turns)
+        return [
+            (
+                "system",
+                "You maintain a running summary of a debate between financial analysts. Merge the new arguments into the existing summary. Keep every distinct claim, the data points and figures supporting it, which analyst made it, and the rebuttals exchanged. Drop repetition and rhetoric. "
+                f"Answer with the updated summary only, in at most {max_words} words.",
+            ),
+            (
+                "human",
+                f"Existing summary:\n{summary or '(none)'}\n\nNew arguments:\n{new_turns}",
+            ),
+        ]
+
+
+def carry_context(debate_state):
+    """Summary fields to keep when a judge rewrites the debate state"""
+    return {
+        "summary": debate_state.get("summary", ""),
+        "recent_turns": debate_state.get("recent_turns", []),
+    }
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Process-wide cache of text embeddings shared by every FinancialSituationMemory.
+
+    Entries are keyed by a hash of the embedding model and the text, so the same
+    situation queried against several memories is only embedded once. Recently
+    used embeddings are kept in an in-memory LRU; when a path is given they are
+    also written to a SQLite file and survive restarts. The file holds at most
+    max_entries embeddings too, evicting the least recently used.
+
+    Embeddings are stored and returned as read-only float32 arrays, about 6 KB
+    per 1536-dimension vector instead of ~50 KB as a list of Python floats.
+    """
+
+    def __init__(self, max_entries=4096, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> float32 embedding
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    vector BLOB NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings (accessed_at)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _key(model, text):
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model, texts):
+        """Return the cached embedding of each text, or None where it is missing"""
+        keys = [self._key(model, text) for text in texts]
+        results = [None] * len(texts)
+        missing = {}  # key -> positions not found in memory
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                embedding = self._entries.get(key)
+                if embedding is not None:
+                    self._entries.move_to_end(key)
+                    results[i] = embedding
+                else:
+                    missing.setdefault(key, []).append(i)
+
+            if missing and self._conn is not None:
+                for key, embedding in self._load(list(missing)).items():
+                    self._remember(key, embedding)
+                    for i in missing.pop(key):
+                        results[i] = embedding
+
+            found = {key for key, result in zip(keys, results) if result is not None}
+            if found and self._conn is not None:
+                self._touch(found)
+
+            miss_count = sum(len(positions) for positions in missing.values())
+            self.misses += miss_count
+            self.hits += len(texts) - miss_count
+
+        return results
+
+    def put_many(self, model, texts, embeddings):
+        """Store the embeddings of texts"""
+        entries = {
+            self._key(model, text): _frozen(np.array(embedding, dtype=np.float32))
+            for text, embedding in zip(texts, embeddings)
+        }
+
+        with self._lock:
+            for key, embedding in entries.items():
+                self._remember(key, embedding)
+
+            if self._conn is not None:
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                    [
+                        (key, embedding.tobytes(), now)
+                        for key, embedding in entries.items()
+                    ],
+                )
+                # Keep only the most recently used entries
+                self._conn.execute(
+                    """
+                    DELETE FROM embeddings WHERE key IN (
+                        SELECT key FROM embeddings
+                        ORDER BY accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+                self._conn.commit()
+
+    def clear(self):
+        """Drop every cached embedding, including the on-disk copy"""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+
+    def _remember(self, key, embedding):
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, keys):
+        found = {}
+        # Stay well below SQLite's limit on bound parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, vector in rows:
+                found[key] = _frozen(np.frombuffer(vector, dtype=np.float32))
+        return found
+
+    def _touch(self, keys):
+        """Mark keys as just used in the SQLite file, so its LRU follows the in-memory one"""
+        now = time.time()
+        self._conn.executemany(
+            "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+            [(now, key) for key in keys],
+        )
+        self._conn.commit()
+
+
+def _frozen(embedding):
+    """Make a cached embedding read-only, since every caller shares it"""
+    embedding.flags.writeable = False
+    return embedding
+
+
+_embedding_caches = {}
+_embedding_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(config):
+    """Return the process-wide embedding cache described by a config dict, or None when disabled"""
+    if not config.get("embedding_cache_enabled", True):
+        return None
+
+    path = config.get("embedding_cache_path")
+    with _embedding_caches_lock:
+        cache = _embedding_caches.get(path)
+        if cache is None:
+            cache = EmbeddingCache(
+                max_entries=config.get("embedding_cache_max_entries", 4096), path=path
+            )
+            _embedding_caches[path] = cache
+        return cache
@@ -1,6 +1,36 @@
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
+
+from .embedding_cache import get_embedding_cache
+from .memory_backends import create_memory_backend
+
+
+def format_situation(state):
+    """Market situation text used to store and look up memories: the four analyst reports"""
+    return f"{state['market_report']}\n\n{state['sentiment_report']}\n\n{state['news_report']}\n\n{state['fundamentals_report']}"
+
+
+def estimate_tokens(text):
+    """Conservative token count of a text (English averages about 4 characters per token)"""
+    return len(text) // 3 + 1
+
+
+def _batch_by_token_budget(texts, max_tokens, max_inputs):
+    """Split texts into consecutive batches that respect the per-request limits"""
+    batches = []
+    batch = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_inputs):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
 
 
 class FinancialSituationMemory:
@@ -9,68 +39,139 @@ class FinancialSituationMemory:
             self.embedding = "nomic-embed-text"
         else:
             self.embedding = "text-embedding-3-small"
+        self.batch_max_tokens = config.get("embedding_batch_max_tokens", 200_000)
+        self.batch_max_inputs = config.get("embedding_batch_max_inputs", 2048)
+        self.embedding_cache = get_embedding_cache(config)
         self.client = OpenAI(base_url=config["backend_url"])
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        
-        # Try to get existing collection, create if it doesn't exist
-        try:
-            self.situation_collection = self.chroma_client.get_collection(name=name)
-        except:
-            self.situation_collection = self.chroma_client.create_collection(name=name)
+        self.async_client = AsyncOpenAI(base_url=config["backend_url"])
+
+        self.backend = create_memory_backend(name, self.embedding, config)
 
     def get_embedding(self, text):
         """Get OpenAI embedding for a text"""
-        
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
+        return self.get_embeddings([text])[0]
+
+    async def aget_embedding(self, text):
+        """Get OpenAI embedding for a text without blocking the event loop"""
+        return (await self.aget_embeddings([text]))[0]
+
+    def get_embeddings(self, texts):
+        """Get OpenAI embeddings for many texts, several texts per API request"""
+
+        texts = list(texts)
+        embeddings, missing = self._lookup_embeddings(texts)
+
+        new_embeddings = []
+        for batch in _batch_by_token_budget(
+            missing, self.batch_max_tokens, self.batch_max_inputs
+        ):
+            response = self.client.embeddings.create(model=self.embedding, input=batch)
+            new_embeddings.extend(
+                item.embedding for item in sorted(response.data, key=lambda d: d.index)
+            )
+
+        return self._fill_embeddings(texts, embeddings, missing, new_embeddings)
+
+    async def aget_embeddings(self, texts):
+        """Async version of get_embeddings"""
+
+        texts = list(texts)
+        embeddings, missing = self._lookup_embeddings(texts)
+
+        new_embeddings = []
+        for batch in _batch_by_token_budget(
+            missing, self.batch_max_tokens, self.batch_max_inputs
+        ):
+            response = await self.async_client.embeddings.create(
+                model=self.embedding, input=batch
+            )
+            new_embeddings.extend(
+                item.embedding for item in sorted(response.data, key=lambda d: d.index)
+            )
+
+        return self._fill_embeddings(texts, embeddings, missing, new_embeddings)
+
+    def _lookup_embeddings(self, texts):
+        """Cached embeddings of texts (None where missing) and the distinct texts still to embed"""
+        if self.embedding_cache is None:
+            embeddings = [None] * len(texts)
+        else:
+            embeddings = self.embedding_cache.get_many(self.embedding, texts)
+
+        missing = list(
+            dict.fromkeys(t for t, e in zip(texts, embeddings) if e is None)
         )
-        return response.data[0].embedding
+        return embeddings, missing
+
+    def _fill_embeddings(self, texts, embeddings, missing, new_embeddings):
+        """Complete a lookup with freshly requested embeddings and cache them"""
+        if not missing:
+            return embeddings
+
+        # float32 arrays, like the cached embeddings they are returned alongside
+        new_embeddings = [np.asarray(e, dtype=np.float32) for e in new_embeddings]
+        if self.embedding_cache is not None:
+            self.embedding_cache.put_many(self.embedding, missing, new_embeddings)
+
+        fresh = dict(zip(missing, new_embeddings))
+        return [e if e is not None else fresh[t] for t, e in zip(texts, embeddings)]
 
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+        situations_and_advice = list(situations_and_advice)
+        if not situations_and_advice:
+            return
 
-        offset = self.situation_collection.count()
+        situations = [situation for situation, _ in situations_and_advice]
+        self.add_embedded_situations(
+            situations_and_advice, self.get_embeddings(situations)
+        )
+
+    async def aadd_situations(self, situations_and_advice):
+        """Async version of add_situations"""
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        situations_and_advice = list(situations_and_advice)
+        if not situations_and_advice:
+            return
 
-        self.situation_collection.add(
-            documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
-            ids=ids,
+        situations = [situation for situation, _ in situations_and_advice]
+        self.add_embedded_situations(
+            situations_and_advice, await self.aget_embeddings(situations)
         )
 
+    def add_embedded_situations(self, situations_and_advice, embeddings):
+        """Bulk insert (situation, rec) tuples whose embeddings are already known"""
+
+        self.backend.add(list(situations_and_advice), list(embeddings))
+
     def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using OpenAI embeddings"""
-        query_embedding = self.get_embedding(current_situation)
+        """Find matching recommendations using OpenAI embeddings.
 
-        results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_matches,
-            include=["metadatas", "documents", "distances"],
-        )
+        Accepts a single situation or a list of situations; a list returns one
+        list of matches per situation, embedded and queried in bulk."""
+        if isinstance(current_situation, str):
+            query_embedding = self.get_embedding(current_situation)
+            return self._query_memories([query_embedding], n_matches)[0]
 
-        matched_results = []
-        for i in range(len(results["documents"][0])):
-            matched_results.append(
-                {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
-                }
-            )
+        query_embeddings = self.get_embeddings(list(current_situation))
+        return self._query_memories(query_embeddings, n_matches)
+
+    async def aget_memories(self, current_situation, n_matches=1):
+        """Async version of get_memories"""
+        if isinstance(current_situation, str):
+            query_embedding = await self.aget_embedding(current_situation)
+            return self._query_memories([query_embedding], n_matches)[0]
+
+        query_embeddings = await self.aget_embeddings(list(current_situation))
+        return self._query_memories(query_embeddings, n_matches)
 
-        return matched_results
+    def _query_memories(self, query_embeddings, n_matches):
+        """Find the stored situations closest to each embedding"""
+        if not query_embeddings:
+            return []
 
+        return self.backend.query(query_embeddings, n_matches)
 
 if __name__ == "__main__":
     # Example usage
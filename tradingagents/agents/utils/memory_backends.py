@@ -0,0 +1,277 @@
+import json
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+def collection_name(name, embedding_model, version):
+    """Versioned collection name, so memories built with another embedding model or schema are never mixed"""
+    model = re.sub(r"[^a-zA-Z0-9_-]+", "-", embedding_model).strip("-")
+    return f"{name}_{model}_v{version}"
+
+
+class MemoryBackend(ABC):
+    """
+    Storage and nearest-neighbour search for one FinancialSituationMemory.
+
+    A backend stores (situation, recommendation, embedding) records and answers
+    top-k queries for a batch of query embeddings. Each match is a dict with the
+    keys "matched_situation", "recommendation" and "similarity_score".
+    """
+
+    @abstractmethod
+    def count(self):
+        """Number of stored situations"""
+
+    @abstractmethod
+    def add(self, situations_and_advice, embeddings):
+        """Store (situation, rec) tuples with their embeddings"""
+
+    @abstractmethod
+    def query(self, query_embeddings, n_matches):
+        """Return the n_matches closest stored situations for each query embedding"""
+
+
+class ChromaMemoryBackend(MemoryBackend):
+    """Backend storing each memory in a chromadb collection, in-memory or persisted to a directory"""
+
+    def __init__(self, collection, persist_dir=None, warm_start=True, metadata=None):
+        # chromadb is only needed by this backend and is slow to import
+        import chromadb
+        from chromadb.config import Settings
+
+        if persist_dir:
+            # Lessons survive restarts and are available as soon as the collection opens
+            self.chroma_client = chromadb.PersistentClient(
+                path=persist_dir, settings=Settings(allow_reset=True)
+            )
+        else:
+            self.chroma_client = chromadb.Client(Settings(allow_reset=True))
+
+        if not warm_start:
+            try:
+                self.chroma_client.delete_collection(name=collection)
+            except Exception:
+                pass
+
+        self.situation_collection = self.chroma_client.get_or_create_collection(
+            name=collection, metadata=metadata
+        )
+
+    def count(self):
+        return self.situation_collection.count()
+
+    def add(self, situations_and_advice, embeddings):
+        offset = self.situation_collection.count()
+        max_batch_size = self.chroma_client.get_max_batch_size()
+
+        for start in range(0, len(situations_and_advice), max_batch_size):
+            batch = situations_and_advice[start : start + max_batch_size]
+            self.situation_collection.add(
+                documents=[situation for situation, _ in batch],
+                metadatas=[{"recommendation": rec} for _, rec in batch],
+                embeddings=embeddings[start : start + max_batch_size],
+                ids=[str(offset + start + i) for i in range(len(batch))],
+            )
+
+    def query(self, query_embeddings, n_matches):
+        results = self.situation_collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_matches,
+            include=["metadatas", "documents", "distances"],
+        )
+
+        all_matches = []
+        for q in range(len(query_embeddings)):
+            matched_results = []
+            for i in range(len(results["documents"][q])):
+                matched_results.append(
+                    {
+                        "matched_situation": results["documents"][q][i],
+                        "recommendation": results["metadatas"][q][i]["recommendation"],
+                        "similarity_score": 1 - results["distances"][q][i],
+                    }
+                )
+            all_matches.append(matched_results)
+
+        return all_matches
+
+
+class NumpyMemoryBackend(MemoryBackend):
+    """
+    Backend keeping L2-normalized float32 embeddings in a NumPy matrix and ranking
+    by cosine similarity.
+
+    With a directory, the matrix lives in <collection>.f32 and is memory-mapped,
+    the situations and recommendations are kept one JSON record per line in the
+    sidecar <collection>.jsonl, and <collection>.json records the dimension and
+    the number of committed rows. Rows are appended, and the row count is written
+    last, so a crash during an add never exposes a half-written record.
+    """
+
+    def __init__(self, collection, persist_dir=None, warm_start=True):
+        self._lock = threading.Lock()
+        self._records = []  # (situation, recommendation) per row
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+
+        self._records_bytes = 0  # committed length of the sidecar file
+        self._paths = None
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+            base = os.path.join(persist_dir, collection)
+            self._paths = {
+                "matrix": base + ".f32",
+                "records": base + ".jsonl",
+                "header": base + ".json",
+            }
+            if not warm_start:
+                for path in self._paths.values():
+                    if os.path.exists(path):
+                        os.remove(path)
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self._paths["header"]):
+            return
+
+        with open(self._paths["header"]) as f:
+            header = json.load(f)
+        rows, dim = header["count"], header["dim"]
+        self._records_bytes = header["records_bytes"]
+        if rows == 0:
+            return
+
+        with open(self._paths["records"], "rb") as f:
+            for line in f.read(self._records_bytes).splitlines():
+                record = json.loads(line)
+                self._records.append((record["situation"], record["recommendation"]))
+
+        self._matrix = np.memmap(
+            self._paths["matrix"], dtype=np.float32, mode="r", shape=(rows, dim)
+        )
+
+    def count(self):
+        return len(self._records)
+
+    def add(self, situations_and_advice, embeddings):
+        if not situations_and_advice:
+            return
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            if len(self._records) and vectors.shape[1] != self._matrix.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match stored dimension {self._matrix.shape[1]}"
+                )
+
+            if self._paths is None:
+                if len(self._records):
+                    self._matrix = np.concatenate([self._matrix, vectors])
+                else:
+                    self._matrix = vectors
+                self._records.extend(situations_and_advice)
+                return
+
+            rows = len(self._records)
+            self._truncate(rows, vectors.shape[1])
+            with open(self._paths["matrix"], "ab") as f:
+                f.write(vectors.tobytes())
+            lines = "".join(
+                json.dumps({"situation": situation, "recommendation": recommendation})
+                + "\n"
+                for situation, recommendation in situations_and_advice
+            ).encode("utf-8")
+            with open(self._paths["records"], "ab") as f:
+                f.write(lines)
+            self._records_bytes += len(lines)
+
+            rows += len(vectors)
+            self._write_header(rows, vectors.shape[1])
+            self._records.extend(situations_and_advice)
+            self._matrix = np.memmap(
+                self._paths["matrix"],
+                dtype=np.float32,
+                mode="r",
+                shape=(rows, vectors.shape[1]),
+            )
+
+    def _truncate(self, rows, dim):
+        """Drop bytes left behind by an add that did not commit"""
+        sizes = {
+            "matrix": rows * dim * np.dtype(np.float32).itemsize,
+            "records": self._records_bytes,
+        }
+        for key, size in sizes.items():
+            path = self._paths[key]
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def _write_header(self, rows, dim):
+        tmp_path = self._paths["header"] + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"count": rows, "dim": dim, "records_bytes": self._records_bytes}, f
+            )
+        os.replace(tmp_path, self._paths["header"])
+
+    def query(self, query_embeddings, n_matches):
+        with self._lock:
+            matrix = self._matrix
+            records = list(self._records)
+
+        if not records:
+            return [[] for _ in query_embeddings]
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+
+        scores = queries @ np.asarray(matrix).T  # (queries, rows)
+        k = min(n_matches, len(records))
+        if k < len(records):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(len(records)), scores.shape)
+
+        all_matches = []
+        for q in range(len(queries)):
+            order = top[q][np.argsort(-scores[q, top[q]], kind="stable")]
+            all_matches.append(
+                [
+                    {
+                        "matched_situation": records[i][0],
+                        "recommendation": records[i][1],
+                        "similarity_score": float(scores[q, i]),
+                    }
+                    for i in order
+                ]
+            )
+        return all_matches
+
+
+def create_memory_backend(name, embedding_model, config):
+    """Build the backend selected by config["memory_backend"] ("chromadb" or "numpy")"""
+    backend = config.get("memory_backend", "chromadb")
+    collection = collection_name(name, embedding_model, config.get("memory_version", 1))
+    persist_dir = config.get("memory_dir")
+    warm_start = config.get("memory_warm_start", True)
+
+    if backend == "chromadb":
+        return ChromaMemoryBackend(
+            collection,
+            persist_dir=persist_dir,
+            warm_start=warm_start,
+            metadata={"memory": name, "embedding_model": embedding_model},
+        )
+    if backend == "numpy":
+        return NumpyMemoryBackend(
+            collection, persist_dir=persist_dir, warm_start=warm_start
+        )
+    raise ValueError(f"Unsupported memory backend: {backend}")
@@ -0,0 +1,49 @@
+from langchain_core.runnables import RunnableLambda
+
+
+REPORT_KEYS = ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+
+
+def render_reports(state, labels):
+    """Analyst reports for a downstream prompt: the digest when one was produced, otherwise one labelled line per full report"""
+    digest = state.get("report_digest", "")
+    if digest:
+        return f"Digest of the analyst team's reports: {digest}"
+
+    return "\n".join(
+        f"{label}: {state[key]}" for label, key in zip(labels, REPORT_KEYS)
+    )
+
+
+def create_report_digest(llm, max_words=500):
+    def report_digest_messages(state) -> list:
+        reports = "\n\n".join(
+            f"### {key.replace('_', ' ').title()}\n{state[key]}"
+            for key in REPORT_KEYS
+            if state.get(key)
+        )
+
+        return [
+            (
+                "system",
+                f"""You condense the analyst team's reports on {state["company_of_interest"]} as of {state["trade_date"]} into a compact digest for the researchers, traders and risk analysts who act on them. Use exactly these sections, as terse bullet points:
+
+Key metrics: prices, returns, indicator values, valuation and financial figures, with their numbers.
+Signals: technical, sentiment and insider signals, each marked bullish, bearish or neutral.
+Catalysts: upcoming or recent events, news and macro factors that can move the stock.
+Risks: the main threats to a long or short position.
+
+Keep every figure exactly as reported, never invent data, and skip sections with nothing to report. Stay under {max_words} words.""",
+            ),
+            ("human", reports),
+        ]
+
+    def report_digest_node(state) -> dict:
+        result = llm.invoke(report_digest_messages(state))
+        return {"report_digest": result.content}
+
+    async def areport_digest_node(state) -> dict:
+        result = await llm.ainvoke(report_digest_messages(state))
+        return {"report_digest": result.content}
+
+    return RunnableLambda(report_digest_node, afunc=areport_digest_node)
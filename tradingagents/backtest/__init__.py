@@ -0,0 +1,5 @@
+# TradingAgents backtesting package
+from .broker import SimulatedBroker
+from .engine import Backtester
+
+__all__ = ["Backtester", "SimulatedBroker"]
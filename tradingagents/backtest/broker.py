@@ -0,0 +1,75 @@
+import math
+from typing import Dict, Any, Optional
+
+
+class SimulatedBroker:
+    """
+    Simulated account for backtests.
+
+    Orders are filled at a given bar's open price moved against the trader by the
+    slippage, and pay a commission proportional to the traded notional with a
+    minimum per fill. Positions are whole shares; short positions are negative.
+    """
+
+    def __init__(
+        self,
+        initial_cash: float = 100_000.0,
+        slippage_bps: float = 5.0,
+        commission_rate: float = 0.0005,
+        min_commission: float = 1.0,
+    ):
+        self.initial_cash = initial_cash
+        self.cash = initial_cash
+        self.slippage_bps = slippage_bps
+        self.commission_rate = commission_rate
+        self.min_commission = min_commission
+        self.positions = {}  # ticker -> shares
+        self.total_commission = 0.0
+
+    def fill_price(self, price: float, shares: int) -> float:
+        """Price paid (shares > 0) or received (shares < 0) after slippage."""
+        slippage = price * self.slippage_bps / 10_000
+        return price + slippage if shares > 0 else price - slippage
+
+    def commission(self, price: float, shares: int) -> float:
+        """Commission charged for trading shares at price."""
+        if shares == 0:
+            return 0.0
+        return max(self.min_commission, abs(shares) * price * self.commission_rate)
+
+    def order_target(
+        self, ticker: str, target_shares: int, open_price: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Trade ticker at open_price until its position is target_shares.
+
+        Purchases are reduced to what the cash covers after costs.
+
+        Returns:
+            Dict describing the fill ("shares", "price", "commission"), or None
+            when no trade was needed
+        """
+        shares = target_shares - self.positions.get(ticker, 0)
+        if shares > 0:
+            # Never buy more than the cash covers, slippage and commission included
+            unit_cost = self.fill_price(open_price, shares) * (1 + self.commission_rate)
+            affordable = math.floor((self.cash - self.min_commission) / unit_cost)
+            shares = max(0, min(shares, affordable))
+        if shares == 0:
+            return None
+
+        price = self.fill_price(open_price, shares)
+        commission = self.commission(price, shares)
+        self.cash -= shares * price + commission
+        self.total_commission += commission
+        self.positions[ticker] = self.positions.get(ticker, 0) + shares
+        if self.positions[ticker] == 0:
+            del self.positions[ticker]
+
+        return {"shares": shares, "price": price, "commission": commission}
+
+    def equity(self, prices: Dict[str, float]) -> float:
+        """Cash plus the positions marked at prices."""
+        return self.cash + sum(
+            shares * prices[ticker] for ticker, shares in self.positions.items()
+        )
@@ -0,0 +1,329 @@
+import argparse
+import json
+import math
+import os
+import re
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from tradingagents.dataflows.interface import _load_YFin_data_range
+from .broker import SimulatedBroker
+
+
+class Backtester:
+    """
+    Walks TradingAgentsGraph through a date range over one or more tickers.
+
+    On every trading day the graph decides for all tickers at once through
+    propagate_batch, after that day's close. Decisions are filled at each
+    ticker's next open by a SimulatedBroker: BUY targets a long position of
+    backtest_position_size of the equity, SELL closes it (or goes short when
+    backtest_allow_short is set) and HOLD keeps the current position. Once a
+    decision's return is realized, backtest_holding_days bars after its fill,
+    it is handed to reflect_and_remember_batch so later days use the lessons.
+
+    Every decision gets a ledger status: "filled", "failed" when the graph
+    raised, or "unfilled" when no open came to fill it at before the range
+    ended or before the next decision on the ticker replaced it.
+
+    The graph instance, its memories and the process-wide data caches are
+    reused for the whole run, and each ticker's price history is read once, so
+    the run time is dominated by the LLM calls.
+
+    The graph must be built with enable_real_trading and online_tools off:
+    otherwise every simulated decision would place a real order, and live
+    tools would show the agents news published after the trade date.
+    """
+
+    def __init__(
+        self,
+        graph,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        config: Optional[Dict[str, Any]] = None,
+    ):
+        """Set up a backtest.
+
+        Args:
+            graph: TradingAgentsGraph making the decisions
+            tickers: Ticker symbols to trade
+            start_date: First trading date in yyyy-mm-dd format
+            end_date: Last trading date in yyyy-mm-dd format
+            config: Configuration dictionary. If None, uses the graph's config
+
+        Raises:
+            ValueError: If the graph trades for real or uses online tools
+        """
+        for key in ("enable_real_trading", "online_tools"):
+            if graph.config.get(key, False):
+                raise ValueError(f"Cannot backtest a graph built with {key} enabled")
+
+        self.graph = graph
+        self.tickers = list(tickers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.config = config or graph.config
+
+        self.position_size = self.config.get("backtest_position_size", 0.1)
+        self.allow_short = self.config.get("backtest_allow_short", False)
+        self.holding_days = max(1, self.config.get("backtest_holding_days", 1))
+        self.reflect = self.config.get("backtest_reflect", True)
+
+        self.broker = SimulatedBroker(
+            initial_cash=self.config.get("backtest_initial_cash", 100_000.0),
+            slippage_bps=self.config.get("backtest_slippage_bps", 5.0),
+            commission_rate=self.config.get("backtest_commission_rate", 0.0005),
+            min_commission=self.config.get("backtest_min_commission", 1.0),
+        )
+
+        self.equity_curve = []  # one row per trading day
+        self.ledger = []  # one row per decision
+
+    def load_prices(self):
+        """Open and close prices of every ticker, one row per trading day in the range."""
+        opens, closes = {}, {}
+        for ticker in self.tickers:
+            data = _load_YFin_data_range(ticker, self.start_date, self.end_date)
+            opens[ticker] = data["Open"]
+            closes[ticker] = data["Close"]
+
+        opens = pd.DataFrame(opens).sort_index()
+        closes = pd.DataFrame(closes).sort_index()
+        if closes.empty:
+            raise ValueError(
+                f"No price data for {', '.join(self.tickers)} between {self.start_date} and {self.end_date}"
+            )
+        return opens, closes
+
+    def run(self) -> Dict[str, Any]:
+        """Run the backtest and write its results.
+
+        Returns:
+            Dict with the "equity_curve" and "ledger" DataFrames and the
+            "summary" statistics
+        """
+        opens, closes = self.load_prices()
+        marks = closes.ffill()
+        calendar = closes.index
+
+        pending_orders = {}  # ticker -> ledger entry waiting for the next open
+        open_entries = []  # (evaluation bar, ledger entry, final state)
+
+        for i, day in enumerate(calendar):
+            trade_date = day.strftime("%Y-%m-%d")
+
+            # Fill yesterday's decisions at today's open, sales first to free cash
+            for ticker in sorted(
+                pending_orders, key=lambda t: pending_orders[t]["decision"] != "SELL"
+            ):
+                open_price = opens.at[day, ticker]
+                if pd.isna(open_price):
+                    continue
+                entry = pending_orders.pop(ticker)
+                self._fill(entry, trade_date, float(open_price))
+                open_entries.append((i + self.holding_days - 1, entry))
+
+            # Mark the account to market at the close
+            self._mark(trade_date, marks.loc[day])
+
+            # Reflect on the decisions whose return is now known
+            due = [item for item in open_entries if item[0] <= i]
+            open_entries = [item for item in open_entries if item[0] > i]
+            self._reflect_on([entry for _, entry in due], marks.loc[day])
+
+            # Decide after the close; the last day has no next open to fill at
+            if i == len(calendar) - 1:
+                break
+            tickers = [t for t in self.tickers if not pd.isna(closes.at[day, t])]
+            for result in self.graph.propagate_batch(
+                [(ticker, trade_date) for ticker in tickers]
+            ):
+                entry = self._record_decision(result)
+                if result["error"] is None:
+                    replaced = pending_orders.get(result["ticker"])
+                    if replaced is not None:
+                        self._unfilled(replaced)
+                    pending_orders[result["ticker"]] = entry
+
+        # Decisions still open at the end are evaluated at the last close
+        self._reflect_on([entry for _, entry in open_entries], marks.iloc[-1])
+        for entry in pending_orders.values():
+            self._unfilled(entry)
+
+        equity_curve = pd.DataFrame(self.equity_curve)
+        ledger = pd.DataFrame(
+            [{k: v for k, v in e.items() if k != "final_state"} for e in self.ledger]
+        )
+        summary = self._summarize(equity_curve, ledger)
+        self._write_results(equity_curve, ledger, summary)
+
+        return {"equity_curve": equity_curve, "ledger": ledger, "summary": summary}
+
+    def _record_decision(self, result):
+        decision = None
+        if result["error"] is None:
+            match = re.search(r"\b(BUY|SELL|HOLD)\b", str(result["decision"]).upper())
+            decision = match.group(1) if match else "HOLD"
+
+        entry = {
+            "trade_date": result["trade_date"],
+            "ticker": result["ticker"],
+            "decision": decision,
+            "status": "pending" if result["error"] is None else "failed",
+            "fill_date": None,
+            "fill_price": None,
+            "shares_traded": 0,
+            "commission": 0.0,
+            "position": None,
+            "return": None,
+            "error": None if result["error"] is None else str(result["error"]),
+            "final_state": result["final_state"],
+        }
+        self.ledger.append(entry)
+        return entry
+
+    def _target_shares(self, decision, ticker, open_price, equity):
+        # Positions are sized on entry and kept while the decision is repeated
+        current = self.broker.positions.get(ticker, 0)
+        size = math.floor(equity * self.position_size / open_price)
+        if decision == "BUY":
+            return current if current > 0 else size
+        if decision == "SELL":
+            if not self.allow_short:
+                return 0
+            return current if current < 0 else -size
+        return current
+
+    def _fill(self, entry, fill_date, open_price):
+        # Size on the last close's equity, the latest known before the open
+        equity = self.equity_curve[-1]["equity"]
+        target = self._target_shares(
+            entry["decision"], entry["ticker"], open_price, equity
+        )
+        fill = self.broker.order_target(entry["ticker"], target, open_price)
+
+        entry["status"] = "filled"
+        entry["fill_date"] = fill_date
+        # Without a trade the position is evaluated from the open it was held through
+        entry["fill_price"] = fill["price"] if fill else open_price
+        entry["shares_traded"] = fill["shares"] if fill else 0
+        entry["commission"] = fill["commission"] if fill else 0.0
+        entry["position"] = self.broker.positions.get(entry["ticker"], 0)
+
+    def _unfilled(self, entry):
+        # Never executed, so there is no return to reflect on
+        entry["status"] = "unfilled"
+        entry["final_state"] = None
+
+    def _mark(self, trade_date, prices):
+        equity = self.broker.equity(prices)
+        self.equity_curve.append(
+            {
+                "date": trade_date,
+                "cash": self.broker.cash,
+                "positions_value": equity - self.broker.cash,
+                "equity": equity,
+            }
+        )
+
+    def _reflect_on(self, entries, prices):
+        """Set the realized return of filled decisions and reflect on them in one batch."""
+        states_and_returns = []
+        for entry in entries:
+            position = entry["position"]
+            if position:
+                price = entry["fill_price"]
+                direction = 1 if position > 0 else -1
+                entry["return"] = direction * (
+                    prices[entry["ticker"]] / price - 1
+                ) - entry["commission"] / (abs(position) * price)
+            else:
+                entry["return"] = 0.0
+
+            if self.reflect:
+                states_and_returns.append((entry["final_state"], entry["return"]))
+            # The state is only kept until the reflection
+            entry["final_state"] = None
+
+        if states_and_returns:
+            self.graph.reflect_and_remember_batch(states_and_returns)
+
+    def _summarize(self, equity_curve, ledger):
+        equity = equity_curve["equity"]
+        daily_returns = equity.pct_change().dropna()
+        drawdown = equity / equity.cummax() - 1
+        volatility = daily_returns.std()
+        status_counts = (
+            {k: int(v) for k, v in ledger["status"].value_counts().items()}
+            if len(ledger)
+            else {}
+        )
+
+        return {
+            "start_date": equity_curve["date"].iloc[0],
+            "end_date": equity_curve["date"].iloc[-1],
+            "tickers": self.tickers,
+            "initial_equity": self.broker.initial_cash,
+            "final_equity": float(equity.iloc[-1]),
+            "total_return": float(equity.iloc[-1] / self.broker.initial_cash - 1),
+            "max_drawdown": float(drawdown.min()),
+            "sharpe_ratio": (
+                float(daily_returns.mean() / volatility * math.sqrt(252))
+                if volatility > 0
+                else 0.0
+            ),
+            "decisions": status_counts.get("filled", 0),
+            "unfilled_decisions": status_counts.get("unfilled", 0),
+            "failed_decisions": status_counts.get("failed", 0),
+            "trades": int((ledger["shares_traded"] != 0).sum()) if len(ledger) else 0,
+            "total_commission": self.broker.total_commission,
+        }
+
+    def _write_results(self, equity_curve, ledger, summary):
+        directory = os.path.join(
+            self.config["results_dir"],
+            "backtest",
+            f"{'_'.join(self.tickers)}_{self.start_date}_{self.end_date}",
+        )
+        os.makedirs(directory, exist_ok=True)
+
+        equity_curve.to_csv(os.path.join(directory, "equity_curve.csv"), index=False)
+        ledger.to_csv(os.path.join(directory, "ledger.csv"), index=False)
+        with open(os.path.join(directory, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=4)
+
+        self.results_dir = directory
+
+
+if __name__ == "__main__":
+    from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    parser = argparse.ArgumentParser(
+        description="Backtest TradingAgents over a date range on offline price data."
+    )
+    parser.add_argument("tickers", nargs="+", help="ticker symbols to trade")
+    parser.add_argument("--start", required=True, help="first date, yyyy-mm-dd")
+    parser.add_argument(
+        "--end",
+        default=None,
+        help="last date, yyyy-mm-dd (defaults to one month after the start)",
+    )
+    args = parser.parse_args()
+
+    end_date = args.end or (
+        datetime.strptime(args.start, "%Y-%m-%d") + relativedelta(months=1)
+    ).strftime("%Y-%m-%d")
+
+    config = DEFAULT_CONFIG.copy()
+    config["online_tools"] = False
+    backtester = Backtester(
+        TradingAgentsGraph(config=config), args.tickers, args.start, end_date
+    )
+    result = backtester.run()
+    print(json.dumps(result["summary"], indent=4))
+    print(f"Results written to {backtester.results_dir}")
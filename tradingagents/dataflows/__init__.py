@@ -1,8 +1,16 @@
-from .finnhub_utils import get_data_in_range
+from .finnhub_utils import get_data_in_range, load_finnhub_data
 from .googlenews_utils import getNewsData
 from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import (
+    fetch_top_from_category,
+    fetch_top_from_category_range,
+    fetch_top_company_posts_range,
+    build_reddit_index,
+    TickerMatcher,
+)
 from .stockstats_utils import StockstatsUtils
+from .price_cache import PriceDataCache, get_price_data_cache, load_price_data
+from .simfin_utils import SimFinStatementIndex, get_latest_statement
 from .yfin_utils import YFinanceUtils
 
 from .interface import (
@@ -10,6 +18,8 @@ from .interface import (
     get_finnhub_news,
     get_finnhub_company_insider_sentiment,
     get_finnhub_company_insider_transactions,
+    get_finnhub_company_insider_sentiment_records,
+    get_finnhub_company_insider_transactions_records,
     get_google_news,
     get_reddit_global_news,
     get_reddit_company_news,
@@ -30,6 +40,8 @@ __all__ = [
     "get_finnhub_news",
     "get_finnhub_company_insider_sentiment",
     "get_finnhub_company_insider_transactions",
+    "get_finnhub_company_insider_sentiment_records",
+    "get_finnhub_company_insider_transactions_records",
     "get_google_news",
     "get_reddit_global_news",
     "get_reddit_company_news",
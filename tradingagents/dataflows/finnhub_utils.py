@@ -1,5 +1,41 @@
 import json
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from .config import get_config
+
+_finnhub_files = OrderedDict()  # path -> ((mtime, size), sorted date keys, data)
+_finnhub_lock = threading.Lock()
+
+
+def load_finnhub_data(data_path):
+    """
+    Load a formatted finnhub JSON file through a process-wide LRU cache keyed by
+    path and invalidated when the file's mtime or size changes.
+    Returns:
+        tuple: (date keys sorted ascending, dict of date -> entries). Both are shared and must not be modified.
+    """
+    stat = os.stat(data_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _finnhub_lock:
+        entry = _finnhub_files.get(data_path)
+        if entry is not None and entry[0] == stamp:
+            _finnhub_files.move_to_end(data_path)
+            return entry[1], entry[2]
+
+    with open(data_path, "r") as f:
+        data = json.load(f)
+    keys = sorted(data)
+
+    with _finnhub_lock:
+        _finnhub_files[data_path] = (stamp, keys, data)
+        _finnhub_files.move_to_end(data_path)
+        while len(_finnhub_files) > get_config()["finnhub_cache_max_files"]:
+            _finnhub_files.popitem(last=False)
+
+    return keys, data
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -11,6 +47,8 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         data_type (str): Type of data from finnhub to fetch. Can be insider_trans, SEC_filings, news_data, insider_senti, or fin_as_reported.
         data_dir (str): Directory where the data is saved.
         period (str): Default to none, if there is a period specified, should be annual or quarterly.
+    Returns:
+        dict: non-empty entries keyed by date (YYYY-MM-DD), in ascending date order.
     """
 
     if period:
@@ -25,12 +63,14 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
+    keys, data = load_finnhub_data(data_path)
+
+    # select keys (date, str in format YYYY-MM-DD) in the date range (str, str in format YYYY-MM-DD) by binary search
+    lo = bisect_left(keys, start_date)
+    hi = bisect_right(keys, end_date)
 
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
     filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
+    for key in keys[lo:hi]:
+        if len(data[key]) > 0:
+            filtered_data[key] = data[key]
     return filtered_data
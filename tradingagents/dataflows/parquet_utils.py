@@ -0,0 +1,114 @@
+import argparse
+import os
+from typing import Annotated, Optional
+import pandas as pd
+from .config import get_config
+from .price_cache import read_price_csv
+
+try:
+    import pyarrow  # noqa: F401
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Name of the stored date column that backs the DatetimeIndex
+INDEX_COLUMN = "TradeDate"
+
+# Roughly one trading year per row group so range reads can skip whole years
+ROW_GROUP_SIZE = 252
+
+
+def get_parquet_path(csv_path: Annotated[str, "path to a YFin-style price CSV"]) -> str:
+    """Return the Parquet path that mirrors a price CSV."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def has_parquet(csv_path: Annotated[str, "path to a YFin-style price CSV"]) -> bool:
+    """
+    Whether an up-to-date Parquet copy of csv_path exists and can be read.
+    A Parquet file older than its CSV is ignored so stale conversions are never used.
+    """
+    if not PARQUET_AVAILABLE:
+        return False
+
+    parquet_path = get_parquet_path(csv_path)
+    if not os.path.exists(parquet_path):
+        return False
+    if os.path.exists(csv_path):
+        return os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    return True
+
+
+def convert_price_csv(
+    csv_path: Annotated[str, "path to a YFin-style price CSV"],
+    parquet_path: Annotated[Optional[str], "output path, defaults to the CSV path with a .parquet suffix"] = None,
+) -> str:
+    """Convert one price CSV into a date-sorted Parquet file and return its path."""
+    parquet_path = parquet_path or get_parquet_path(csv_path)
+
+    data = read_price_csv(csv_path)
+    data.index.name = INDEX_COLUMN
+    data.to_parquet(
+        parquet_path, engine="pyarrow", index=True, row_group_size=ROW_GROUP_SIZE
+    )
+
+    return parquet_path
+
+
+def convert_price_data(
+    data_dir: Annotated[Optional[str], "root data directory, defaults to the configured data_dir"] = None,
+) -> list:
+    """Convert every CSV under <data_dir>/market_data/price_data to Parquet."""
+    if not PARQUET_AVAILABLE:
+        raise ImportError("pyarrow is required to write Parquet price data")
+
+    data_dir = data_dir or get_config()["data_dir"]
+    price_dir = os.path.join(data_dir, "market_data", "price_data")
+
+    converted = []
+    for file_name in sorted(os.listdir(price_dir)):
+        if not file_name.endswith(".csv"):
+            continue
+        converted.append(convert_price_csv(os.path.join(price_dir, file_name)))
+
+    return converted
+
+
+def read_price_range(
+    parquet_path: Annotated[str, "path to a converted price Parquet file"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> pd.DataFrame:
+    """
+    Read the rows between start_date and end_date (inclusive) from a price
+    Parquet file. The date predicate is pushed down to pyarrow so row groups
+    outside the range are never decoded.
+    """
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+
+    data = pd.read_parquet(
+        parquet_path,
+        engine="pyarrow",
+        filters=[(INDEX_COLUMN, ">=", start), (INDEX_COLUMN, "<", end)],
+    )
+    data.index.name = None
+
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert offline YFin price CSVs to Parquet for faster range reads."
+    )
+    parser.add_argument(
+        "data_dir",
+        nargs="?",
+        default=None,
+        help="root data directory (defaults to the configured data_dir)",
+    )
+    args = parser.parse_args()
+
+    for path in convert_price_data(args.data_dir):
+        print(f"Wrote {path}")
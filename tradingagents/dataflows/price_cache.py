@@ -0,0 +1,108 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Annotated, Optional
+import pandas as pd
+from .config import get_config
+
+
+class PriceDataCache:
+    """
+    Process-wide LRU cache of parsed price CSVs.
+
+    Entries are keyed by file path and invalidated when the file's mtime or size
+    changes. The cache is bounded by the total in-memory size of the cached
+    DataFrames rather than by the number of entries.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (stamp, frame, nbytes)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return get_config()["price_cache_max_bytes"]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path: Annotated[str, "path to a YFin-style price CSV"]) -> pd.DataFrame:
+        """
+        Return the parsed price data for path, reading the file only when it is
+        not cached or has changed on disk. The returned DataFrame is shared
+        between callers and must be treated as read-only.
+        """
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        frame = read_price_csv(path)
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+
+        with self._lock:
+            self._discard(path)
+            if nbytes <= self.max_bytes:
+                self._entries[path] = (stamp, frame, nbytes)
+                self._total_bytes += nbytes
+                self._evict()
+
+        return frame
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _discard(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def _evict(self):
+        max_bytes = self.max_bytes
+        while self._total_bytes > max_bytes and self._entries:
+            _, (_, _, nbytes) = self._entries.popitem(last=False)
+            self._total_bytes -= nbytes
+
+
+def read_price_csv(path: Annotated[str, "path to a YFin-style price CSV"]) -> pd.DataFrame:
+    """
+    Parse a price CSV into a DataFrame indexed by trading date (tz-naive,
+    midnight), sorted ascending. The original "Date" column is kept as-is.
+    """
+    data = pd.read_csv(path)
+    data.index = pd.DatetimeIndex(
+        pd.to_datetime(data["Date"].astype(str).str[:10], format="%Y-%m-%d")
+    )
+    data.index.name = None
+
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index(kind="stable")
+
+    return data
+
+
+_price_data_cache = PriceDataCache()
+
+
+def get_price_data_cache() -> PriceDataCache:
+    """Return the process-wide price data cache."""
+    return _price_data_cache
+
+
+def load_price_data(path: Annotated[str, "path to a YFin-style price CSV"]) -> pd.DataFrame:
+    """Load a date-indexed price DataFrame through the process-wide cache."""
+    return _price_data_cache.get(path)
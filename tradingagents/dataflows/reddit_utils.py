@@ -1,9 +1,12 @@
 import requests
 import time
 import json
+import argparse
+import sqlite3
 from datetime import datetime, timedelta
-from contextlib import contextmanager
-from typing import Annotated
+from contextlib import contextmanager, closing
+from functools import lru_cache
+from typing import Annotated, Optional
 import os
 import re
 
@@ -49,37 +52,274 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
-    category: Annotated[
-        str, "Category to fetch top post from. Collection of subreddits."
-    ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
-    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
-    data_path: Annotated[
-        str,
-        "Path to the data folder. Default is 'reddit_data'.",
-    ] = "reddit_data",
-):
-    base_path = data_path
+# File name of the (category, date) partitioned post index inside the reddit data folder
+REDDIT_INDEX_FILE = "reddit_index.sqlite"
 
-    all_content = []
 
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
-        raise ValueError(
-            "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+def _company_search_terms(query):
+    """Terms (company names and the ticker itself) that identify a company's posts."""
+    company = ticker_to_company.get(query, query)
+    if "OR" in company:
+        search_terms = company.split(" OR ")
+    else:
+        search_terms = [company]
+
+    search_terms.append(query)
+    return search_terms
+
+
+class TickerMatcher:
+    """
+    Precompiled, case-insensitive matcher for the company names and symbols of
+    one or more tickers. A single alternation regex is run over each text, so
+    checking a post against a whole ticker universe costs one pass per text
+    instead of one search per term per ticker.
+    """
+
+    def __init__(self, tickers):
+        self.tickers = tuple(tickers)
+
+        term_tickers = {}
+        for ticker in self.tickers:
+            for term in _company_search_terms(ticker):
+                term_tickers.setdefault(term.lower(), set()).add(ticker)
+
+        # Longest terms first so the alternation prefers e.g. "squarespace" over "square".
+        # A match of a term also implies a match of every shorter term that is its prefix.
+        terms = sorted(term_tickers, key=len, reverse=True)
+        self._match_tickers = {
+            term: frozenset(
+                ticker
+                for other in terms
+                if term.startswith(other)
+                for ticker in term_tickers[other]
+            )
+            for term in terms
+        }
+
+        alternation = "|".join(re.escape(term) for term in terms)
+        self._any_pattern = re.compile(alternation, re.IGNORECASE)
+        # zero-width lookahead so overlapping mentions are all reported
+        self._all_pattern = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+
+    def matches(self, *texts) -> bool:
+        """Whether any of the texts mentions any of the tickers."""
+        return any(self._any_pattern.search(text) for text in texts)
+
+    def match(self, *texts) -> set:
+        """The set of tickers mentioned anywhere in the texts."""
+        found = set()
+        for text in texts:
+            for term in self._all_pattern.finditer(text):
+                found |= self._match_tickers[term.group(1).lower()]
+        return found
+
+
+@lru_cache(maxsize=1024)
+def get_ticker_matcher(tickers: tuple) -> TickerMatcher:
+    """Return a cached TickerMatcher for a tuple of tickers."""
+    return TickerMatcher(tickers)
+
+
+def _subreddit_files(base_path, category):
+    """The .jsonl files of a category in directory order, plus the per-subreddit post limit divisor."""
+    entries = os.listdir(os.path.join(base_path, category))
+    return [entry for entry in entries if entry.endswith(".jsonl")], len(entries)
+
+
+def _post_date(created_utc):
+    return datetime.utcfromtimestamp(created_utc).strftime("%Y-%m-%d")
+
+
+def get_reddit_index_path(
+    data_path: Annotated[str, "Path to the reddit data folder."],
+) -> str:
+    return os.path.join(data_path, REDDIT_INDEX_FILE)
+
+
+def build_reddit_index(
+    data_path: Annotated[str, "Path to the reddit data folder."],
+    index_path: Annotated[Optional[str], "Where to write the index. Defaults to the data folder."] = None,
+) -> str:
+    """
+    Build a SQLite index of every subreddit .jsonl file under data_path.
+    Posts are partitioned by (category, date) and tagged with the tickers from
+    ticker_to_company they mention, so date-range and company queries no longer
+    have to parse the raw files.
+    Returns:
+        str: path of the written index
+    """
+    index_path = index_path or get_reddit_index_path(data_path)
+    universe_matcher = get_ticker_matcher(tuple(ticker_to_company))
+    tmp_path = index_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    with closing(sqlite3.connect(tmp_path)) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE posts (
+                id INTEGER PRIMARY KEY,
+                category TEXT NOT NULL,
+                subreddit TEXT NOT NULL,
+                line_no INTEGER NOT NULL,
+                posted_date TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                url TEXT,
+                upvotes INTEGER
+            );
+            CREATE TABLE mentions (
+                post_id INTEGER NOT NULL,
+                ticker TEXT NOT NULL
+            );
+            CREATE TABLE source_files (
+                category TEXT NOT NULL,
+                subreddit TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                PRIMARY KEY (category, subreddit)
+            );
+            """
+        )
+
+        for category in sorted(os.listdir(data_path)):
+            category_path = os.path.join(data_path, category)
+            if not os.path.isdir(category_path):
+                continue
+
+            for data_file in _subreddit_files(data_path, category)[0]:
+                file_path = os.path.join(category_path, data_file)
+                conn.execute(
+                    "INSERT INTO source_files VALUES (?, ?, ?)",
+                    (category, data_file, os.path.getmtime(file_path)),
+                )
+
+                with open(file_path, "rb") as f:
+                    for line_no, line in enumerate(f):
+                        if not line.strip():
+                            continue
+
+                        parsed_line = json.loads(line)
+                        cursor = conn.execute(
+                            "INSERT INTO posts (category, subreddit, line_no, posted_date, title, content, url, upvotes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (
+                                category,
+                                data_file,
+                                line_no,
+                                _post_date(parsed_line["created_utc"]),
+                                parsed_line["title"],
+                                parsed_line["selftext"],
+                                parsed_line["url"],
+                                parsed_line["ups"],
+                            ),
+                        )
+
+                        if "company" not in category:
+                            continue
+                        conn.executemany(
+                            "INSERT INTO mentions VALUES (?, ?)",
+                            [
+                                (cursor.lastrowid, ticker)
+                                for ticker in universe_matcher.match(
+                                    parsed_line["title"], parsed_line["selftext"]
+                                )
+                            ],
+                        )
+
+        conn.executescript(
+            """
+            CREATE INDEX idx_posts_category_date ON posts (category, posted_date);
+            CREATE INDEX idx_mentions_ticker ON mentions (ticker, post_id);
+            """
+        )
+        conn.commit()
+
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+def _index_is_fresh(index_path, base_path, category, subreddit_files):
+    """The index can serve a category only if it covers exactly its current, unmodified files."""
+    if not os.path.exists(index_path):
+        return False
+
+    with closing(sqlite3.connect(index_path)) as conn:
+        indexed = dict(
+            conn.execute(
+                "SELECT subreddit, mtime FROM source_files WHERE category = ?",
+                (category,),
+            ).fetchall()
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
+    if set(indexed) != set(subreddit_files):
+        return False
+
+    return all(
+        os.path.getmtime(os.path.join(base_path, category, data_file))
+        <= indexed[data_file]
+        for data_file in subreddit_files
     )
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
-            continue
 
-        all_content_curr_subreddit = []
+def _query_reddit_index(
+    index_path, category, start_date, end_date, limit_per_subreddit, query
+):
+    """Top posts per (date, subreddit) from the index, ranked like the raw file scan."""
+    params = [category, start_date, end_date]
+    mention_filter = ""
+    if "company" in category and query:
+        mention_filter = (
+            "AND id IN (SELECT post_id FROM mentions WHERE ticker = ?)"
+        )
+        params.append(query)
+    params.append(limit_per_subreddit)
+
+    with closing(sqlite3.connect(index_path)) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT posted_date, subreddit, title, content, url, upvotes FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY posted_date, subreddit
+                    ORDER BY upvotes DESC, line_no
+                ) AS post_rank
+                FROM posts
+                WHERE category = ? AND posted_date BETWEEN ? AND ? {mention_filter}
+            )
+            WHERE post_rank <= ?
+            ORDER BY posted_date, subreddit, post_rank
+            """,
+            params,
+        ).fetchall()
+
+    top_posts = {}
+    for posted_date, subreddit, title, content, url, upvotes in rows:
+        top_posts.setdefault((posted_date, subreddit), []).append(
+            {
+                "title": title,
+                "content": content,
+                "url": url,
+                "upvotes": upvotes,
+                "posted_date": posted_date,
+            }
+        )
+    return top_posts
+
+
+def _scan_subreddit_files(
+    base_path, category, subreddit_files, start_date, end_date, limit_per_subreddit, queries
+):
+    """
+    Top posts per (date, subreddit) for each query, reading each raw .jsonl file
+    once for the whole range and all queries. Returns {query: {(date, subreddit): posts}}.
+    """
+    matcher = None
+    if "company" in category and queries != [None]:
+        matcher = get_ticker_matcher(tuple(queries))
+
+    top_posts = {query: {} for query in queries}
+
+    for data_file in subreddit_files:
+        posts_by_query = {query: {} for query in queries}
 
         with open(os.path.join(base_path, category, data_file), "rb") as f:
             for i, line in enumerate(f):
@@ -89,33 +329,27 @@ def fetch_top_from_category(
 
                 parsed_line = json.loads(line)
 
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
+                # select only lines that are within the date range
+                post_date = _post_date(parsed_line["created_utc"])
+                if not start_date <= post_date <= end_date:
                     continue
 
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
+                # if is company_news, keep the post only for the companies (queries) mentioned in the title or the content
+                if matcher is None:
+                    matched_queries = queries
+                elif len(queries) == 1:
+                    matched_queries = (
+                        queries
+                        if matcher.matches(parsed_line["title"], parsed_line["selftext"])
+                        else []
+                    )
+                else:
+                    matched_queries = matcher.match(
+                        parsed_line["title"], parsed_line["selftext"]
+                    )
 
-                    if not found:
-                        continue
+                if not matched_queries:
+                    continue
 
                 post = {
                     "title": parsed_line["title"],
@@ -125,11 +359,162 @@ def fetch_top_from_category(
                     "posted_date": post_date,
                 }
 
-                all_content_curr_subreddit.append(post)
+                for query in matched_queries:
+                    posts_by_query[query].setdefault(post_date, []).append(post)
+
+        for query, posts_by_date in posts_by_query.items():
+            for post_date, posts in posts_by_date.items():
+                # sort posts by upvotes in descending order
+                posts.sort(key=lambda x: x["upvotes"], reverse=True)
+                top_posts[query][(post_date, data_file)] = posts[
+                    :limit_per_subreddit
+                ]
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+    return top_posts
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
 
+def _order_top_posts(top_posts, subreddit_files):
+    """Flatten {(date, subreddit): posts} by day, then subreddit directory order."""
+    subreddit_order = {data_file: i for i, data_file in enumerate(subreddit_files)}
+    all_content = []
+    for key in sorted(top_posts, key=lambda k: (k[0], subreddit_order[k[1]])):
+        all_content.extend(top_posts[key])
     return all_content
+
+
+def _prepare_category(base_path, category, max_limit):
+    subreddit_files, num_entries = _subreddit_files(base_path, category)
+
+    if max_limit < num_entries:
+        raise ValueError(
+            "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
+        )
+
+    return subreddit_files, max_limit // num_entries
+
+
+def fetch_top_from_category_range(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd (inclusive)."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """
+    Fetch the top posts of every day between start_date and end_date in one pass.
+    Results are ordered by day, then subreddit, then upvotes, i.e. the same as
+    calling fetch_top_from_category for each day in turn. The prebuilt index
+    from build_reddit_index is used when it is up to date with the raw files.
+    """
+    base_path = data_path
+
+    subreddit_files, limit_per_subreddit = _prepare_category(
+        base_path, category, max_limit
+    )
+
+    index_path = get_reddit_index_path(base_path)
+    if (not query or query in ticker_to_company) and _index_is_fresh(
+        index_path, base_path, category, subreddit_files
+    ):
+        top_posts = _query_reddit_index(
+            index_path, category, start_date, end_date, limit_per_subreddit, query
+        )
+    else:
+        top_posts = _scan_subreddit_files(
+            base_path,
+            category,
+            subreddit_files,
+            start_date,
+            end_date,
+            limit_per_subreddit,
+            [query],
+        )[query]
+
+    return _order_top_posts(top_posts, subreddit_files)
+
+
+def fetch_top_company_posts_range(
+    tickers: Annotated[list, "Tickers whose company posts to fetch."],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd (inclusive)."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day and ticker."],
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ] = "company_news",
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """
+    Fetch top company posts for many tickers at once. Without a fresh index the
+    raw files are read once and every post is matched against all tickers in a
+    single pass, instead of once per ticker.
+    Returns:
+        dict: ticker -> posts, each list identical to fetch_top_from_category_range(category, ..., ticker)
+    """
+    base_path = data_path
+    tickers = list(dict.fromkeys(tickers))
+
+    subreddit_files, limit_per_subreddit = _prepare_category(
+        base_path, category, max_limit
+    )
+
+    index_path = get_reddit_index_path(base_path)
+    if all(ticker in ticker_to_company for ticker in tickers) and _index_is_fresh(
+        index_path, base_path, category, subreddit_files
+    ):
+        top_posts = {
+            ticker: _query_reddit_index(
+                index_path, category, start_date, end_date, limit_per_subreddit, ticker
+            )
+            for ticker in tickers
+        }
+    else:
+        top_posts = _scan_subreddit_files(
+            base_path,
+            category,
+            subreddit_files,
+            start_date,
+            end_date,
+            limit_per_subreddit,
+            tickers,
+        )
+
+    return {
+        ticker: _order_top_posts(top_posts[ticker], subreddit_files)
+        for ticker in tickers
+    }
+
+
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query, data_path=data_path
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the (category, date) partitioned Reddit post index."
+    )
+    parser.add_argument("data_path", help="path to the reddit data folder")
+    args = parser.parse_args()
+
+    print(f"Wrote {build_reddit_index(args.data_path)}")
@@ -0,0 +1,88 @@
+import os
+import threading
+from typing import Annotated, Optional
+import numpy as np
+import pandas as pd
+
+
+class SimFinStatementIndex:
+    """
+    A SimFin statement file parsed once and grouped by ticker, with each
+    ticker's rows sorted by Publish Date so the latest statement published on
+    or before a date is found by binary search.
+    """
+
+    def __init__(self, data_path: Annotated[str, "path to a SimFin bulk statement CSV"]):
+        df = pd.read_csv(data_path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+        # Rows without a publish date can never be selected
+        df = df[df["Publish Date"].notna()]
+
+        # A stable sort keeps the file order among equal publish dates
+        self.df = df.sort_values(["Ticker", "Publish Date"], kind="mergesort")
+        self._publish_dates = self.df["Publish Date"].values
+
+        tickers = self.df["Ticker"].values
+        starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]])
+        ends = np.r_[starts[1:], len(tickers)]
+        self._ticker_rows = {
+            tickers[start]: (start, end) for start, end in zip(starts, ends)
+        }
+
+    def latest(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """The most recent statement of ticker published on or before curr_date, or None."""
+        if ticker not in self._ticker_rows:
+            return None
+
+        start, end = self._ticker_rows[ticker]
+        dates = self._publish_dates[start:end]
+        curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize().to_datetime64()
+
+        pos = np.searchsorted(dates, curr_date_dt, side="right") - 1
+        if pos < 0:
+            return None
+
+        # the first row with the latest publish date, as idxmax would pick
+        pos = np.searchsorted(dates, dates[pos], side="left")
+        return self.df.iloc[start + pos]
+
+
+_statement_indexes = {}  # path -> ((mtime, size), SimFinStatementIndex)
+_statement_lock = threading.Lock()
+
+
+def load_statement_index(
+    data_path: Annotated[str, "path to a SimFin bulk statement CSV"],
+) -> SimFinStatementIndex:
+    """Return the parsed index for a statement file, re-parsing only when the file changes."""
+    stat = os.stat(data_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _statement_lock:
+        entry = _statement_indexes.get(data_path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+    index = SimFinStatementIndex(data_path)
+
+    with _statement_lock:
+        _statement_indexes[data_path] = (stamp, index)
+
+    return index
+
+
+def get_latest_statement(
+    data_path: Annotated[str, "path to a SimFin bulk statement CSV"],
+    ticker: Annotated[str, "ticker symbol"],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+) -> Optional[pd.Series]:
+    """The latest statement row for ticker published on or before curr_date, or None."""
+    return load_statement_index(data_path).latest(ticker, curr_date)
@@ -4,18 +4,13 @@ from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config
+from .price_cache import load_price_data
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def _load_stock_data(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -25,24 +20,26 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
-
+        """
+        Load the price history for a symbol and wrap it with stockstats.
+        The returned frame has its "Date" column formatted as YYYY-mm-dd.
+        """
         if not online:
             try:
-                data = pd.read_csv(
+                data = load_price_data(
                     os.path.join(
                         data_dir,
                         f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                     )
                 )
-                df = wrap(data)
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+            # stockstats adds columns in place, so work on a private copy
+            df = wrap(data.reset_index(drop=True).copy())
+            df["Date"] = df["Date"].astype(str).str[:10]
         else:
             # Get today's date as YYYY-mm-dd to add to cache
             today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
 
             end_date = today_date
             start_date = today_date - pd.DateOffset(years=15)
@@ -59,7 +56,7 @@ class StockstatsUtils:
             )
 
             if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
+                data = load_price_data(data_file).reset_index(drop=True).copy()
                 data["Date"] = pd.to_datetime(data["Date"])
             else:
                 data = yf.download(
@@ -75,13 +72,67 @@ class StockstatsUtils:
 
             df = wrap(data)
             df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+
+        return df
+
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        df = StockstatsUtils._load_stock_data(symbol, data_dir, online)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
         df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        matching_rows = df[df["Date"] == curr_date]
 
         if not matching_rows.empty:
             indicator_value = matching_rows[indicator].values[0]
             return indicator_value
         else:
             return "N/A: Not a trading day (weekend or holiday)"
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        start_date: Annotated[str, "start of the window, YYYY-mm-dd (inclusive)"],
+        end_date: Annotated[str, "end of the window, YYYY-mm-dd (inclusive)"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """
+        Compute an indicator once over the full price history and return its
+        values for every trading day between start_date and end_date.
+        Returns:
+            pd.Series: indicator values indexed by trading date (YYYY-mm-dd), ascending
+        """
+        df = StockstatsUtils._load_stock_data(symbol, data_dir, online)
+        start_date = pd.to_datetime(start_date).strftime("%Y-%m-%d")
+        end_date = pd.to_datetime(end_date).strftime("%Y-%m-%d")
+
+        values = pd.Series(df[indicator].values, index=df["Date"].values)
+        in_window = (values.index >= start_date) & (values.index <= end_date)
+
+        return values[in_window].sort_index()
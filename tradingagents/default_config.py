@@ -13,12 +13,61 @@ DEFAULT_CONFIG = {
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "https://api.openai.com/v1",
+    # LLM response cache settings
+    "llm_cache_enabled": False,  # Replay identical LLM calls from disk
+    "llm_cache_path": None,  # Defaults to <data_cache_dir>/llm_cache.sqlite
+    "llm_cache_ttl": 30 * 24 * 3600,  # Seconds before a cached response expires
+    "llm_cache_max_entries": 100_000,  # Least recently used responses are evicted beyond this
+    # Memory settings
+    "memory_backend": "chromadb",  # "chromadb" or "numpy" (memory-mapped matrix, no chromadb needed)
+    "memory_dir": os.getenv("TRADINGAGENTS_MEMORY_DIR"),  # Persist memories here; in-memory when unset
+    "memory_version": 1,  # Bump to start new memory collections alongside the old ones
+    "memory_warm_start": True,  # Reuse lessons already stored in memory_dir
+    "embedding_batch_max_tokens": 200_000,  # Token budget of one embeddings request
+    "embedding_batch_max_inputs": 2048,  # Texts per embeddings request
+    "embedding_cache_enabled": True,  # Embed each distinct text once, shared by all memories
+    "embedding_cache_max_entries": 4096,  # Embeddings kept in memory and in embedding_cache_path
+    "embedding_cache_path": None,  # Optional SQLite file that persists embeddings
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    "debate_context_compaction": False,  # Summarize older debate turns instead of resending them
+    "debate_context_max_tokens": 4000,  # Budget for the summary plus the verbatim recent turns
+    "debate_context_recent_turns": 2,  # Turns always kept verbatim
+    "signal_confidence_threshold": 0.8,  # Below this the LLM extracts the final decision
+    # Graph execution settings
+    "parallel_analysts": False,  # Run the selected analysts concurrently
+    "max_batch_concurrency": 4,  # Concurrent jobs in propagate_batch
+    "reflection_max_concurrency": 8,  # Concurrent reflection LLM calls
+    "report_digest": False,  # Condense analyst reports once for all downstream agents
+    "checkpoint_enabled": False,  # Save every graph step so failed runs can resume
+    "checkpoint_path": None,  # Defaults to <data_cache_dir>/checkpoints.sqlite
+    "checkpoint_keep_completed": False,  # Keep checkpoints of runs that finished
+    "state_log_dir": "eval_results",  # Final states are appended to <dir>/<ticker>/TradingAgentsStrategy_logs/
+    "state_log_compression": None,  # None for plain JSONL or "zstd" (needs zstandard)
+    # Instrumentation settings
+    "instrumentation_enabled": True,  # Record per-node and per-tool time, tokens and cost
+    "metrics_export": None,  # None, "prometheus" (text format) or "otel" (OTLP/JSON lines)
+    "metrics_dir": None,  # Defaults to <results_dir>/metrics
+    "llm_prices": {},  # Model -> (USD per 1M input tokens, USD per 1M output tokens)
     # Tool settings
     "online_tools": True,
+    "tool_max_workers": 8,  # Tool calls executed concurrently across all analysts
+    "tool_timeout": 120,  # Seconds before a single tool call is reported as failed
+    "tool_timeouts": {},  # Tool name -> seconds, overriding tool_timeout (None waits forever)
+    # Data cache settings
+    "price_cache_max_bytes": 512 * 1024 * 1024,  # In-memory budget for parsed price data
+    "finnhub_cache_max_files": 512,  # Parsed finnhub JSON files kept in memory
+    # Backtest settings
+    "backtest_initial_cash": 100_000.0,
+    "backtest_position_size": 0.1,  # Fraction of equity per new position
+    "backtest_allow_short": False,  # SELL opens a short instead of only closing a long
+    "backtest_slippage_bps": 5.0,  # Fills move this far from the next open against the trader
+    "backtest_commission_rate": 0.0005,  # Commission as a fraction of the traded notional
+    "backtest_min_commission": 1.0,  # Minimum commission per fill in $
+    "backtest_holding_days": 1,  # Bars after the fill at which a decision's return is realized
+    "backtest_reflect": True,  # Reflect on each decision once its return is realized
     # Trading settings
     "enable_real_trading": False,  # Set to True for real trading
     "broker": "etrade",
@@ -6,6 +6,11 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .tool_executor import ToolExecutor, create_tool_node
+from .llm_cache import SQLiteLLMCache, create_llm_cache
+from .checkpointing import ThreadedSqliteSaver, create_checkpointer
+from .state_log import StateLog, create_state_log
+from .instrumentation import RunMetrics, MetricsExporter, create_metrics_exporter
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +19,15 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "ToolExecutor",
+    "create_tool_node",
+    "SQLiteLLMCache",
+    "create_llm_cache",
+    "ThreadedSqliteSaver",
+    "create_checkpointer",
+    "StateLog",
+    "create_state_log",
+    "RunMetrics",
+    "MetricsExporter",
+    "create_metrics_exporter",
 ]
@@ -0,0 +1,63 @@
+# TradingAgents/graph/checkpointing.py
+
+import asyncio
+import os
+import sqlite3
+from typing import Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """Local SQLite checkpointer usable from both the sync and the async graph API.
+
+    SqliteSaver only implements the synchronous interface; here the async
+    methods run the same queries in worker threads, which SqliteSaver's lock
+    already makes safe. One checkpointer and one file therefore serve propagate,
+    propagate_batch and apropagate alike.
+    """
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(
+            self.put_writes, config, writes, task_id, task_path
+        )
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aget_delta_channel_history(self, *, config, channels):
+        return await asyncio.to_thread(
+            self.get_delta_channel_history, config=config, channels=channels
+        )
+
+
+def create_checkpointer(config) -> Optional[ThreadedSqliteSaver]:
+    """Build the checkpointer described by a config dict, or None when it is disabled."""
+    if not config.get("checkpoint_enabled", False):
+        return None
+
+    path = config.get("checkpoint_path") or os.path.join(
+        config["data_cache_dir"], "checkpoints.sqlite"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    checkpointer = ThreadedSqliteSaver(conn)
+    checkpointer.setup()
+    return checkpointer
@@ -0,0 +1,466 @@
+# TradingAgents/graph/instrumentation.py
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+# USD per million input and output tokens; extend or override with the
+# "llm_prices" config value
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "o1": (15.00, 60.00),
+    "o1-preview": (15.00, 60.00),
+    "o3": (2.00, 8.00),
+    "o3-mini": (1.10, 4.40),
+    "o4-mini": (1.10, 4.40),
+    "claude-3-5-haiku-latest": (0.80, 4.00),
+    "claude-3-5-sonnet-latest": (3.00, 15.00),
+    "claude-3-7-sonnet-latest": (3.00, 15.00),
+    "claude-sonnet-4-0": (3.00, 15.00),
+    "claude-opus-4-0": (15.00, 75.00),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+
+def _new_node_stats():
+    return {
+        "runs": 0,
+        "wall_time": 0.0,
+        "errors": 0,
+        "llm_calls": 0,
+        "llm_time": 0.0,
+        "llm_errors": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cost": 0.0,
+    }
+
+
+def _new_tool_stats():
+    return {"calls": 0, "wall_time": 0.0, "errors": 0}
+
+
+class RunMetrics(BaseCallbackHandler):
+    """Callback handler recording where the time, tokens and money of one run go.
+
+    Passed in the callbacks of a graph invocation, it records per graph node
+    (e.g. "Market Analyst", "tools_market", "Risk Judge") the wall time, LLM
+    calls, input and output tokens, LLM errors and estimated cost, and
+    per tool the calls, wall time and errors. Nodes of the analyst subgraphs
+    used by parallel_analysts are recorded under their own names; the wrapper
+    node around each subgraph is not counted again.
+
+    The cost uses MODEL_PRICES, updated with the prices given to the
+    constructor; models without a price count tokens but no cost. Retries are
+    not recorded: the providers' clients retry inside their HTTP layer, where
+    callbacks cannot see them, so a failed attempt only shows up in llm_time.
+    """
+
+    run_inline = True
+
+    def __init__(self, labels: Optional[Dict[str, Any]] = None, prices=None):
+        """Start recording a run.
+
+        Args:
+            labels: Values identifying the run in the summary, e.g. the ticker,
+                trade date and run id
+            prices: Model name -> (USD per million input tokens, USD per
+                million output tokens), added to MODEL_PRICES
+        """
+        self.labels = dict(labels or {})
+        self.prices = {**MODEL_PRICES, **(prices or {})}
+        self.started_at = time.time()
+        self.finished_at = None
+        self.error = None
+
+        self.nodes = {}  # node name -> stats
+        self.tools = {}  # tool name -> stats
+        self._lock = threading.Lock()
+        self._parents = {}  # chain run id -> parent run id
+        self._node_runs = {}  # node run id -> (node, start)
+        self._wrappers = set()  # node runs whose node is recorded again inside them
+        self._llm_runs = {}  # llm run id -> (node, model, start)
+        self._tool_runs = {}  # tool run id -> (tool, start)
+
+    def _node(self, name):
+        stats = self.nodes.get(name)
+        if stats is None:
+            stats = self.nodes[name] = _new_node_stats()
+        return stats
+
+    def _tool(self, name):
+        stats = self.tools.get(name)
+        if stats is None:
+            stats = self.tools[name] = _new_tool_stats()
+        return stats
+
+    # Graph nodes
+
+    def on_chain_start(
+        self,
+        serialized,
+        inputs,
+        *,
+        run_id,
+        parent_run_id=None,
+        tags=None,
+        metadata=None,
+        **kwargs,
+    ):
+        node = (metadata or {}).get("langgraph_node")
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+            if not node or kwargs.get("name") != node:
+                return
+
+            self._node_runs[run_id] = (node, time.perf_counter())
+            # An isolated analyst runs its own node of the same name inside a subgraph
+            parent = parent_run_id
+            while parent is not None:
+                outer = self._node_runs.get(parent)
+                if outer is not None and outer[0] == node:
+                    self._wrappers.add(parent)
+                    break
+                parent = self._parents.get(parent)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end_chain(run_id, error=False)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end_chain(run_id, error=True)
+
+    def _end_chain(self, run_id, error):
+        with self._lock:
+            self._parents.pop(run_id, None)
+            run = self._node_runs.pop(run_id, None)
+            if run is None or run_id in self._wrappers:
+                self._wrappers.discard(run_id)
+                return
+
+            node, start = run
+            stats = self._node(node)
+            stats["runs"] += 1
+            stats["wall_time"] += time.perf_counter() - start
+            stats["errors"] += int(error)
+
+    @contextmanager
+    def measure(self, node: str):
+        """Record a step that runs outside the graph as a node."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            with self._lock:
+                stats = self._node(node)
+                stats["runs"] += 1
+                stats["wall_time"] += time.perf_counter() - start
+                stats["errors"] += int(error)
+
+    # LLM calls
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, tags=None, metadata=None, **kwargs
+    ):
+        self._start_llm(run_id, metadata, kwargs)
+
+    def on_llm_start(
+        self, serialized, prompts, *, run_id, tags=None, metadata=None, **kwargs
+    ):
+        self._start_llm(run_id, metadata, kwargs)
+
+    def _start_llm(self, run_id, metadata, kwargs):
+        # Calls outside the graph are attributed to their run name
+        node = (metadata or {}).get("langgraph_node") or kwargs.get("name") or "other"
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name")
+        with self._lock:
+            self._llm_runs[run_id] = (node, model, time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+        if run is None:
+            return
+        node, model, start = run
+
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+        if not input_tokens and not output_tokens:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            input_tokens = token_usage.get("prompt_tokens", 0)
+            output_tokens = token_usage.get("completion_tokens", 0)
+        model = model or (response.llm_output or {}).get("model_name")
+
+        with self._lock:
+            stats = self._node(node)
+            stats["llm_calls"] += 1
+            stats["llm_time"] += time.perf_counter() - start
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+            stats["cost"] += self._cost(model, input_tokens, output_tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+            if run is not None:
+                stats = self._node(run[0])
+                stats["llm_errors"] += 1
+                stats["llm_time"] += time.perf_counter() - run[2]
+
+    def _cost(self, model, input_tokens, output_tokens):
+        price = self.prices.get(model)
+        if price is None and model:
+            # Dated snapshots such as gpt-4o-mini-2024-07-18 use the base price
+            matches = [name for name in self.prices if model.startswith(name)]
+            if matches:
+                price = self.prices[max(matches, key=len)]
+        if price is None:
+            return 0.0
+        return (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+    # Tools
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        tool = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        with self._lock:
+            self._tool_runs[run_id] = (tool, time.perf_counter())
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end_tool(run_id, error=False)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end_tool(run_id, error=True)
+
+    def _end_tool(self, run_id, error):
+        with self._lock:
+            run = self._tool_runs.pop(run_id, None)
+            if run is None:
+                return
+            tool, start = run
+            stats = self._tool(tool)
+            stats["calls"] += 1
+            stats["wall_time"] += time.perf_counter() - start
+            stats["errors"] += int(error)
+
+    # Results
+
+    def finish(self, error: Optional[BaseException] = None):
+        """Mark the run as finished, with the exception that ended it if it failed."""
+        self.finished_at = time.time()
+        self.error = None if error is None else repr(error)
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-run totals plus the per-node and per-tool breakdown, slowest first."""
+        with self._lock:
+            nodes = {name: dict(stats) for name, stats in self.nodes.items()}
+            tools = {name: dict(stats) for name, stats in self.tools.items()}
+
+        finished_at = self.finished_at or time.time()
+        return {
+            **self.labels,
+            "started_at": self.started_at,
+            "wall_time": finished_at - self.started_at,
+            "error": self.error,
+            "llm_calls": sum(s["llm_calls"] for s in nodes.values()),
+            "input_tokens": sum(s["input_tokens"] for s in nodes.values()),
+            "output_tokens": sum(s["output_tokens"] for s in nodes.values()),
+            "cost": sum(s["cost"] for s in nodes.values()),
+            "nodes": dict(
+                sorted(nodes.items(), key=lambda item: -item[1]["wall_time"])
+            ),
+            "tools": dict(
+                sorted(tools.items(), key=lambda item: -item[1]["wall_time"])
+            ),
+        }
+
+
+class MetricsExporter:
+    """Writes run summaries to a local file for monitoring systems.
+
+    "prometheus" keeps counters accumulated over every exported run and
+    rewrites <directory>/tradingagents.prom in the Prometheus text format, as
+    read by node_exporter's textfile collector. "otel" appends each run as one
+    OTLP/JSON metrics export request per line to
+    <directory>/tradingagents_metrics.jsonl, the format read by the
+    OpenTelemetry Collector's otlpjsonfile receiver.
+    """
+
+    def __init__(self, directory: str, export_format: str = "prometheus"):
+        if export_format not in ("prometheus", "otel"):
+            raise ValueError(f"Unsupported metrics export format: {export_format}")
+        self.directory = directory
+        self.export_format = export_format
+        self._totals = {"runs": 0, "failed_runs": 0, "wall_time": 0.0, "nodes": {}, "tools": {}}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        if self.export_format == "prometheus":
+            return os.path.join(self.directory, "tradingagents.prom")
+        return os.path.join(self.directory, "tradingagents_metrics.jsonl")
+
+    def export(self, summary: Dict[str, Any]):
+        """Export the summary of one finished run."""
+        with self._lock:
+            if self.export_format == "prometheus":
+                self._accumulate(summary)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(self._prometheus_text())
+                os.replace(tmp_path, self.path)
+            else:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(self._otlp_request(summary)) + "\n")
+
+    def _accumulate(self, summary):
+        totals = self._totals
+        totals["runs"] += 1
+        totals["failed_runs"] += int(summary["error"] is not None)
+        totals["wall_time"] += summary["wall_time"]
+        for kind, new_stats in (("nodes", _new_node_stats), ("tools", _new_tool_stats)):
+            for name, stats in summary[kind].items():
+                total = totals[kind].setdefault(name, new_stats())
+                for key, value in stats.items():
+                    total[key] += value
+
+    def _prometheus_text(self):
+        totals = self._totals
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in samples:
+                label_text = ",".join(
+                    f'{key}="{_escape_label(val)}"' for key, val in labels.items()
+                )
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric("tradingagents_runs_total", "Graph runs", [({}, totals["runs"])])
+        metric("tradingagents_failed_runs_total", "Graph runs that raised", [({}, totals["failed_runs"])])
+        metric("tradingagents_run_seconds_total", "Wall time of graph runs", [({}, totals["wall_time"])])
+
+        nodes = totals["nodes"].items()
+        metric("tradingagents_node_runs_total", "Node executions", [({"node": n}, s["runs"]) for n, s in nodes])
+        metric("tradingagents_node_seconds_total", "Wall time spent in each node", [({"node": n}, s["wall_time"]) for n, s in nodes])
+        metric("tradingagents_node_errors_total", "Node executions that raised", [({"node": n}, s["errors"]) for n, s in nodes])
+        metric("tradingagents_llm_calls_total", "LLM calls per node", [({"node": n}, s["llm_calls"]) for n, s in nodes])
+        metric("tradingagents_llm_seconds_total", "Time spent waiting for LLM calls per node", [({"node": n}, s["llm_time"]) for n, s in nodes])
+        metric("tradingagents_llm_errors_total", "Failed LLM calls per node", [({"node": n}, s["llm_errors"]) for n, s in nodes])
+        metric(
+            "tradingagents_llm_tokens_total",
+            "LLM tokens per node",
+            [({"node": n, "direction": "input"}, s["input_tokens"]) for n, s in nodes]
+            + [({"node": n, "direction": "output"}, s["output_tokens"]) for n, s in nodes],
+        )
+        metric("tradingagents_llm_cost_usd_total", "Estimated LLM cost per node in USD", [({"node": n}, s["cost"]) for n, s in nodes])
+
+        tools = totals["tools"].items()
+        metric("tradingagents_tool_calls_total", "Tool calls", [({"tool": t}, s["calls"]) for t, s in tools])
+        metric("tradingagents_tool_seconds_total", "Wall time spent in each tool", [({"tool": t}, s["wall_time"]) for t, s in tools])
+        metric("tradingagents_tool_errors_total", "Tool calls that raised", [({"tool": t}, s["errors"]) for t, s in tools])
+
+        return "\n".join(lines) + "\n"
+
+    def _otlp_request(self, summary):
+        start = int(summary["started_at"] * 1e9)
+        end = int((summary["started_at"] + summary["wall_time"]) * 1e9)
+        run_attributes = [
+            {"key": key, "value": {"stringValue": str(summary[key])}}
+            for key in ("ticker", "trade_date", "run_id")
+            if summary.get(key) is not None
+        ]
+
+        def data_points(items, label, key, as_int):
+            points = []
+            for name, stats in items:
+                point = {
+                    "attributes": run_attributes + [{"key": label, "value": {"stringValue": name}}],
+                    "startTimeUnixNano": str(start),
+                    "timeUnixNano": str(end),
+                }
+                # OTLP/JSON encodes 64-bit integers as strings
+                if as_int:
+                    point["asInt"] = str(int(stats[key]))
+                else:
+                    point["asDouble"] = float(stats[key])
+                points.append(point)
+            return points
+
+        def counter(name, unit, points):
+            return {
+                "name": name,
+                "unit": unit,
+                # Each line holds the delta of one run
+                "sum": {"dataPoints": points, "aggregationTemporality": 1, "isMonotonic": True},
+            }
+
+        nodes = list(summary["nodes"].items())
+        tools = list(summary["tools"].items())
+        metrics = [
+            counter("tradingagents.node.duration", "s", data_points(nodes, "node", "wall_time", False)),
+            counter("tradingagents.node.errors", "1", data_points(nodes, "node", "errors", True)),
+            counter("tradingagents.llm.calls", "1", data_points(nodes, "node", "llm_calls", True)),
+            counter("tradingagents.llm.duration", "s", data_points(nodes, "node", "llm_time", False)),
+            counter("tradingagents.llm.errors", "1", data_points(nodes, "node", "llm_errors", True)),
+            counter("tradingagents.llm.input_tokens", "{token}", data_points(nodes, "node", "input_tokens", True)),
+            counter("tradingagents.llm.output_tokens", "{token}", data_points(nodes, "node", "output_tokens", True)),
+            counter("tradingagents.llm.cost", "USD", data_points(nodes, "node", "cost", False)),
+            counter("tradingagents.tool.calls", "1", data_points(tools, "tool", "calls", True)),
+            counter("tradingagents.tool.duration", "s", data_points(tools, "tool", "wall_time", False)),
+            counter("tradingagents.tool.errors", "1", data_points(tools, "tool", "errors", True)),
+        ]
+
+        return {
+            "resourceMetrics": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": "tradingagents"}}
+                        ]
+                    },
+                    "scopeMetrics": [
+                        {"scope": {"name": "tradingagents.graph"}, "metrics": metrics}
+                    ],
+                }
+            ]
+        }
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def create_metrics_exporter(config) -> Optional[MetricsExporter]:
+    """Build the exporter described by a config dict, or None when exporting is off."""
+    export_format = config.get("metrics_export")
+    if not export_format:
+        return None
+
+    directory = config.get("metrics_dir") or os.path.join(
+        config["results_dir"], "metrics"
+    )
+    return MetricsExporter(directory, export_format)
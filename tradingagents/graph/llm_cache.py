@@ -0,0 +1,194 @@
+# TradingAgents/graph/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+
+class SQLiteLLMCache(BaseCache):
+    """Persistent LLM response cache stored in a single SQLite file.
+
+    Entries are keyed by the hash of LangChain's llm_string, which covers the
+    provider, model, sampling parameters, stop sequences and bound tools, and of
+    the serialized message list. Entries older than ttl seconds are treated as
+    misses, and the least recently used entries are evicted once the cache holds
+    more than max_entries responses.
+
+    The cache is shared by every thread of a process and can be shared between
+    processes through the same file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            path: Path of the SQLite file
+            ttl: Seconds a response stays valid, or None to never expire
+            max_entries: Maximum number of cached responses, or None for no limit
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(llm_string.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations for a prompt, or None on a miss."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return _loads_generations(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations returned for a prompt."""
+        key = self._key(prompt, llm_string)
+        response = _dumps_generations(return_val)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            if self.max_entries is not None:
+                # Keep only the most recently used entries
+                self._conn.execute(
+                    """
+                    DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache
+                        ORDER BY accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def expire(self) -> int:
+        """Delete the entries older than the TTL and return how many were removed."""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _dumps_generations(generations: RETURN_VAL_TYPE) -> str:
+    records = []
+    for generation in generations:
+        record = {"text": generation.text, "generation_info": generation.generation_info}
+        if isinstance(generation, ChatGeneration):
+            record["message"] = message_to_dict(generation.message)
+        records.append(record)
+    return json.dumps(records)
+
+
+def _loads_generations(response: str) -> RETURN_VAL_TYPE:
+    generations = []
+    for record in json.loads(response):
+        if "message" in record:
+            message = messages_from_dict([record["message"]])[0]
+            generations.append(
+                ChatGeneration(
+                    message=message, generation_info=record["generation_info"]
+                )
+            )
+        else:
+            generations.append(
+                Generation(
+                    text=record["text"], generation_info=record["generation_info"]
+                )
+            )
+    return generations
+
+
+def create_llm_cache(config) -> Optional[SQLiteLLMCache]:
+    """Build the LLM cache described by a config dict, or None when it is disabled."""
+    if not config.get("llm_cache_enabled", False):
+        return None
+
+    path = config.get("llm_cache_path") or os.path.join(
+        config["data_cache_dir"], "llm_cache.sqlite"
+    )
+    return SQLiteLLMCache(
+        path,
+        ttl=config.get("llm_cache_ttl"),
+        max_entries=config.get("llm_cache_max_entries"),
+    )
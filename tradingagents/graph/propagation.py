@@ -1,6 +1,7 @@
 # TradingAgents/graph/propagation.py
 
-from typing import Dict, Any
+import uuid
+from typing import Dict, Any, Optional
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -24,7 +25,13 @@ class Propagator:
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {
+                    "history": "",
+                    "current_response": "",
+                    "count": 0,
+                    "summary": "",
+                    "recent_turns": [],
+                }
             ),
             "risk_debate_state": RiskDebateState(
                 {
@@ -33,17 +40,29 @@ class Propagator:
                     "current_safe_response": "",
                     "current_neutral_response": "",
                     "count": 0,
+                    "summary": "",
+                    "recent_turns": [],
                 }
             ),
             "market_report": "",
             "fundamentals_report": "",
             "sentiment_report": "",
             "news_report": "",
+            "report_digest": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        Args:
+            thread_id: Checkpoint thread of the run; a fresh one is used when
+                omitted, since a graph compiled with a checkpointer needs one
+        """
+        config = {
+            "recursion_limit": self.max_recur_limit,
+            "configurable": {"thread_id": thread_id or uuid.uuid4().hex},
+        }
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
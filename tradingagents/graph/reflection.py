@@ -1,8 +1,31 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+import logging
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
 
+from tradingagents.agents.utils.memory import format_situation
+
+logger = logging.getLogger(__name__)
+
+
+# Memory key, component label and the part of the final state each memory reflects on
+REFLECTION_COMPONENTS = [
+    ("bull", "BULL", lambda state: state["investment_debate_state"]["bull_history"]),
+    ("bear", "BEAR", lambda state: state["investment_debate_state"]["bear_history"]),
+    ("trader", "TRADER", lambda state: state["trader_investment_plan"]),
+    (
+        "invest_judge",
+        "INVEST JUDGE",
+        lambda state: state["investment_debate_state"]["judge_decision"],
+    ),
+    (
+        "risk_manager",
+        "RISK JUDGE",
+        lambda state: state["risk_debate_state"]["judge_decision"],
+    ),
+]
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
@@ -48,18 +71,14 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
 
     def _extract_current_situation(self, current_state: Dict[str, Any]) -> str:
         """Extract the current market situation from the state."""
-        curr_market_report = current_state["market_report"]
-        curr_sentiment_report = current_state["sentiment_report"]
-        curr_news_report = current_state["news_report"]
-        curr_fundamentals_report = current_state["fundamentals_report"]
+        return format_situation(current_state)
 
-        return f"{curr_market_report}\n\n{curr_sentiment_report}\n\n{curr_news_report}\n\n{curr_fundamentals_report}"
+    def _extract_reference(self, current_state: Dict[str, Any]) -> str:
+        """Market context shown to the LLM: the report digest when one was produced."""
+        return current_state.get("report_digest") or format_situation(current_state)
 
-    def _reflect_on_component(
-        self, component_type: str, report: str, situation: str, returns_losses
-    ) -> str:
-        """Generate reflection for a component."""
-        messages = [
+    def _reflection_messages(self, report: str, situation: str, returns_losses) -> list:
+        return [
             ("system", self.reflection_system_prompt),
             (
                 "human",
@@ -67,55 +86,167 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             ),
         ]
 
+    def _reflect_on_component(
+        self, component_type: str, report: str, situation: str, returns_losses
+    ) -> str:
+        """Generate reflection for a component."""
+        messages = self._reflection_messages(report, situation, returns_losses)
+
         result = self.quick_thinking_llm.invoke(messages).content
         return result
 
+    def _reflection_jobs(
+        self, states_and_returns: List[Tuple[Dict[str, Any], Any]], memories: Dict[str, Any]
+    ):
+        """One (memory key, situation, messages) job per memory and past run."""
+        jobs = []
+        for current_state, returns_losses in states_and_returns:
+            situation = self._extract_current_situation(current_state)
+            reference = self._extract_reference(current_state)
+            for key, component_type, get_report in REFLECTION_COMPONENTS:
+                if key in memories:
+                    messages = self._reflection_messages(
+                        get_report(current_state), reference, returns_losses
+                    )
+                    jobs.append((key, situation, messages))
+        return jobs
+
+    def reflect_batch(
+        self,
+        states_and_returns: Iterable[Tuple[Dict[str, Any], Any]],
+        memories: Dict[str, Any],
+        max_concurrency: Optional[int] = None,
+    ):
+        """Reflect on many past runs for every memory at once and update the memories.
+
+        All reflections are requested concurrently, the situations are embedded in
+        one batched pass, and each memory receives a single bulk insert. A failed
+        reflection is logged and skipped, so it does not discard the others.
+
+        Args:
+            states_and_returns: (final state, returns/losses) pairs
+            memories: FinancialSituationMemory per key of REFLECTION_COMPONENTS
+                ("bull", "bear", "trader", "invest_judge", "risk_manager")
+            max_concurrency: Maximum number of reflection LLM calls in flight
+        """
+        jobs = self._reflection_jobs(list(states_and_returns), memories)
+        if not jobs:
+            return
+
+        results = self.quick_thinking_llm.batch(
+            [messages for _, _, messages in jobs],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        jobs, results = self._successful(jobs, results)
+        if not jobs:
+            return
+
+        situations = list(dict.fromkeys(situation for _, situation, _ in jobs))
+        embedder = next(iter(memories.values()))
+        embeddings = dict(zip(situations, embedder.get_embeddings(situations)))
+        self._store_reflections(jobs, results, embeddings, memories)
+
+    async def areflect_batch(
+        self,
+        states_and_returns: Iterable[Tuple[Dict[str, Any], Any]],
+        memories: Dict[str, Any],
+        max_concurrency: Optional[int] = None,
+    ):
+        """Async version of reflect_batch."""
+        jobs = self._reflection_jobs(list(states_and_returns), memories)
+        if not jobs:
+            return
+
+        results = await self.quick_thinking_llm.abatch(
+            [messages for _, _, messages in jobs],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        jobs, results = self._successful(jobs, results)
+        if not jobs:
+            return
+
+        situations = list(dict.fromkeys(situation for _, situation, _ in jobs))
+        embedder = next(iter(memories.values()))
+        embeddings = dict(zip(situations, await embedder.aget_embeddings(situations)))
+        self._store_reflections(jobs, results, embeddings, memories)
+
+    @staticmethod
+    def _successful(jobs, results):
+        """Drop the jobs whose reflection raised, logging each failure."""
+        kept_jobs, kept_results = [], []
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.warning("Reflection for %s memory failed: %r", job[0], result)
+            else:
+                kept_jobs.append(job)
+                kept_results.append(result)
+        return kept_jobs, kept_results
+
+    def _store_reflections(self, jobs, results, embeddings, memories):
+        """Insert each memory's new lessons in one bulk add."""
+        per_memory = {}
+        for (key, situation, _), result in zip(jobs, results):
+            per_memory.setdefault(key, []).append((situation, result.content))
+
+        for key, situations_and_advice in per_memory.items():
+            memories[key].add_embedded_situations(
+                situations_and_advice,
+                [embeddings[situation] for situation, _ in situations_and_advice],
+            )
+
     def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
         """Reflect on bull researcher's analysis and update memory."""
         situation = self._extract_current_situation(current_state)
+        reference = self._extract_reference(current_state)
         bull_debate_history = current_state["investment_debate_state"]["bull_history"]
 
         result = self._reflect_on_component(
-            "BULL", bull_debate_history, situation, returns_losses
+            "BULL", bull_debate_history, reference, returns_losses
         )
         bull_memory.add_situations([(situation, result)])
 
     def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
         """Reflect on bear researcher's analysis and update memory."""
         situation = self._extract_current_situation(current_state)
+        reference = self._extract_reference(current_state)
         bear_debate_history = current_state["investment_debate_state"]["bear_history"]
 
         result = self._reflect_on_component(
-            "BEAR", bear_debate_history, situation, returns_losses
+            "BEAR", bear_debate_history, reference, returns_losses
         )
         bear_memory.add_situations([(situation, result)])
 
     def reflect_trader(self, current_state, returns_losses, trader_memory):
         """Reflect on trader's decision and update memory."""
         situation = self._extract_current_situation(current_state)
+        reference = self._extract_reference(current_state)
         trader_decision = current_state["trader_investment_plan"]
 
         result = self._reflect_on_component(
-            "TRADER", trader_decision, situation, returns_losses
+            "TRADER", trader_decision, reference, returns_losses
         )
         trader_memory.add_situations([(situation, result)])
 
     def reflect_invest_judge(self, current_state, returns_losses, invest_judge_memory):
         """Reflect on investment judge's decision and update memory."""
         situation = self._extract_current_situation(current_state)
+        reference = self._extract_reference(current_state)
         judge_decision = current_state["investment_debate_state"]["judge_decision"]
 
         result = self._reflect_on_component(
-            "INVEST JUDGE", judge_decision, situation, returns_losses
+            "INVEST JUDGE", judge_decision, reference, returns_losses
         )
         invest_judge_memory.add_situations([(situation, result)])
 
     def reflect_risk_manager(self, current_state, returns_losses, risk_manager_memory):
         """Reflect on risk manager's decision and update memory."""
         situation = self._extract_current_situation(current_state)
+        reference = self._extract_reference(current_state)
         judge_decision = current_state["risk_debate_state"]["judge_decision"]
 
         result = self._reflect_on_component(
-            "RISK JUDGE", judge_decision, situation, returns_losses
+            "RISK JUDGE", judge_decision, reference, returns_losses
         )
         risk_manager_memory.add_situations([(situation, result)])
@@ -2,16 +2,26 @@
 
 from typing import Dict, Any
 from langchain_openai import ChatOpenAI
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langgraph.graph import END, StateGraph, START
-from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.debate_context import DebateContext
 
 from .conditional_logic import ConditionalLogic
 
 
+# State field each analyst writes its report to
+ANALYST_REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
 
@@ -20,13 +30,14 @@ class GraphSetup:
         quick_thinking_llm: ChatOpenAI,
         deep_thinking_llm: ChatOpenAI,
         toolkit: Toolkit,
-        tool_nodes: Dict[str, ToolNode],
+        tool_nodes: Dict[str, Runnable],
         bull_memory,
         bear_memory,
         trader_memory,
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        debate_context: DebateContext = None,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -39,9 +50,14 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.debate_context = debate_context
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
+        report_digest=False,
+        checkpointer=None,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +67,15 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the analysts concurrently, each in its own
+                subgraph with an isolated message history, joining before the
+                Bull Researcher. Otherwise they run one after another.
+            report_digest (bool): Condense the analyst reports into a digest right
+                after the analyst team; downstream prompts then use the digest in
+                place of the full reports.
+            checkpointer: Optional LangGraph checkpointer saving the state after
+                every step, so an interrupted run can resume from its last
+                completed node. Runs must then pass a thread_id in their config.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -90,10 +115,10 @@ class GraphSetup:
 
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, self.debate_context
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, self.debate_context
         )
         research_manager_node = create_research_manager(
             self.deep_thinking_llm, self.invest_judge_memory
@@ -101,9 +126,15 @@ class GraphSetup:
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
+        neutral_analyst = create_neutral_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
+        safe_analyst = create_safe_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
         risk_manager_node = create_risk_manager(
             self.deep_thinking_llm, self.risk_manager_memory
         )
@@ -112,14 +143,33 @@ class GraphSetup:
         workflow = StateGraph(AgentState)
 
         # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
-            workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
-            )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+        if parallel_analysts:
+            for analyst_type, node in analyst_nodes.items():
+                analyst_subgraph = self._setup_analyst_subgraph(
+                    analyst_type,
+                    node,
+                    delete_nodes[analyst_type],
+                    tool_nodes[analyst_type],
+                )
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    create_isolated_analyst(
+                        analyst_subgraph, ANALYST_REPORT_KEYS[analyst_type]
+                    ),
+                )
+        else:
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+                workflow.add_node(
+                    f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                )
+                workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
+        if report_digest:
+            workflow.add_node(
+                "Report Digest", create_report_digest(self.quick_thinking_llm)
+            )
         workflow.add_node("Bull Researcher", bull_researcher_node)
         workflow.add_node("Bear Researcher", bear_researcher_node)
         workflow.add_node("Research Manager", research_manager_node)
@@ -130,30 +180,23 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
+        after_analysts = "Report Digest" if report_digest else "Bull Researcher"
+        if parallel_analysts:
+            # Fan out to every analyst at once and join before the Bull Researcher
+            analyst_names = [
+                f"{analyst_type.capitalize()} Analyst"
+                for analyst_type in selected_analysts
+            ]
+            for analyst_name in analyst_names:
+                workflow.add_edge(START, analyst_name)
+            workflow.add_edge(analyst_names, after_analysts)
+        else:
+            self._connect_analysts_in_sequence(
+                workflow, selected_analysts, after_analysts
             )
-            workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+        if report_digest:
+            workflow.add_edge("Report Digest", "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -202,4 +245,71 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
+
+    def _connect_analysts_in_sequence(
+        self, workflow, selected_analysts, next_node="Bull Researcher"
+    ):
+        """Chain the analysts one after another, ending at next_node."""
+        # Start with the first analyst
+        first_analyst = selected_analysts[0]
+        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+        # Connect analysts in sequence
+        for i, analyst_type in enumerate(selected_analysts):
+            current_analyst = f"{analyst_type.capitalize()} Analyst"
+            current_tools = f"tools_{analyst_type}"
+            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+            # Add conditional edges for current analyst
+            workflow.add_conditional_edges(
+                current_analyst,
+                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                [current_tools, current_clear],
+            )
+            workflow.add_edge(current_tools, current_analyst)
+
+            # Connect to next analyst or to next_node if this is the last analyst
+            if i < len(selected_analysts) - 1:
+                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                workflow.add_edge(current_clear, next_analyst)
+            else:
+                workflow.add_edge(current_clear, next_node)
+
+    def _setup_analyst_subgraph(self, analyst_type, analyst_node, delete_node, tool_node):
+        """Compile a standalone analyst -> tools loop that ends after its message clear."""
+        current_analyst = f"{analyst_type.capitalize()} Analyst"
+        current_tools = f"tools_{analyst_type}"
+        current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+        subgraph = StateGraph(AgentState)
+        subgraph.add_node(current_analyst, analyst_node)
+        subgraph.add_node(current_clear, delete_node)
+        subgraph.add_node(current_tools, tool_node)
+
+        subgraph.add_edge(START, current_analyst)
+        subgraph.add_conditional_edges(
+            current_analyst,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            [current_tools, current_clear],
+        )
+        subgraph.add_edge(current_tools, current_analyst)
+        subgraph.add_edge(current_clear, END)
+
+        # The parent graph checkpoints the analyst as a whole
+        return subgraph.compile(checkpointer=False)
+
+
+def create_isolated_analyst(analyst_subgraph, report_key):
+    """Wrap an analyst subgraph so it runs on a private copy of the message
+    history and only hands its report back to the parent graph."""
+
+    def isolated_analyst_node(state, config: RunnableConfig):
+        final_state = analyst_subgraph.invoke(state, config)
+        return {report_key: final_state[report_key]}
+
+    async def aisolated_analyst_node(state, config: RunnableConfig):
+        final_state = await analyst_subgraph.ainvoke(state, config)
+        return {report_key: final_state[report_key]}
+
+    return RunnableLambda(isolated_analyst_node, afunc=aisolated_analyst_node)
@@ -1,26 +1,119 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
 
 
+# The decision word must stand alone: "holding", "sell-off", "hold off" and the
+# "BUY/HOLD/SELL" placeholder of the prompt templates are not decisions
+_DECISION = r"\**\s*(BUY|SELL|HOLD)(?![\w/-]|\s+off\b)"
+
+# (pattern, weight) pairs, strongest first. The weight is the confidence of a
+# decision that only this kind of phrasing supports.
+_SIGNAL_PATTERNS = [
+    # The marker every agent is prompted to end with
+    (re.compile(r"FINAL\s+TRANSACTION\s+PROPOSAL\s*:?\s*" + _DECISION, re.I), 1.0),
+    # Labelled conclusions, e.g. "Recommendation: **Sell**" or "Final Decision - HOLD"
+    (
+        re.compile(
+            r"\b(?:final\s+)?(?:recommendation|decision|verdict|action|rating)\**\s*"
+            r"(?:is)?\s*[:\-–—]\s*" + _DECISION,
+            re.I,
+        ),
+        0.9,
+    ),
+    # Phrasings such as "I recommend that we sell" or "we should hold"
+    (
+        re.compile(
+            r"\b(?:recommend|advise|we\s+should|i\s+would|decision\s+is\s+to)\s+"
+            r"(?:to\s+|that\s+we\s+|that\s+you\s+)?" + _DECISION,
+            re.I,
+        ),
+        0.8,
+    ),
+    # A bare bold decision, which debate summaries also use for other positions
+    (re.compile(r"\*\*\s*(BUY|SELL|HOLD)\s*\*\*", re.I), 0.6),
+]
+
+_NEGATION = re.compile(r"\b(?:not|never|no)\s*$|n't\s*$", re.I)
+
+
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize with an LLM for processing."""
+    def __init__(
+        self, quick_thinking_llm: ChatOpenAI, confidence_threshold: float = 0.8
+    ):
+        """Initialize with an LLM for processing.
+
+        Args:
+            quick_thinking_llm: LLM used when the rule-based parser is not confident
+            confidence_threshold: Minimum parser confidence to skip the LLM
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.confidence_threshold = confidence_threshold
+        self.stats = {"rule_based": 0, "llm_fallback": 0}
+        self._stats_lock = threading.Lock()
 
-    def process_signal(self, full_signal: str) -> str:
+    def parse_signal(self, full_signal: str) -> Tuple[Optional[str], float]:
         """
-        Process a full trading signal to extract the core decision.
+        Extract the decision from a trading signal with deterministic rules.
 
         Args:
             full_signal: Complete trading signal text
 
         Returns:
-            Extracted decision (BUY, SELL, or HOLD)
+            Tuple of the decision (BUY, SELL, HOLD, or None if nothing was found)
+            and a confidence score between 0 and 1
         """
-        messages = [
+        matches = []  # (weight, position, decision)
+        for pattern, weight in _SIGNAL_PATTERNS:
+            for match in pattern.finditer(full_signal):
+                preceding = full_signal[max(0, match.start() - 12) : match.start()]
+                if _NEGATION.search(preceding):
+                    continue
+                matches.append((weight, match.start(), match.group(1).upper()))
+
+        if not matches:
+            return None, 0.0
+
+        # The strongest kind of phrasing wins, and within it the last occurrence,
+        # since reports state their conclusion at the end
+        top_weight = max(weight for weight, _, _ in matches)
+        decision = max(
+            (m for m in matches if m[0] == top_weight), key=lambda m: m[1]
+        )[2]
+
+        # Scale by how much of the comparable evidence agrees with the decision
+        evidence = [m for m in matches if m[0] >= min(top_weight, 0.8)]
+        agreeing = sum(weight for weight, _, d in evidence if d == decision)
+        total = sum(weight for weight, _, _ in evidence)
+
+        return decision, top_weight * (agreeing / total)
+
+    def _parse_or_none(self, full_signal: str) -> Optional[str]:
+        decision, confidence = self.parse_signal(full_signal)
+        if decision is None or confidence < self.confidence_threshold:
+            decision = None
+        key = "llm_fallback" if decision is None else "rule_based"
+        with self._stats_lock:
+            self.stats[key] += 1
+        return decision
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return how often decisions came from the parser and from the LLM."""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        total = stats["rule_based"] + stats["llm_fallback"]
+        stats["fallback_rate"] = stats["llm_fallback"] / total if total else 0.0
+        return stats
+
+    def _signal_messages(self, full_signal: str) -> list:
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
@@ -28,4 +121,36 @@ class SignalProcessor:
             ("human", full_signal),
         ]
 
-        return self.quick_thinking_llm.invoke(messages).content
+    def process_signal(
+        self, full_signal: str, config: Optional[RunnableConfig] = None
+    ) -> str:
+        """
+        Process a full trading signal to extract the core decision.
+
+        The rule-based parser is tried first; the LLM is only asked when the
+        parser's confidence is below the threshold.
+
+        Args:
+            full_signal: Complete trading signal text
+            config: Optional config for the LLM call, e.g. callbacks
+
+        Returns:
+            Extracted decision (BUY, SELL, or HOLD)
+        """
+        decision = self._parse_or_none(full_signal)
+        if decision is not None:
+            return decision
+
+        messages = self._signal_messages(full_signal)
+        return self.quick_thinking_llm.invoke(messages, config).content
+
+    async def aprocess_signal(
+        self, full_signal: str, config: Optional[RunnableConfig] = None
+    ) -> str:
+        """Async version of process_signal."""
+        decision = self._parse_or_none(full_signal)
+        if decision is not None:
+            return decision
+
+        messages = self._signal_messages(full_signal)
+        return (await self.quick_thinking_llm.ainvoke(messages, config)).content
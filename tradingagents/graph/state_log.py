@@ -0,0 +1,222 @@
+# TradingAgents/graph/state_log.py
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within the process
+    fcntl = None
+
+
+class StateLog:
+    """Append-only log of final states, one file per ticker.
+
+    Every (ticker, trade date) run appends one JSON record to
+    <directory>/<ticker>/TradingAgentsStrategy_logs/full_states_log.jsonl, so
+    logging costs the same on the first and on the thousandth date. With zstd
+    compression each record is its own zstd frame in full_states_log.jsonl.zst;
+    the file stays a valid zstd stream and any record can be decompressed alone.
+
+    A sidecar <log file>.idx lists the trade date, offset and length of
+    every record and is written after the record, so lookups by date read a
+    single record. Records a crash left out of the index are re-indexed, and a
+    torn last record is dropped, the next time the log is opened. When a date
+    is logged again, the latest record wins.
+
+    Appends and repairs hold an flock on the log file, so several processes
+    can share a directory. Each instance reloads the index when the log has
+    grown since it last looked.
+    """
+
+    def __init__(self, directory: str = "eval_results", compression: Optional[str] = None):
+        """Set up the log.
+
+        Args:
+            directory: Root directory holding one subdirectory per ticker
+            compression: None for plain JSONL or "zstd" for one zstd frame per record
+        """
+        if compression not in (None, "zstd"):
+            raise ValueError(f"Unsupported state log compression: {compression}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ImportError("zstandard is required for a zstd-compressed state log")
+
+        self.directory = directory
+        self.compression = compression
+        self._indexes = {}  # ticker -> list of (trade_date, offset, length)
+        self._lock = threading.Lock()
+
+    def log_path(self, ticker: str) -> str:
+        suffix = ".jsonl.zst" if self.compression == "zstd" else ".jsonl"
+        return os.path.join(
+            self.directory,
+            ticker,
+            "TradingAgentsStrategy_logs",
+            "full_states_log" + suffix,
+        )
+
+    def index_path(self, ticker: str) -> str:
+        return self.log_path(ticker) + ".idx"
+
+    def append(self, ticker: str, trade_date: str, record: Dict[str, Any]):
+        """Append the record of one run."""
+        data = (json.dumps(record) + "\n").encode("utf-8")
+        if self.compression == "zstd":
+            data = zstandard.ZstdCompressor().compress(data)
+
+        with self._locked(ticker) as log:
+            index = self._index(ticker)
+            log.seek(0, os.SEEK_END)
+            offset = log.tell()
+            log.write(data)
+            log.flush()
+
+            entry = (str(trade_date), offset, len(data))
+            with open(self.index_path(ticker), "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            index.append(entry)
+
+    def dates(self, ticker: str) -> List[str]:
+        """Logged trade dates of ticker, in logging order and without repeats."""
+        index = self._current_index(ticker)
+        return list(dict.fromkeys(trade_date for trade_date, _, _ in index))
+
+    def read(self, ticker: str, trade_date: str) -> Optional[Dict[str, Any]]:
+        """Latest record of ticker for trade_date, or None if it was never logged."""
+        index = self._current_index(ticker)
+        for logged_date, offset, length in reversed(index):
+            if logged_date == str(trade_date):
+                with open(self.log_path(ticker), "rb") as f:
+                    f.seek(offset)
+                    return self._decode(f.read(length))
+        return None
+
+    def records(self, ticker: str) -> Iterator[Dict[str, Any]]:
+        """Every record of ticker in logging order."""
+        index = self._current_index(ticker)
+        if not index:
+            return
+        with open(self.log_path(ticker), "rb") as f:
+            for _, offset, length in index:
+                f.seek(offset)
+                yield self._decode(f.read(length))
+
+    def _decode(self, data: bytes) -> Dict[str, Any]:
+        if self.compression == "zstd":
+            data = zstandard.ZstdDecompressor().decompress(data)
+        return json.loads(data)
+
+    @contextmanager
+    def _locked(self, ticker: str):
+        """Open the log of ticker for appending, locked across threads and processes."""
+        log_path = self.log_path(ticker)
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with self._lock, open(log_path, "ab") as log:
+            if fcntl is not None:
+                # Released when the file is closed, after its buffer is flushed
+                fcntl.flock(log, fcntl.LOCK_EX)
+            yield log
+
+    def _current_index(self, ticker: str) -> list:
+        """Snapshot of the up-to-date index of ticker."""
+        if not os.path.exists(self.log_path(ticker)):
+            return []
+        with self._locked(ticker):
+            return list(self._index(ticker))
+
+    def _index(self, ticker: str) -> list:
+        """Load, and if needed repair, the index of ticker. Call inside _locked."""
+        log_path = self.log_path(ticker)
+        size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+        index = self._indexes.get(ticker)
+        if index is not None and _end(index) == size:
+            return index
+
+        # First use, or another process appended since: reload from disk
+        index = []
+        torn = False
+        index_path = self.index_path(ticker)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                for line in f:
+                    try:
+                        index.append(tuple(json.loads(line)))
+                    except ValueError:
+                        torn = True
+                        break
+
+        indexed = -1 if torn else len(index)
+        end = _end(index)
+        if size < end:
+            # Entries pointing past the end of the log were never fully written
+            while index and _end(index) > size:
+                index.pop()
+            end = _end(index)
+        if size > end:
+            with open(log_path, "rb") as f:
+                f.seek(end)
+                tail = f.read()
+            recovered, used = self._scan(tail, end)
+            index.extend(recovered)
+            if end + used < size:
+                with open(log_path, "r+b") as f:
+                    f.truncate(end + used)
+
+        if len(index) != indexed or (index and not os.path.exists(index_path)):
+            with open(index_path + ".tmp", "w") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in index)
+            os.replace(index_path + ".tmp", index_path)
+
+        self._indexes[ticker] = index
+        return index
+
+    def _scan(self, data: bytes, base: int):
+        """Index the complete records in data, which starts at offset base of the log."""
+        entries = []
+        position = 0
+        while position < len(data):
+            if self.compression == "zstd":
+                decompressor = zstandard.ZstdDecompressor().decompressobj()
+                try:
+                    text = decompressor.decompress(data[position:])
+                except zstandard.ZstdError:
+                    break
+                if not decompressor.eof:
+                    break
+                length = len(data) - position - len(decompressor.unused_data)
+            else:
+                newline = data.find(b"\n", position)
+                if newline == -1:
+                    break
+                text = data[position : newline + 1]
+                length = len(text)
+            try:
+                record = json.loads(text)
+            except ValueError:
+                break
+            entries.append((str(record.get("trade_date")), base + position, length))
+            position += length
+        return entries, position
+
+
+def _end(index: list) -> int:
+    """Log offset just past the last indexed record."""
+    return index[-1][1] + index[-1][2] if index else 0
+
+
+def create_state_log(config) -> StateLog:
+    """Build the state log described by a config dict."""
+    return StateLog(
+        directory=config.get("state_log_dir", "eval_results"),
+        compression=config.get("state_log_compression"),
+    )
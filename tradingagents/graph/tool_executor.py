@@ -0,0 +1,206 @@
+# TradingAgents/graph/tool_executor.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.tools import BaseTool
+
+
+class ToolExecutor:
+    """Runs the tool calls of one AIMessage concurrently in a bounded thread pool.
+
+    The dataflow functions behind the tools are synchronous, so independent calls
+    (e.g. several indicator reports requested in the same turn) are dispatched to
+    a shared pool and the tool phase takes as long as the slowest call instead of
+    their sum. A single executor is meant to be shared by every tool node of a
+    graph so the total number of tool threads stays bounded.
+
+    Threads are used rather than processes: the tools are mostly I/O-bound or
+    release the GIL inside pandas, and their arguments and results are cheap to
+    pass around in-process.
+
+    A call's timeout counts from the moment a worker starts it, so calls that
+    wait in the queue of a busy pool are not timed out before they ran. A
+    timed-out call is reported to the LLM as an error, but its worker thread
+    cannot be interrupted: it keeps running, and occupies one of max_workers,
+    until the tool returns on its own. Timeouts should therefore sit well above
+    a tool's normal latency, so only genuinely stuck calls are abandoned.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, Optional[float]]] = None,
+    ):
+        """Initialize the executor.
+
+        Args:
+            max_workers: Maximum number of tool calls running at once
+            timeout: Seconds to wait for a single tool call before reporting an
+                error back to the LLM, or None to wait indefinitely
+            timeouts: Per-tool overrides of timeout, keyed by tool name
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tool"
+        )
+
+    def run(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        tools_by_name: Dict[str, BaseTool],
+        config: Optional[RunnableConfig] = None,
+    ) -> List[ToolMessage]:
+        """Run tool calls concurrently and return their ToolMessages in call order."""
+        pending = []
+        for call in tool_calls:
+            event = threading.Event()
+            started = _Started(event.set)
+            future = self._pool.submit(
+                _invoke_tool, call, tools_by_name, config, started
+            )
+            # Also wake up the waiter if the call is cancelled before it starts
+            future.add_done_callback(lambda _, event=event: event.set())
+            pending.append((call, future, event, started))
+
+        messages = []
+        for call, future, event, started in pending:
+            timeout = self.timeout_for(call["name"])
+            if timeout is not None:
+                event.wait()
+            try:
+                messages.append(future.result(timeout=started.remaining(timeout)))
+            except FutureTimeoutError:
+                # The worker thread cannot be interrupted; it finishes in the
+                # background and its result is discarded
+                future.cancel()
+                messages.append(_timeout_message(call, timeout))
+        return messages
+
+    async def arun(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        tools_by_name: Dict[str, BaseTool],
+        config: Optional[RunnableConfig] = None,
+    ) -> List[ToolMessage]:
+        """Async version of run that does not block the event loop."""
+        loop = asyncio.get_running_loop()
+
+        async def run_one(call):
+            event = asyncio.Event()
+            started = _Started(lambda: loop.call_soon_threadsafe(event.set))
+            future = loop.run_in_executor(
+                self._pool, _invoke_tool, call, tools_by_name, config, started
+            )
+            future.add_done_callback(lambda _: event.set())
+            timeout = self.timeout_for(call["name"])
+            if timeout is not None:
+                await event.wait()
+            try:
+                return await asyncio.wait_for(
+                    future, timeout=started.remaining(timeout)
+                )
+            except asyncio.TimeoutError:
+                return _timeout_message(call, timeout)
+
+        return list(await asyncio.gather(*[run_one(call) for call in tool_calls]))
+
+    def timeout_for(self, tool_name: str) -> Optional[float]:
+        """Seconds to wait for a call of tool_name, or None to wait indefinitely."""
+        return self.timeouts.get(tool_name, self.timeout)
+
+    def shutdown(self, wait: bool = True):
+        """Release the worker threads."""
+        self._pool.shutdown(wait=wait)
+
+
+def create_tool_node(tools: List[BaseTool], executor: ToolExecutor):
+    """Create a graph node that executes the tool calls of the last AIMessage.
+
+    Drop-in replacement for langgraph's ToolNode on a "messages" state key, backed
+    by a shared ToolExecutor.
+    """
+    tools_by_name = {tool.name: tool for tool in tools}
+
+    def tool_node(state, config: RunnableConfig):
+        tool_calls = _pending_tool_calls(state)
+        return {"messages": executor.run(tool_calls, tools_by_name, config)}
+
+    async def atool_node(state, config: RunnableConfig):
+        tool_calls = _pending_tool_calls(state)
+        return {"messages": await executor.arun(tool_calls, tools_by_name, config)}
+
+    return RunnableLambda(tool_node, afunc=atool_node, name="tools")
+
+
+class _Started:
+    """Called by the worker when it begins a tool call, to start the call's clock."""
+
+    def __init__(self, notify):
+        self.at = None
+        self._notify = notify
+
+    def __call__(self):
+        self.at = time.monotonic()
+        self._notify()
+
+    def remaining(self, timeout: Optional[float]) -> Optional[float]:
+        """Seconds left of timeout, counted from the start of the call."""
+        if timeout is None or self.at is None:
+            return timeout
+        return max(0, self.at + timeout - time.monotonic())
+
+
+def _pending_tool_calls(state) -> List[Dict[str, Any]]:
+    for message in reversed(state["messages"]):
+        if isinstance(message, AIMessage):
+            return message.tool_calls
+    raise ValueError("No AIMessage found in input")
+
+
+def _invoke_tool(
+    call: Dict[str, Any],
+    tools_by_name: Dict[str, BaseTool],
+    config: Optional[RunnableConfig],
+    started: Optional[_Started] = None,
+) -> ToolMessage:
+    if started is not None:
+        started()
+
+    tool = tools_by_name.get(call["name"])
+    if tool is None:
+        return ToolMessage(
+            content=f"Error: {call['name']} is not a valid tool, try one of [{', '.join(tools_by_name)}].",
+            name=call["name"],
+            tool_call_id=call["id"],
+            status="error",
+        )
+
+    try:
+        # Invoking a tool with a ToolCall dict returns a ToolMessage
+        return tool.invoke({**call, "type": "tool_call"}, config)
+    except Exception as e:
+        return ToolMessage(
+            content=f"Error: {repr(e)}\n Please fix your mistakes.",
+            name=call["name"],
+            tool_call_id=call["id"],
+            status="error",
+        )
+
+
+def _timeout_message(call: Dict[str, Any], timeout: Optional[float]) -> ToolMessage:
+    return ToolMessage(
+        content=f"Error: {call['name']} did not finish within {timeout} seconds.",
+        name=call["name"],
+        tool_call_id=call["id"],
+        status="error",
+    )
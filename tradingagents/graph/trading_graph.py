@@ -1,6 +1,11 @@
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
+import logging
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 import json
 from datetime import date
@@ -10,11 +15,12 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from langgraph.prebuilt import ToolNode
+from langchain_core.runnables import Runnable
 
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.debate_context import DebateContext
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -23,11 +29,18 @@ from tradingagents.agents.utils.agent_states import (
 from tradingagents.dataflows.interface import set_config
 from tradingagents.execution.trading_executor import TradingExecutor
 
+from .checkpointing import create_checkpointer
 from .conditional_logic import ConditionalLogic
+from .instrumentation import RunMetrics, create_metrics_exporter
+from .llm_cache import create_llm_cache
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .state_log import create_state_log
+from .tool_executor import ToolExecutor, create_tool_node
+
+logger = logging.getLogger(__name__)
 
 
 class TradingAgentsGraph:
@@ -58,16 +71,19 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
+        # Optional persistent cache shared by both LLMs
+        self.llm_cache = create_llm_cache(self.config)
+
         # Initialize LLMs
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], cache=self.llm_cache)
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
@@ -80,7 +96,12 @@ class TradingAgentsGraph:
         self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
         self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
 
-        # Create tool nodes
+        # Create tool nodes sharing one bounded pool for tool calls
+        self.tool_executor = ToolExecutor(
+            max_workers=self.config.get("tool_max_workers", 8),
+            timeout=self.config.get("tool_timeout"),
+            timeouts=self.config.get("tool_timeouts"),
+        )
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize trading executor
@@ -99,24 +120,51 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            self._create_debate_context(),
         )
 
         self.propagator = Propagator()
         self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.signal_processor = SignalProcessor(
+            self.quick_thinking_llm,
+            confidence_threshold=self.config.get("signal_confidence_threshold", 0.8),
+        )
+
+        # Optional local checkpointer so interrupted runs can resume
+        self.checkpointer = create_checkpointer(self.config)
 
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.run_id = None
+        self.state_log = create_state_log(self.config)
+
+        # Per-run latency, token and cost metrics
+        self.metrics_exporter = create_metrics_exporter(self.config)
+        self.run_metrics = None  # summary of the last propagate
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            self.config.get("parallel_analysts", False),
+            self.config.get("report_digest", False),
+            self.checkpointer,
+        )
+
+    def _create_debate_context(self) -> DebateContext:
+        """Create the debate history compaction shared by researchers and risk debators."""
+        if not self.config.get("debate_context_compaction", False):
+            return DebateContext()
+        return DebateContext(
+            self.quick_thinking_llm,
+            max_tokens=self.config.get("debate_context_max_tokens", 4000),
+            recent_turns=self.config.get("debate_context_recent_turns", 2),
+        )
 
-    def _create_tool_nodes(self) -> Dict[str, ToolNode]:
+    def _create_tool_nodes(self) -> Dict[str, Runnable]:
         """Create tool nodes for different data sources."""
         return {
-            "market": ToolNode(
+            "market": create_tool_node(
                 [
                     # online tools
                     self.toolkit.get_YFin_data_online,
@@ -124,17 +172,19 @@ class TradingAgentsGraph:
                     # offline tools
                     self.toolkit.get_YFin_data,
                     self.toolkit.get_stockstats_indicators_report,
-                ]
+                ],
+                self.tool_executor,
             ),
-            "social": ToolNode(
+            "social": create_tool_node(
                 [
                     # online tools
                     self.toolkit.get_stock_news_openai,
                     # offline tools
                     self.toolkit.get_reddit_stock_info,
-                ]
+                ],
+                self.tool_executor,
             ),
-            "news": ToolNode(
+            "news": create_tool_node(
                 [
                     # online tools
                     self.toolkit.get_global_news_openai,
@@ -142,9 +192,10 @@ class TradingAgentsGraph:
                     # offline tools
                     self.toolkit.get_finnhub_news,
                     self.toolkit.get_reddit_news,
-                ]
+                ],
+                self.tool_executor,
             ),
-            "fundamentals": ToolNode(
+            "fundamentals": create_tool_node(
                 [
                     # online tools
                     self.toolkit.get_fundamentals_openai,
@@ -154,20 +205,221 @@ class TradingAgentsGraph:
                     self.toolkit.get_simfin_balance_sheet,
                     self.toolkit.get_simfin_cashflow,
                     self.toolkit.get_simfin_income_stmt,
-                ]
+                ],
+                self.tool_executor,
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def propagate(self, company_name, trade_date, run_id=None):
+        """Run the trading agents graph for a company on a specific date.
+
+        With checkpointing enabled every step is saved under the thread
+        "<company>:<date>:<run_id>". If the run fails, self.run_id names it and
+        resume() continues from its last completed node. Passing the run_id of
+        an interrupted run resumes it as well.
+        """
+
+        self.ticker = company_name
+        self.run_id = run_id or self.new_run_id()
+
+        with self._instrument(company_name, trade_date, self.run_id) as metrics:
+            final_state, decision = self._run_propagation(
+                company_name, trade_date, self.run_id, metrics
+            )
+        self.run_metrics = metrics.summary() if metrics else None
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        # Return decision and processed signal
+        return final_state, decision
+
+    async def apropagate(self, company_name, trade_date, run_id=None):
+        """Async version of propagate.
+
+        Many runs can be awaited concurrently on one event loop, e.g. with
+        asyncio.gather. Concurrent runs should not rely on curr_state or run_id
+        afterwards; use the returned final state and pass explicit run ids instead.
+        """
 
         self.ticker = company_name
+        self.run_id = run_id or self.new_run_id()
+
+        with self._instrument(company_name, trade_date, self.run_id) as metrics:
+            final_state, decision = await self._arun_propagation(
+                company_name, trade_date, self.run_id, metrics
+            )
+        self.run_metrics = metrics.summary() if metrics else None
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        return final_state, decision
+
+    def resume(self, company_name, trade_date, run_id):
+        """Continue an interrupted run from its last completed node.
+
+        Args:
+            company_name: Company of the interrupted run
+            trade_date: Trade date of the interrupted run
+            run_id: Run id of the interrupted run, e.g. self.run_id after a
+                failed propagate or the "run_id" of a propagate_batch result
+
+        Returns:
+            Same as propagate
+        """
+        self._check_resumable(company_name, trade_date, run_id)
+        return self.propagate(company_name, trade_date, run_id)
+
+    async def aresume(self, company_name, trade_date, run_id):
+        """Async version of resume."""
+        self._check_resumable(company_name, trade_date, run_id)
+        return await self.apropagate(company_name, trade_date, run_id)
+
+    def _check_resumable(self, company_name, trade_date, run_id):
+        if self.checkpointer is None:
+            raise ValueError("Resuming runs requires checkpoint_enabled")
+        thread_id = self.thread_id(company_name, trade_date, run_id)
+        if self.checkpointer.get_tuple({"configurable": {"thread_id": thread_id}}) is None:
+            raise ValueError(f"No checkpointed run {thread_id} to resume")
+
+    @staticmethod
+    def new_run_id():
+        return uuid.uuid4().hex[:12]
+
+    @staticmethod
+    def thread_id(company_name, trade_date, run_id):
+        """Checkpoint thread of one run."""
+        return f"{company_name}:{trade_date}:{run_id}"
+
+    async def astream(self, company_name, trade_date, run_id=None, callbacks=None):
+        """Stream the full graph state after each step for a company on a specific date.
+
+        A run_id with a checkpoint resumes that run, as in propagate. callbacks
+        are LangChain callback handlers attached to the run, e.g. a RunMetrics.
+        """
+        thread_id = None
+        if self.checkpointer is not None:
+            thread_id = self.thread_id(
+                company_name, trade_date, run_id or self.new_run_id()
+            )
+        args = self.propagator.get_graph_args(thread_id)
+        if callbacks:
+            args["config"]["callbacks"] = callbacks
+
+        graph_input = None
+        if thread_id is None or not (await self.graph.aget_state(args["config"])).values:
+            graph_input = self.propagator.create_initial_state(
+                company_name, trade_date
+            )
+
+        async for chunk in self.graph.astream(graph_input, **args):
+            yield chunk
 
-        # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
+    def propagate_batch(self, jobs, max_concurrency=None):
+        """Run the trading agents graph for many (company, date) jobs concurrently.
+
+        All jobs share this instance's LLM clients, tool data caches and memories.
+        A failing job does not affect the others: its error is returned in its result.
+
+        Args:
+            jobs: Iterable of (company_name, trade_date) pairs, or of
+                (company_name, trade_date, run_id) triples to resume failed runs
+                (with checkpoint_enabled)
+            max_concurrency: Maximum number of jobs in flight. Defaults to the
+                "max_batch_concurrency" config value
+
+        Returns:
+            List of dicts, one per job in input order, with the keys "ticker",
+            "trade_date", "run_id", "final_state", "decision", "error" (None on
+            success) and "metrics" (the run's metrics summary, or None when
+            instrumentation is disabled)
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        if max_concurrency is None:
+            max_concurrency = self.config.get("max_batch_concurrency", 4)
+
+        def run_job(job):
+            company_name, trade_date = job[:2]
+            result = {
+                "ticker": company_name,
+                "trade_date": str(trade_date),
+                "run_id": job[2] if len(job) > 2 else self.new_run_id(),
+                "final_state": None,
+                "decision": None,
+                "error": None,
+                "metrics": None,
+            }
+            try:
+                with self._instrument(
+                    company_name, trade_date, result["run_id"]
+                ) as metrics:
+                    result["metrics"] = metrics
+                    result["final_state"], result["decision"] = self._run_propagation(
+                        company_name, trade_date, result["run_id"], metrics
+                    )
+            except Exception as e:
+                logger.exception(
+                    "Propagation failed for %s on %s", company_name, trade_date
+                )
+                result["error"] = e
+            if result["metrics"] is not None:
+                result["metrics"] = result["metrics"].summary()
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            return list(executor.map(run_job, jobs))
+
+    @contextmanager
+    def _instrument(self, company_name, trade_date, run_id):
+        """Yield the RunMetrics of one run, or None, and export them when it ends."""
+        if not self.config.get("instrumentation_enabled", True):
+            yield None
+            return
+
+        metrics = RunMetrics(
+            {"ticker": company_name, "trade_date": str(trade_date), "run_id": run_id},
+            prices=self.config.get("llm_prices"),
         )
-        args = self.propagator.get_graph_args()
+        try:
+            yield metrics
+        except Exception as e:
+            metrics.finish(e)
+            raise
+        else:
+            metrics.finish()
+        finally:
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.export(metrics.summary())
+
+    @staticmethod
+    def _measure(metrics, step):
+        return nullcontext() if metrics is None else metrics.measure(step)
+
+    @staticmethod
+    def _signal_config(metrics):
+        if metrics is None:
+            return None
+        return {"callbacks": [metrics], "run_name": "Signal Processing"}
+
+    def _run_propagation(self, company_name, trade_date, run_id=None, metrics=None):
+        """Run the graph for one job without touching per-run instance state."""
+
+        thread_id = None
+        if self.checkpointer is not None:
+            thread_id = self.thread_id(company_name, trade_date, run_id)
+        args = self.propagator.get_graph_args(thread_id)
+        if metrics is not None:
+            args["config"]["callbacks"] = [metrics]
+
+        # Initialize state, unless the run resumes from its checkpoint
+        init_agent_state = None
+        if thread_id is None or not self.graph.get_state(args["config"]).values:
+            init_agent_state = self.propagator.create_initial_state(
+                company_name, trade_date
+            )
 
         if self.debug:
             # Debug mode with tracing
@@ -184,14 +436,15 @@ class TradingAgentsGraph:
             # Standard mode without tracing
             final_state = self.graph.invoke(init_agent_state, **args)
 
-        # Store current state for reflection
-        self.curr_state = final_state
-
         # Log state
-        self._log_state(trade_date, final_state)
+        with self._measure(metrics, "State Log"):
+            self._log_state(trade_date, final_state)
 
         # Process the final decision
-        decision = self.process_signal(final_state["final_trade_decision"])
+        with self._measure(metrics, "Signal Processing"):
+            decision = self.signal_processor.process_signal(
+                final_state["final_trade_decision"], self._signal_config(metrics)
+            )
         
         # Execute trade if real trading is enabled
         if self.config.get("enable_real_trading", False):
@@ -199,19 +452,85 @@ class TradingAgentsGraph:
                 decision, company_name
             )
             print(f"TRADE EXECUTION RESULT: {execution_result}")
-        
-        # Return decision and processed signal
+
+        # A completed run has nothing left to resume
+        if thread_id is not None and not self.config.get(
+            "checkpoint_keep_completed", False
+        ):
+            self.checkpointer.delete_thread(thread_id)
+
+        return final_state, decision
+
+    async def _arun_propagation(
+        self, company_name, trade_date, run_id=None, metrics=None
+    ):
+        """Async version of _run_propagation."""
+        callbacks = None if metrics is None else [metrics]
+
+        if self.debug:
+            # Debug mode with tracing
+            trace = []
+            async for chunk in self.astream(
+                company_name, trade_date, run_id, callbacks
+            ):
+                if len(chunk["messages"]) == 0:
+                    pass
+                else:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+
+            final_state = trace[-1]
+        else:
+            final_state = None
+            async for final_state in self.astream(
+                company_name, trade_date, run_id, callbacks
+            ):
+                pass
+
+        # Log state without blocking the event loop on file I/O
+        with self._measure(metrics, "State Log"):
+            await asyncio.to_thread(self._log_state, trade_date, final_state)
+
+        # Process the final decision
+        with self._measure(metrics, "Signal Processing"):
+            decision = await self.signal_processor.aprocess_signal(
+                final_state["final_trade_decision"], self._signal_config(metrics)
+            )
+
+        # Execute trade if real trading is enabled
+        if self.config.get("enable_real_trading", False):
+            execution_result = await asyncio.to_thread(
+                self.trading_executor.execute_decision, decision, company_name
+            )
+            print(f"TRADE EXECUTION RESULT: {execution_result}")
+
+        # A completed run has nothing left to resume
+        if self.checkpointer is not None and not self.config.get(
+            "checkpoint_keep_completed", False
+        ):
+            await self.checkpointer.adelete_thread(
+                self.thread_id(company_name, trade_date, run_id)
+            )
+
         return final_state, decision
 
     def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        """Append the final state to the ticker's state log."""
+        self.state_log.append(
+            final_state["company_of_interest"],
+            str(trade_date),
+            self._state_record(final_state),
+        )
+
+    def _state_record(self, final_state):
+        return {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
             "sentiment_report": final_state["sentiment_report"],
             "news_report": final_state["news_report"],
             "fundamentals_report": final_state["fundamentals_report"],
+            "report_digest": final_state.get("report_digest", ""),
             "investment_debate_state": {
                 "bull_history": final_state["investment_debate_state"]["bull_history"],
                 "bear_history": final_state["investment_debate_state"]["bear_history"],
@@ -235,34 +554,45 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
-
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
-
     def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
+        """Reflect on decisions and update memory based on returns.
+
+        The five reflections run concurrently and each memory gets one insert.
+        """
+        self.reflect_and_remember_batch([(self.curr_state, returns_losses)])
+
+    async def areflect_and_remember(self, returns_losses):
+        """Async version of reflect_and_remember."""
+        await self.reflector.areflect_batch(
+            [(self.curr_state, returns_losses)],
+            self._memories(),
+            max_concurrency=self.config.get("reflection_max_concurrency", 8),
         )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+
+    def reflect_and_remember_batch(self, states_and_returns):
+        """Reflect on many past runs at once and update memory.
+
+        Args:
+            states_and_returns: Iterable of (final_state, returns_losses) pairs,
+                e.g. the final states returned by propagate_batch with their
+                realized returns
+        """
+        self.reflector.reflect_batch(
+            states_and_returns,
+            self._memories(),
+            max_concurrency=self.config.get("reflection_max_concurrency", 8),
         )
 
+    def _memories(self):
+        """Memories keyed like Reflector's REFLECTION_COMPONENTS."""
+        return {
+            "bull": self.bull_memory,
+            "bear": self.bear_memory,
+            "trader": self.trader_memory,
+            "invest_judge": self.invest_judge_memory,
+            "risk_manager": self.risk_manager_memory,
+        }
+
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)